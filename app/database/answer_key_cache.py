@@ -0,0 +1,179 @@
+# =============================================================================
+# 1.0. MODÜL BAŞLIĞI VE AÇIKLAMASI
+# =============================================================================
+# Bu modül, aktif quiz oturumlarının cevap anahtarlarını süreç (process)
+# belleğinde tutan `AnswerKeyCache` sınıfını içerir.
+# Anahtar, oturum başlatılırken seçilen sorulardan ek sorgu yapılmadan
+# oluşturulur; cevap gönderiminde oturum durumu ve doğru şık bellekten okunur.
+# Önbellekte bulunmayan oturumlar (yeniden başlatma, farklı worker, süre
+# dolumu) tek sorguyla veritabanından yüklenir.
+# Oturum başka bir worker'da veya zamanlayıcıda tamamlanabileceği için
+# durum kısa bir süre (ANSWER_KEY_STATUS_TTL_SECONDS) güvenilir kabul edilir;
+# sonra tek satırlık sorguyla yeniden doğrulanır. Süre sonu (deadline) her
+# cevapta bellekteki değerden kontrol edilir.
+# =============================================================================
+
+# =============================================================================
+# 2.0. İÇİNDEKİLER
+# =============================================================================
+# 3.0. GEREKLİ KÜTÜPHANELER
+# 4.0. MODÜL SEVİYESİ YAPILANDIRMA
+# 5.0. ANSWERKEYCACHE SINIFI
+#   5.1. __init__(self, ttl_seconds, max_sessions)
+#   5.2. build_entry(session_db_id, status, questions, seconds_remaining)
+#   5.3. put(self, session_id, entry)
+#   5.4. get(self, session_id)
+#   5.5. set_status(self, session_id, status, seconds_remaining)
+#   5.6. needs_status_check(self, entry)
+#   5.7. is_past_deadline(self, entry)
+#   5.8. invalidate(self, session_id)
+#   5.9. get_stats(self)
+# 6.0. MODÜL SEVİYESİ ÖRNEK
+# =============================================================================
+
+# =============================================================================
+# 3.0. GEREKLİ KÜTÜPHANELER
+# =============================================================================
+import os
+import time
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Any
+
+# =============================================================================
+# 4.0. MODÜL SEVİYESİ YAPILANDIRMA
+# =============================================================================
+# Bir oturumun cevap anahtarının bellekte tutulacağı süre (saniye)
+ANSWER_KEY_CACHE_TTL_SECONDS = float(os.getenv('ANSWER_KEY_CACHE_TTL_SECONDS', '10800'))
+
+# Bellekte tutulacak en fazla oturum sayısı (en eski kullanılan çıkarılır)
+ANSWER_KEY_CACHE_MAX_SESSIONS = int(os.getenv('ANSWER_KEY_CACHE_MAX_SESSIONS', '10000'))
+
+# Önbellekteki oturum durumunun veritabanından yeniden doğrulanma aralığı (saniye)
+ANSWER_KEY_STATUS_TTL_SECONDS = float(os.getenv('ANSWER_KEY_STATUS_TTL_SECONDS', '5'))
+
+# Süre sonundan sonra ağ gecikmesi için kabul edilen tolerans (saniye)
+ANSWER_DEADLINE_GRACE_SECONDS = float(os.getenv('ANSWER_DEADLINE_GRACE_SECONDS', '5'))
+
+# =============================================================================
+# 5.0. ANSWERKEYCACHE SINIFI
+# =============================================================================
+class AnswerKeyCache:
+    """
+    session_id → {'id', 'status', 'answers', 'deadline'} eşlemesini TTL ve LRU
+    ile tutar. 'answers' sözlüğü question_id → {'id': doğru şık ID'si, 'name':
+    şık metni} şeklindedir; 'deadline' süre sonunun monotonic zamanıdır
+    (zamanlayıcısız oturumlarda None). Oturum tamamlandığında durum önbellekte
+    de güncellenir.
+    """
+
+    def __init__(self, ttl_seconds: float = ANSWER_KEY_CACHE_TTL_SECONDS,
+                 max_sessions: int = ANSWER_KEY_CACHE_MAX_SESSIONS,
+                 status_ttl_seconds: float = ANSWER_KEY_STATUS_TTL_SECONDS,
+                 deadline_grace_seconds: float = ANSWER_DEADLINE_GRACE_SECONDS):
+        """5.1. Önbelleği başlatır."""
+        self.ttl_seconds = ttl_seconds
+        self.max_sessions = max_sessions
+        self.status_ttl_seconds = status_ttl_seconds
+        self.deadline_grace_seconds = deadline_grace_seconds
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+
+    @staticmethod
+    def build_entry(session_db_id: int, status: str, questions: List[Dict[str, Any]],
+                    seconds_remaining: Optional[float] = None) -> Dict[str, Any]:
+        """5.2. Şıklarıyla birlikte yüklenmiş sorulardan cevap anahtarı oluşturur."""
+        answers: Dict[int, Optional[Dict[str, Any]]] = {}
+        for question in questions:
+            correct = None
+            for option in question.get('options', []):
+                if option.get('is_correct'):
+                    correct = {'id': option['id'], 'name': option['name']}
+                    break
+            answers[question['id']] = correct
+
+        return {'id': session_db_id, 'status': status, 'answers': answers,
+                'seconds_remaining': seconds_remaining}
+
+    @staticmethod
+    def _deadline(seconds_remaining: Optional[float], now: float) -> Optional[float]:
+        """Veritabanı saatine göre kalan süreyi bu sürecin monotonic saatine çevirir."""
+        return now + float(seconds_remaining) if seconds_remaining is not None else None
+
+    def put(self, session_id: str, entry: Dict[str, Any]) -> None:
+        """5.3. Oturumun cevap anahtarını önbelleğe ekler."""
+        now = time.monotonic()
+        entry = dict(entry)
+        seconds_remaining = entry.pop('seconds_remaining', None)
+        with self._lock:
+            self._entries[session_id] = dict(
+                entry,
+                deadline=self._deadline(seconds_remaining, now),
+                status_checked_at=now,
+                expires_at=now + self.ttl_seconds
+            )
+            self._entries.move_to_end(session_id)
+            while len(self._entries) > self.max_sessions:
+                self._entries.popitem(last=False)
+
+    def get(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """5.4. Oturumun cevap anahtarını döndürür; yoksa veya süresi dolduysa None."""
+        with self._lock:
+            entry = self._entries.get(session_id)
+            if entry is None:
+                self._misses += 1
+                return None
+            if entry['expires_at'] <= time.monotonic():
+                del self._entries[session_id]
+                self._misses += 1
+                return None
+            self._entries.move_to_end(session_id)
+            self._hits += 1
+            return entry
+
+    def set_status(self, session_id: str, status: str,
+                   seconds_remaining: Optional[float] = None) -> None:
+        """5.5. Önbellekteki oturumun durumunu (ve verilirse kalan süresini) günceller."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(session_id)
+            if entry is not None:
+                entry['status'] = status
+                entry['status_checked_at'] = now
+                if seconds_remaining is not None:
+                    entry['deadline'] = self._deadline(seconds_remaining, now)
+
+    def needs_status_check(self, entry: Dict[str, Any]) -> bool:
+        """5.6. Aktif görünen oturumun durumu veritabanından yeniden doğrulanmalı mı?"""
+        return (entry['status'] == 'active'
+                and time.monotonic() - entry['status_checked_at'] >= self.status_ttl_seconds)
+
+    def is_past_deadline(self, entry: Dict[str, Any]) -> bool:
+        """5.7. Oturumun süresi (tolerans dahil) doldu mu?"""
+        deadline = entry.get('deadline')
+        return deadline is not None and time.monotonic() > deadline + self.deadline_grace_seconds
+
+    def invalidate(self, session_id: str) -> None:
+        """5.8. Oturumu önbellekten çıkarır."""
+        with self._lock:
+            self._entries.pop(session_id, None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """5.9. Önbellek istatistiklerini döndürür."""
+        with self._lock:
+            return {
+                'sessions': len(self._entries),
+                'max_sessions': self.max_sessions,
+                'ttl_seconds': self.ttl_seconds,
+                'status_ttl_seconds': self.status_ttl_seconds,
+                'hits': self._hits,
+                'misses': self._misses
+            }
+
+# =============================================================================
+# 6.0. MODÜL SEVİYESİ ÖRNEK
+# =============================================================================
+# Süreç (process) içinde tüm servisler aynı önbelleği paylaşır.
+answer_key_cache = AnswerKeyCache()
@@ -8,7 +8,7 @@ import uuid
 import json
 from datetime import datetime, timedelta
 from typing import Dict, Any, Optional, List
-from .db_connection import DatabaseConnection
+from .db_connection import DatabaseConnection, read_only
 
 class ChatRepository:
     """
@@ -92,6 +92,7 @@ class ChatRepository:
         except Exception as e:
             return None
     
+    @read_only
     def get_chat_messages(self, chat_session_id: str) -> List[Dict[str, Any]]:
         """
         Chat session'ına ait mesajları getirir
@@ -243,6 +244,7 @@ class ChatRepository:
         except Exception as e:
             raise
     
+    @read_only
     def get_conversation_history(self, chat_session_id: str, limit: int = 10) -> List[Dict[str, Any]]:
         """
         Chat session'ının son mesajlarını getirir.
@@ -360,3 +362,196 @@ class ChatRepository:
                 
         except Exception as e:
             return {}
+    
+    @read_only
+    def get_cached_response(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        """
+        Süresi dolmamış paylaşılan AI yanıtını getirir.
+        
+        Args:
+            cache_key: Önbellek anahtarı
+            
+        Returns:
+            {'content', 'ai_model', 'expires_at'} veya None
+        """
+        try:
+            with self.db_connection as conn:
+                query = """
+                SELECT content, ai_model, expires_at
+                FROM ai_response_cache
+                WHERE cache_key = %s AND expires_at > NOW()
+                """
+                conn.cursor.execute(query, (cache_key,))
+                return conn.cursor.fetchone()
+                
+        except Exception as e:
+            return None
+    
+    def save_cached_response(self, cache_key: str, action_type: str, question_id: int, prompt_version: int,
+                             content: str, ai_model: Optional[str], ttl_seconds: float) -> bool:
+        """
+        Paylaşılan AI yanıtını kaydeder (varsa üzerine yazar).
+        
+        Args:
+            cache_key: Önbellek anahtarı
+            action_type: Hızlı eylem tipi
+            question_id: Soru ID
+            prompt_version: Prompt şablonu versiyonu
+            content: Formatlanmış AI yanıtı
+            ai_model: Kullanılan AI modeli
+            ttl_seconds: Geçerlilik süresi (saniye)
+            
+        Returns:
+            Başarılıysa True
+        """
+        try:
+            with self.db_connection as conn:
+                query = """
+                INSERT INTO ai_response_cache
+                (cache_key, action_type, question_id, prompt_version, content, ai_model, expires_at)
+                VALUES (%s, %s, %s, %s, %s, %s, %s)
+                ON DUPLICATE KEY UPDATE
+                    content = VALUES(content),
+                    ai_model = VALUES(ai_model),
+                    created_at = CURRENT_TIMESTAMP,
+                    expires_at = VALUES(expires_at)
+                """
+                expires_at = datetime.now() + timedelta(seconds=ttl_seconds)
+                conn.cursor.execute(query, (
+                    cache_key, action_type, question_id, prompt_version, content, ai_model, expires_at
+                ))
+                return True
+                
+        except Exception as e:
+            return False
+    
+    def cleanup_expired_cached_responses(self) -> int:
+        """Süresi dolmuş paylaşılan AI yanıtlarını siler; silinen kayıt sayısını döndürür."""
+        try:
+            with self.db_connection as conn:
+                conn.cursor.execute("DELETE FROM ai_response_cache WHERE expires_at <= NOW()")
+                return conn.cursor.rowcount
+                
+        except Exception as e:
+            return 0
+    
+    @read_only
+    def get_question_ai_text(self, question_id: int, action_type: str, prompt_version: int) -> Optional[Dict[str, Any]]:
+        """
+        Soru için önceden üretilmiş hızlı eylem metnini getirir.
+        Soru, metin üretildikten sonra güncellendiyse metin kullanılmaz.
+        
+        Args:
+            question_id: Soru ID
+            action_type: Hızlı eylem tipi
+            prompt_version: Prompt şablonu versiyonu
+            
+        Returns:
+            {'content', 'ai_model'} veya None
+        """
+        try:
+            with self.db_connection as conn:
+                query = """
+                SELECT t.content, t.ai_model
+                FROM question_ai_texts t
+                JOIN questions q ON q.id = t.question_id
+                WHERE t.question_id = %s AND t.action_type = %s AND t.prompt_version = %s
+                  AND t.generated_at >= q.updated_at
+                """
+                conn.cursor.execute(query, (question_id, action_type, prompt_version))
+                return conn.cursor.fetchone()
+                
+        except Exception as e:
+            return None
+    
+    @read_only
+    def get_questions_for_ai_texts(self, after_id: int, limit: int) -> List[Dict[str, Any]]:
+        """
+        Metin üretimi için aktif soruları ID sırasıyla (keyset sayfalama) getirir.
+        
+        Args:
+            after_id: Bu ID'den sonraki sorular getirilir
+            limit: En fazla soru sayısı
+            
+        Returns:
+            [{'id', 'question_text', 'topic_name'}] listesi
+        """
+        try:
+            with self.db_connection as conn:
+                query = """
+                SELECT q.id, q.name AS question_text, t.name AS topic_name
+                FROM questions q
+                JOIN topics t ON t.id = q.topic_id
+                WHERE q.id > %s AND q.is_active = 1
+                ORDER BY q.id
+                LIMIT %s
+                """
+                conn.cursor.execute(query, (after_id, limit))
+                return conn.cursor.fetchall()
+                
+        except Exception as e:
+            return []
+    
+    @read_only
+    def get_fresh_question_ai_texts(self, question_ids: List[int], prompt_versions: Dict[str, int]) -> set:
+        """
+        Verilen sorular için güncel (versiyonu eşleşen ve sorudan yeni) metinleri bulur.
+        
+        Args:
+            question_ids: Soru ID listesi
+            prompt_versions: action_type → prompt şablonu versiyonu
+            
+        Returns:
+            {(question_id, action_type)} kümesi
+        """
+        if not question_ids or not prompt_versions:
+            return set()
+        try:
+            with self.db_connection as conn:
+                id_placeholders = ', '.join(['%s'] * len(question_ids))
+                version_placeholders = ', '.join(['(%s, %s)'] * len(prompt_versions))
+                query = f"""
+                SELECT t.question_id, t.action_type
+                FROM question_ai_texts t
+                JOIN questions q ON q.id = t.question_id
+                WHERE t.question_id IN ({id_placeholders})
+                  AND (t.action_type, t.prompt_version) IN ({version_placeholders})
+                  AND t.generated_at >= q.updated_at
+                """
+                params = list(question_ids)
+                for action_type, version in prompt_versions.items():
+                    params.extend([action_type, version])
+                conn.cursor.execute(query, tuple(params))
+                return {(row['question_id'], row['action_type']) for row in conn.cursor.fetchall()}
+                
+        except Exception as e:
+            return set()
+    
+    def save_question_ai_text(self, question_id: int, action_type: str, prompt_version: int,
+                              content: str, ai_model: Optional[str], response_time_ms: Optional[int]) -> bool:
+        """
+        Önceden üretilmiş hızlı eylem metnini kaydeder (varsa üzerine yazar).
+        
+        Returns:
+            Başarılıysa True
+        """
+        try:
+            with self.db_connection as conn:
+                query = """
+                INSERT INTO question_ai_texts
+                (question_id, action_type, prompt_version, content, ai_model, response_time_ms)
+                VALUES (%s, %s, %s, %s, %s, %s)
+                ON DUPLICATE KEY UPDATE
+                    prompt_version = VALUES(prompt_version),
+                    content = VALUES(content),
+                    ai_model = VALUES(ai_model),
+                    response_time_ms = VALUES(response_time_ms),
+                    generated_at = CURRENT_TIMESTAMP
+                """
+                conn.cursor.execute(query, (
+                    question_id, action_type, prompt_version, content, ai_model, response_time_ms
+                ))
+                return True
+                
+        except Exception as e:
+            return False
@@ -0,0 +1,259 @@
+# =============================================================================
+# 1.0. MODÜL BAŞLIĞI VE AÇIKLAMASI
+# =============================================================================
+# Bu modül, sınıf → ders → ünite → konu ağacını süreç belleğinde tutan
+# `CurriculumCache` sınıfını içerir.
+# Müfredat yalnızca müfredat verisi yüklendiğinde değişir; ağaç ilk
+# kullanımda 4 sorguyla yüklenir, sonraki istekler veritabanına gitmez.
+# Her yükleme içerikten türetilen bir sürüm (version) üretir; API bu sürümü
+# ETag olarak kullanır. Diğer süreçlerdeki değişiklikler, müfredat imzası
+# `CURRICULUM_CACHE_CHECK_SECONDS` aralıklarla kontrol edilerek yakalanır.
+# =============================================================================
+
+# =============================================================================
+# 2.0. İÇİNDEKİLER
+# =============================================================================
+# 3.0. GEREKLİ KÜTÜPHANELER
+# 4.0. MODÜL SEVİYESİ YAPILANDIRMA
+# 5.0. CURRICULUMCACHE SINIFI
+#   5.1. __init__(self, check_interval)
+#   5.2. invalidate(self)
+#   5.3. refresh(self, signature)
+#   5.4. get(self)
+#   5.5. get_stats(self)
+# 6.0. MODÜL SEVİYESİ ÖRNEK
+# =============================================================================
+
+# =============================================================================
+# 3.0. GEREKLİ KÜTÜPHANELER
+# =============================================================================
+import os
+import json
+import time
+import hashlib
+import threading
+from typing import Dict, List, Optional, Tuple, Any
+
+from app.database.db_connection import DatabaseConnection, read_only
+
+# =============================================================================
+# 4.0. MODÜL SEVİYESİ YAPILANDIRMA
+# =============================================================================
+# Müfredat imzasının en fazla hangi sıklıkla kontrol edileceği (saniye)
+CURRICULUM_CACHE_CHECK_SECONDS = float(os.getenv('CURRICULUM_CACHE_CHECK_SECONDS', '300'))
+
+# Müfredat yanıtlarının tarayıcıda yeniden doğrulanmadan kullanılabileceği süre (saniye)
+CURRICULUM_HTTP_MAX_AGE = int(os.getenv('CURRICULUM_HTTP_MAX_AGE', '300'))
+
+GRADES_SQL = """
+    SELECT id, name, level, description
+    FROM grades
+    WHERE is_active = 1
+    ORDER BY level
+"""
+
+SUBJECTS_SQL = """
+    SELECT s.id, s.grade_id, s.name, s.name_id, s.description, g.name as grade_name
+    FROM subjects s
+    JOIN grades g ON s.grade_id = g.id
+    WHERE s.is_active = 1
+    ORDER BY s.grade_id, s.name
+"""
+
+UNITS_SQL = """
+    SELECT u.id, u.subject_id, u.name, u.name_id, u.description, s.name as subject_name
+    FROM units u
+    JOIN subjects s ON u.subject_id = s.id
+    WHERE u.is_active = 1
+    ORDER BY u.subject_id, u.name
+"""
+
+TOPICS_SQL = """
+    SELECT t.id, t.unit_id, t.name, t.description, u.name as unit_name
+    FROM topics t
+    JOIN units u ON t.unit_id = u.id
+    WHERE t.is_active = 1
+    ORDER BY t.unit_id, t.name
+"""
+
+# Müfredatın değişip değişmediğini anlamak için kullanılan imza sorgusu
+CURRICULUM_SIGNATURE_SQL = """
+    SELECT (SELECT COUNT(*) FROM grades) AS grade_count,
+           (SELECT MAX(updated_at) FROM grades) AS grades_updated_at,
+           (SELECT COUNT(*) FROM subjects) AS subject_count,
+           (SELECT MAX(updated_at) FROM subjects) AS subjects_updated_at,
+           (SELECT COUNT(*) FROM units) AS unit_count,
+           (SELECT MAX(updated_at) FROM units) AS units_updated_at,
+           (SELECT COUNT(*) FROM topics) AS topic_count,
+           (SELECT MAX(updated_at) FROM topics) AS topics_updated_at
+"""
+
+# =============================================================================
+# 5.0. CURRICULUMCACHE SINIFI
+# =============================================================================
+class CurriculumCache:
+    """
+    Müfredat ağacını ve endpoint'lerin döndürdüğü listeleri (üst ID'ye göre
+    gruplanmış) tek bir değişmez snapshot olarak tutar. Snapshot atomik olarak
+    değiştirilir; okuyucular kilit almaz.
+    """
+
+    def __init__(self, check_interval: float = CURRICULUM_CACHE_CHECK_SECONDS):
+        """5.1. Önbelleği başlatır. Ağaç ilk kullanımda yüklenir."""
+        self.check_interval = check_interval
+        self.db: Optional[DatabaseConnection] = None
+        self._lock = threading.Lock()
+        self._snapshot: Optional[Dict[str, Any]] = None
+        self._signature: Optional[Tuple] = None
+        self._checked_at = 0.0
+        self._refresh_count = 0
+
+    def invalidate(self) -> None:
+        """5.2. Önbelleği geçersiz kılar; bir sonraki istekte yeniden yüklenir."""
+        with self._lock:
+            self._snapshot = None
+            self._signature = None
+
+    def _get_db(self) -> DatabaseConnection:
+        """Önbelleğin veritabanı bağlantısını ilk kullanımda oluşturur."""
+        if self.db is None:
+            self.db = DatabaseConnection()
+        return self.db
+
+    @read_only
+    def _read_signature(self) -> Tuple:
+        """Müfredat tablolarının mevcut imzasını okur."""
+        with self._get_db() as conn:
+            conn.cursor.execute(CURRICULUM_SIGNATURE_SQL)
+            row = conn.cursor.fetchone() or {}
+        return tuple(row.get(key) for key in sorted(row))
+
+    @read_only
+    def refresh(self, signature: Optional[Tuple] = None) -> bool:
+        """5.3. Müfredatı veritabanından okuyup snapshot'ı yeniden oluşturur."""
+        try:
+            if signature is None:
+                signature = self._read_signature()
+
+            with self._get_db() as conn:
+                conn.cursor.execute(GRADES_SQL)
+                grades = conn.cursor.fetchall()
+                conn.cursor.execute(SUBJECTS_SQL)
+                subjects = conn.cursor.fetchall()
+                conn.cursor.execute(UNITS_SQL)
+                units = conn.cursor.fetchall()
+                conn.cursor.execute(TOPICS_SQL)
+                topics = conn.cursor.fetchall()
+
+            # Endpoint listeleri (eski yanıt biçimleriyle birebir aynı alanlar)
+            subjects_by_grade: Dict[int, List[Dict[str, Any]]] = {}
+            for row in subjects:
+                subjects_by_grade.setdefault(row['grade_id'], []).append({
+                    'id': row['id'],
+                    'name': row['name'],
+                    'name_id': row['name_id'],
+                    'description': row['description'],
+                    'grade_name': row['grade_name']
+                })
+
+            units_by_subject: Dict[int, List[Dict[str, Any]]] = {}
+            for row in units:
+                units_by_subject.setdefault(row['subject_id'], []).append({
+                    'id': row['id'],
+                    'name': row['name'],
+                    'name_id': row['name_id'],
+                    'description': row['description'],
+                    'subject_name': row['subject_name']
+                })
+
+            topics_by_unit: Dict[int, List[Dict[str, Any]]] = {}
+            for row in topics:
+                topics_by_unit.setdefault(row['unit_id'], []).append({
+                    'id': row['id'],
+                    'name': row['name'],
+                    'description': row['description'],
+                    'unit_name': row['unit_name']
+                })
+
+            grades_list = [
+                {
+                    'id': row['id'],
+                    'name': row['name'],
+                    'level': row['level'],
+                    'description': row['description']
+                }
+                for row in grades
+            ]
+
+            # Tam ağaç: grade → subjects → units → topics
+            tree = [
+                dict(grade, subjects=[
+                    dict(subject, units=[
+                        dict(unit, topics=topics_by_unit.get(unit['id'], []))
+                        for unit in units_by_subject.get(subject['id'], [])
+                    ])
+                    for subject in subjects_by_grade.get(grade['id'], [])
+                ])
+                for grade in grades_list
+            ]
+
+            # Sürüm içerikten türetilir; aynı veri her süreçte aynı ETag'i üretir
+            version = hashlib.sha1(
+                json.dumps(tree, sort_keys=True, ensure_ascii=False, default=str).encode('utf-8')
+            ).hexdigest()[:20]
+
+            self._snapshot = {
+                'version': version,
+                'subject_names': {row['id']: row['name'] for row in subjects},
+                'topic_names': {row['id']: row['name'] for row in topics},
+                'grades': grades_list,
+                'subjects_by_grade': subjects_by_grade,
+                'units_by_subject': units_by_subject,
+                'topics_by_unit': topics_by_unit,
+                'tree': tree
+            }
+            self._signature = signature
+            self._checked_at = time.monotonic()
+            self._refresh_count += 1
+            return True
+
+        except Exception as e:
+            print(f"❌ Müfredat önbelleği yenileme hatası: {e}")
+            return False
+
+    def get(self) -> Optional[Dict[str, Any]]:
+        """5.4. Güncel müfredat snapshot'ını döndürür; yüklenemezse None."""
+        snapshot = self._snapshot
+        if snapshot is not None and time.monotonic() - self._checked_at < self.check_interval:
+            return snapshot
+
+        with self._lock:
+            # Kilidi beklerken başka bir thread yenilemiş olabilir
+            if self._snapshot is not None and time.monotonic() - self._checked_at < self.check_interval:
+                return self._snapshot
+            try:
+                signature = self._read_signature()
+            except Exception as e:
+                print(f"❌ Müfredat imzası okunamadı: {e}")
+                return self._snapshot
+            if self._snapshot is not None and signature == self._signature:
+                self._checked_at = time.monotonic()
+                return self._snapshot
+            self.refresh(signature)
+            return self._snapshot
+
+    def get_stats(self) -> Dict[str, Any]:
+        """5.5. Önbellek istatistiklerini döndürür."""
+        snapshot = self._snapshot
+        return {
+            'loaded': snapshot is not None,
+            'version': snapshot['version'] if snapshot else None,
+            'grades': len(snapshot['grades']) if snapshot else 0,
+            'refresh_count': self._refresh_count
+        }
+
+# =============================================================================
+# 6.0. MODÜL SEVİYESİ ÖRNEK
+# =============================================================================
+# Süreç (process) içinde tüm istekler aynı müfredat snapshot'ını paylaşır.
+curriculum_cache = CurriculumCache()
@@ -4,6 +4,14 @@
 # Bu modül, MySQL veritabanı bağlantısını yönetmek için bir sarmalayıcı
 # (wrapper) olan `DatabaseConnection` sınıfını içerir. Bağlantı kurma,
 # sonlandırma ve bağlantının sürekliliğini sağlama işlemlerini merkezileştirir.
+# Ayrıca, Flask isteği içinde tüm repository'lerin aynı bağlantıyı paylaştığı
+# bir bağlantı havuzu (connection pool) modu sağlar. Bağlantı en dıştaki
+# `with` bloğu bitince havuza döner; böylece istek, harici servis çağrıları
+# (ör. Gemini) sırasında havuzda yer tutmaz. Bağlantı durumu thread'e
+# özeldir; her `with` bloğu kendi izole cursor'unu alır.
+# Replika tanımlıysa `@read_only` ile işaretlenen metotların sorguları replika
+# havuzuna gider; istekte birincil (primary) bağlantı bir kez kullanıldıktan
+# sonra isteğin kalan okumaları da birincilden yapılır (read-your-writes).
 # =============================================================================
 
 # =============================================================================
@@ -11,26 +19,61 @@
 # =============================================================================
 # 3.0. GEREKLİ KÜTÜPHANELER
 # 4.0. MODÜL SEVİYESİ YAPILANDIRMA
-# 5.0. DATABASECONNECTION SINIFI
-#   5.1. Başlatma (Initialization)
-#     5.1.1. __init__(self)
-#   5.2. Bağlantı Yönetimi (Connection Management)
-#     5.2.1. connect(self)
-#     5.2.2. close(self)
-#     5.2.3. _ensure_connection(self)
-#   5.3. Context Manager Metotları
-#     5.3.1. __enter__(self)
-#     5.3.2. __exit__(self, exc_type, exc_val, exc_tb)
+# 5.0. CONNECTIONPOOL SINIFI
+#   5.1. __init__(self, db_config, pool_size, timeout, recycle_seconds)
+#   5.2. acquire(self, timeout)
+#   5.3. release(self, connection)
+#   5.4. get_stats(self)
+#   5.5. close_all(self)
+# 6.0. HAVUZ VE İSTEK (REQUEST) YÖNETİMİ
+#   6.1. init_pool(pool_size, timeout, db_config)
+#   6.2. init_app(app)
+#   6.3. get_pool()
+#   6.4. get_pool_stats()
+#   6.5. get_request_connection()
+#   6.6. release_request_connection(exc)
+#   6.7. init_replica_pool(db_config, pool_size, timeout)
+#   6.8. read_only(method)
+#   6.9. _enter_request_block(connection)
+#   6.10. _exit_request_block(connection)
+# 7.0. DATABASECONNECTION SINIFI
+#   7.0.1. CursorContext
+#   7.1. Başlatma (Initialization)
+#     7.1.1. __init__(self)
+#     7.1.2. _state(self)
+#     7.1.3. connection (property)
+#     7.1.4. cursor (property)
+#   7.2. Bağlantı Yönetimi (Connection Management)
+#     7.2.1. connect(self)
+#     7.2.2. close(self)
+#     7.2.3. _ensure_connection(self)
+#     7.2.4. _replica_connection(self, state)
+#   7.3. Context Manager Metotları
+#     7.3.1. __enter__(self)
+#     7.3.2. __exit__(self, exc_type, exc_val, exc_tb)
 # =============================================================================
 
 # =============================================================================
 # 3.0. GEREKLİ KÜTÜPHANELER
 # =============================================================================
 import os
+import time
+import threading
+import functools
+from collections import deque
 import mysql.connector
 from mysql.connector import Error as MySQLError
 from typing import Optional, Dict, Any
 
+from app.database.query_stats import wrap_cursor
+
+# Flask opsiyoneldir; CLI scriptleri Flask olmadan da çalışabilmelidir.
+try:
+    from flask import g, has_app_context
+except ImportError:
+    g = None
+    has_app_context = None
+
 # =============================================================================
 # 4.0. MODÜL SEVİYESİ YAPILANDIRMA
 # =============================================================================
@@ -43,104 +86,512 @@ DB_CONFIG = {
     'port': int(os.getenv('MYSQL_PORT', '3306'))
 }
 
+# Havuz varsayılanları (init_app ile uygulama config'inden ezilir)
+DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', '10'))
+DB_POOL_TIMEOUT = float(os.getenv('DB_POOL_TIMEOUT', '5'))
+DB_POOL_RECYCLE_SECONDS = int(os.getenv('DB_POOL_RECYCLE_SECONDS', '300'))
+
+# Aktif havuz (init_pool çağrılana kadar None; None ise doğrudan bağlantı kurulur)
+_pool: Optional['ConnectionPool'] = None
+
+# Okuma replikası havuzu (init_replica_pool çağrılana kadar None; None ise tüm sorgular birincile gider)
+_replica_pool: Optional['ConnectionPool'] = None
+
+# Flask `g` nesnesinde istek bağlantısının tutulduğu anahtar
+_REQUEST_CONNECTION_KEY = '_db_pool_connection'
+
+# İstek replika bağlantısı ve isteğin birincile sabitlendiğini gösteren anahtarlar
+_REQUEST_REPLICA_KEY = '_db_replica_connection'
+_REQUEST_PRIMARY_PINNED_KEY = '_db_primary_pinned'
+
+# İstek bağlantıları üzerinde açık 'with' bloğu sayıları (id(bağlantı) -> derinlik)
+_REQUEST_DEPTH_KEY = '_db_open_blocks'
+
+# Thread başına @read_only iç içelik derinliği
+_routing = threading.local()
+
+# =============================================================================
+# 5.0. CONNECTIONPOOL SINIFI
+# =============================================================================
+class ConnectionPool:
+    """
+    Sabit boyutlu, thread-safe MySQL bağlantı havuzu.
+    Bağlantılar ihtiyaç oldukça açılır, iade edildikçe tekrar kullanılır.
+    """
+
+    def __init__(self, db_config: Dict[str, Any], pool_size: int = DB_POOL_SIZE,
+                 timeout: float = DB_POOL_TIMEOUT, recycle_seconds: int = DB_POOL_RECYCLE_SECONDS):
+        """5.1. Havuzu başlatır. Bağlantılar ilk ihtiyaçta (lazy) açılır."""
+        self.db_config = db_config
+        self.pool_size = max(1, int(pool_size))
+        self.timeout = timeout
+        self.recycle_seconds = recycle_seconds
+
+        self._cond = threading.Condition()
+        self._idle = deque()  # (connection, last_used_monotonic)
+        self._created = 0
+        self._in_use = 0
+        self._waiting = 0
+
+        # İstatistikler
+        self._checkouts = 0
+        self._timeouts = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+
+    def acquire(self, timeout: Optional[float] = None):
+        """5.2. Havuzdan bir bağlantı ödünç alır. Havuz doluysa `timeout` kadar bekler."""
+        timeout = self.timeout if timeout is None else timeout
+        started = time.perf_counter()
+        deadline = time.monotonic() + timeout
+        connection, last_used = None, None
+
+        with self._cond:
+            self._waiting += 1
+            try:
+                while True:
+                    if self._idle:
+                        connection, last_used = self._idle.pop()
+                        break
+                    if self._created < self.pool_size:
+                        self._created += 1
+                        break
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._timeouts += 1
+                        raise MySQLError(f"Bağlantı havuzu dolu ({self.pool_size} bağlantı kullanımda)")
+                    self._cond.wait(remaining)
+            finally:
+                self._waiting -= 1
+            self._in_use += 1
+
+        # Ağ işlemleri kilit dışında yapılır
+        try:
+            if connection is None:
+                connection = mysql.connector.connect(**self.db_config)
+            elif time.monotonic() - last_used > self.recycle_seconds:
+                # Uzun süre boşta kalan bağlantı sunucu tarafından kapatılmış olabilir
+                connection.ping(reconnect=True, attempts=1, delay=0)
+        except Exception:
+            self._discard(connection)
+            raise
+
+        waited = time.perf_counter() - started
+        with self._cond:
+            self._checkouts += 1
+            self._total_wait += waited
+            self._max_wait = max(self._max_wait, waited)
+        return connection
+
+    def release(self, connection) -> None:
+        """5.3. Ödünç alınan bağlantıyı havuza iade eder."""
+        if connection is None:
+            return
+        try:
+            # Açık kalan transaction bir sonraki isteğe taşınmasın
+            if connection.in_transaction:
+                connection.rollback()
+        except Exception:
+            self._discard(connection)
+            return
+
+        with self._cond:
+            self._in_use -= 1
+            self._idle.append((connection, time.monotonic()))
+            self._cond.notify()
+
+    def _discard(self, connection) -> None:
+        """Bozuk bir bağlantıyı havuzdan tamamen çıkarır."""
+        if connection is not None:
+            try:
+                connection.close()
+            except Exception:
+                pass
+        with self._cond:
+            self._in_use -= 1
+            self._created -= 1
+            self._cond.notify()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """5.4. Havuz istatistiklerini döndürür."""
+        with self._cond:
+            checkouts = self._checkouts
+            return {
+                'pool_size': self.pool_size,
+                'created': self._created,
+                'in_use': self._in_use,
+                'idle': len(self._idle),
+                'waiting': self._waiting,
+                'checkouts': checkouts,
+                'timeouts': self._timeouts,
+                'avg_wait_ms': round(self._total_wait / checkouts * 1000, 3) if checkouts else 0.0,
+                'max_wait_ms': round(self._max_wait * 1000, 3),
+                'total_wait_ms': round(self._total_wait * 1000, 3)
+            }
+
+    def close_all(self) -> None:
+        """5.5. Boştaki tüm bağlantıları kapatır."""
+        with self._cond:
+            idle = list(self._idle)
+            self._idle.clear()
+            self._created -= len(idle)
+        for connection, _ in idle:
+            try:
+                connection.close()
+            except Exception:
+                pass
+
+# =============================================================================
+# 6.0. HAVUZ VE İSTEK (REQUEST) YÖNETİMİ
+# =============================================================================
+def init_pool(pool_size: int = DB_POOL_SIZE, timeout: float = DB_POOL_TIMEOUT,
+              db_config: Optional[Dict[str, Any]] = None) -> ConnectionPool:
+    """6.1. Modül seviyesindeki bağlantı havuzunu oluşturur."""
+    global _pool
+    if _pool is not None:
+        _pool.close_all()
+    _pool = ConnectionPool(db_config or DB_CONFIG, pool_size=pool_size, timeout=timeout)
+    return _pool
+
+def init_app(app) -> Optional[ConnectionPool]:
+    """6.2. Havuzu Flask config'ine göre kurar ve istek sonu iadesini kaydeder."""
+    if not app.config.get('DB_POOL_ENABLED', True):
+        return None
+    pool = init_pool(
+        pool_size=app.config.get('DB_POOL_SIZE', DB_POOL_SIZE),
+        timeout=app.config.get('DB_POOL_TIMEOUT', DB_POOL_TIMEOUT)
+    )
+    app.teardown_appcontext(release_request_connection)
+
+    # Okuma replikası (DB_REPLICA_HOST tanımlıysa)
+    replica_host = app.config.get('DB_REPLICA_HOST')
+    if replica_host:
+        init_replica_pool(
+            dict(
+                DB_CONFIG,
+                host=replica_host,
+                port=int(app.config.get('DB_REPLICA_PORT') or DB_CONFIG['port']),
+                user=app.config.get('DB_REPLICA_USER') or DB_CONFIG['user'],
+                password=app.config.get('DB_REPLICA_PASSWORD') or DB_CONFIG['password']
+            ),
+            pool_size=app.config.get('DB_REPLICA_POOL_SIZE', pool.pool_size),
+            timeout=app.config.get('DB_POOL_TIMEOUT', DB_POOL_TIMEOUT)
+        )
+    return pool
+
+def get_pool() -> Optional[ConnectionPool]:
+    """6.3. Aktif havuzu döndürür (havuz modu kapalıysa None)."""
+    return _pool
+
+def get_pool_stats() -> Dict[str, Any]:
+    """6.4. Havuz istatistiklerini döndürür."""
+    if _pool is None:
+        return {'enabled': False}
+    replica = {'enabled': True, **_replica_pool.get_stats()} if _replica_pool is not None else {'enabled': False}
+    return {'enabled': True, **_pool.get_stats(), 'replica': replica}
+
+def _request_scope_available() -> bool:
+    """Havuz aktif ve bir Flask uygulama bağlamı (app context) içinde miyiz?"""
+    return _pool is not None and has_app_context is not None and has_app_context()
+
+def get_request_connection():
+    """6.5. Mevcut istek için havuzdan bağlantı alır; iade edilene kadar aynısını döndürür."""
+    connection = g.get(_REQUEST_CONNECTION_KEY)
+    if connection is None:
+        connection = _pool.acquire()
+        setattr(g, _REQUEST_CONNECTION_KEY, connection)
+    return connection
+
+def release_request_connection(exc: Optional[BaseException] = None) -> None:
+    """6.6. İstek sonunda (teardown) hâlâ tutulan bağlantıları havuza iade eder."""
+    connection = g.pop(_REQUEST_CONNECTION_KEY, None)
+    if connection is not None and _pool is not None:
+        _pool.release(connection)
+    replica_connection = g.pop(_REQUEST_REPLICA_KEY, None)
+    if replica_connection is not None and _replica_pool is not None:
+        _replica_pool.release(replica_connection)
+    g.pop(_REQUEST_PRIMARY_PINNED_KEY, None)
+    g.pop(_REQUEST_DEPTH_KEY, None)
+
+def init_replica_pool(db_config: Dict[str, Any], pool_size: int = DB_POOL_SIZE,
+                      timeout: float = DB_POOL_TIMEOUT) -> ConnectionPool:
+    """6.7. Okuma replikası bağlantı havuzunu oluşturur."""
+    global _replica_pool
+    if _replica_pool is not None:
+        _replica_pool.close_all()
+    _replica_pool = ConnectionPool(db_config, pool_size=pool_size, timeout=timeout)
+    return _replica_pool
+
+def read_only(method):
+    """6.8. Metodun sorgularını (replika tanımlıysa) okuma replikasına yönlendirir.
+
+    Yalnızca replikadan birkaç saniye geride okumayı tolere edebilen salt
+    okunur metotlar işaretlenmelidir. Metot birincil bağlantının açık olduğu
+    bir `with` bloğu içinden çağrılırsa aynı bağlantıyı kullanır.
+    """
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        _routing.depth = getattr(_routing, 'depth', 0) + 1
+        try:
+            return method(*args, **kwargs)
+        finally:
+            _routing.depth -= 1
+    return wrapper
+
+def _replica_requested() -> bool:
+    """Sorgu replikaya gidebilir mi? (@read_only içinde ve istek birincile sabitlenmemiş)"""
+    if _replica_pool is None or not getattr(_routing, 'depth', 0):
+        return False
+    if has_app_context is not None and has_app_context() and g.get(_REQUEST_PRIMARY_PINNED_KEY):
+        return False
+    return True
+
+def _enter_request_block(connection) -> None:
+    """6.9. İstek bağlantısı üzerinde açılan 'with' bloğunu sayar."""
+    depths = g.setdefault(_REQUEST_DEPTH_KEY, {})
+    depths[id(connection)] = depths.get(id(connection), 0) + 1
+
+def _exit_request_block(connection) -> bool:
+    """6.10. Kapanan bloğu sayar; bağlantıdaki en dıştaki blok kapandıysa True döndürür.
+
+    Farklı repository nesnelerinin iç içe blokları aynı istek bağlantısını
+    paylaştığından derinlik nesne başına değil bağlantı başına tutulur.
+    """
+    depths = g.get(_REQUEST_DEPTH_KEY) or {}
+    remaining = depths.get(id(connection), 1) - 1
+    if remaining > 0:
+        depths[id(connection)] = remaining
+        return False
+    depths.pop(id(connection), None)
+    return True
+
+def _release_request_block_connection(connection) -> None:
+    """En dıştaki blok bitince istek bağlantısını (birincil veya replika) havuza iade eder."""
+    if g.get(_REQUEST_CONNECTION_KEY) is connection:
+        g.pop(_REQUEST_CONNECTION_KEY, None)
+        _pool.release(connection)
+    elif g.get(_REQUEST_REPLICA_KEY) is connection:
+        g.pop(_REQUEST_REPLICA_KEY, None)
+        _replica_pool.release(connection)
+
 # =============================================================================
-# 5.0. DATABASECONNECTION SINIFI
+# 7.0. DATABASECONNECTION SINIFI
 # =============================================================================
+class CursorContext:
+    """
+    Tek bir `with` bloğuna ait izole cursor/bağlantı çifti.
+    Aynı DatabaseConnection nesnesini kullanan eşzamanlı istekler
+    birbirlerinin cursor'larına dokunmaz.
+    """
+    __slots__ = ('connection', 'cursor', 'request_scoped')
+
+    def __init__(self, connection, request_scoped: bool = False):
+        self.connection = connection
+        # Bağlantı Flask isteğine mi ait? (en dıştaki blok bitince iade edilir)
+        self.request_scoped = request_scoped
+        # İstek içinde ve ölçüm açıkken sorgular süre/sayı olarak kaydedilir
+        self.cursor = wrap_cursor(connection.cursor(dictionary=True))
+
+
 class DatabaseConnection:
     """
     MySQL veritabanı bağlantısını yönetmek için bir sarmalayıcı (wrapper) sınıf.
+    Havuz aktifse istek içinde istek bağlantısını, istek dışında ise nesneye
+    ait bağlantıyı kullanır; her iki durumda da bağlantı en dıştaki `with`
+    bloğu süresince havuzdan ödünç alınır.
+
+    Bağlantı durumu thread'e özeldir (threading.local); bu nedenle tek bir
+    nesne modül seviyesinde paylaşılsa bile thread'ler arasında cursor veya
+    bağlantı paylaşılmaz.
     """
 
     # -------------------------------------------------------------------------
-    # 5.1. Başlatma (Initialization)
+    # 7.1. Başlatma (Initialization)
     # -------------------------------------------------------------------------
     def __init__(self):
-        """5.1.1. Sınıfın kurucu metodu."""
-        self.connection: Optional[mysql.connector.MySQLConnection] = None
-        self.cursor: Optional[mysql.connector.cursor.MySQLCursor] = None
+        """7.1.1. Sınıfın kurucu metodu."""
         self.db_config: Dict[str, Any] = DB_CONFIG
-        # Bağlantıyı hemen kur
+        self._local = threading.local()
+        # Bağlantıyı hemen kur (yalnızca bu nesneyi oluşturan thread için)
         self.connect()
 
+    def _state(self) -> threading.local:
+        """7.1.2. Mevcut thread'e ait bağlantı durumunu döndürür."""
+        state = self._local
+        if not hasattr(state, 'contexts'):
+            state.connection = None          # Doğrudan (havuzsuz) bağlantı
+            state.pooled_connection = None   # İstek dışı havuz bağlantısı
+            state.replica_connection = None  # İstek dışı replika bağlantısı
+            state.contexts = []              # Açık 'with' blokları (iç içe)
+        return state
+
+    @property
+    def connection(self) -> Optional[mysql.connector.MySQLConnection]:
+        """7.1.3. Mevcut thread/istek için geçerli bağlantı."""
+        state = self._state()
+        if state.contexts:
+            return state.contexts[-1].connection
+        if _request_scope_available():
+            return g.get(_REQUEST_CONNECTION_KEY)
+        return state.pooled_connection or state.connection
+
+    @property
+    def cursor(self) -> Optional[mysql.connector.cursor.MySQLCursor]:
+        """7.1.4. Mevcut thread'deki en içteki 'with' bloğunun cursor'u."""
+        state = self._state()
+        return state.contexts[-1].cursor if state.contexts else None
+
     # -------------------------------------------------------------------------
-    # 5.2. Bağlantı Yönetimi (Connection Management)
+    # 7.2. Bağlantı Yönetimi (Connection Management)
     # -------------------------------------------------------------------------
     def connect(self):
-        """5.2.1. Yapılandırma dosyasındaki bilgileri kullanarak veritabanına bağlanır."""
+        """7.2.1. Yapılandırma dosyasındaki bilgileri kullanarak veritabanına bağlanır."""
+        state = self._state()
         try:
-            if self.connection and self.connection.is_connected():
+            if _pool is not None:
+                # Bağlantı `with` bloğuna girerken ödünç alınır; istek içinde
+                # tüm repository'ler aynı istek bağlantısını paylaşır
                 return True
-            self.connection = mysql.connector.connect(**self.db_config)
-            # Cursor'ı da oluştur
-            if not self.cursor:
-                self.cursor = self.connection.cursor(dictionary=True)
+            if state.connection and state.connection.is_connected():
+                return True
+            state.connection = mysql.connector.connect(**self.db_config)
             return True
         except MySQLError as e:
             # Critical connection error - keep this print
             print(f"Veritabanı bağlantı hatası: {e}")
-            self.connection = None
-            self.cursor = None
+            state.connection = None
             return False
 
     def close(self):
-        """5.2.2. Veritabanı bağlantısını ve (varsa) cursor'u kapatır."""
+        """7.2.2. Mevcut thread'in bağlantısını ve (varsa) açık cursor'larını kapatır."""
+        state = self._state()
         try:
-            if self.cursor:
+            for context in state.contexts:
                 try:
-                    self.cursor.close()
+                    context.cursor.close()
                 except Exception as e:
                     # Cursor kapatılırken hata oluşursa yine de devam et
                     pass
-            self.cursor = None
-            
-            if self.connection and self.connection.is_connected():
-                self.connection.close()
-                self.connection = None
+            state.contexts = []
+
+            if state.pooled_connection is not None:
+                # Havuz bağlantıları kapatılmaz, iade edilir
+                _pool.release(state.pooled_connection)
+                state.pooled_connection = None
+
+            if state.replica_connection is not None:
+                _replica_pool.release(state.replica_connection)
+                state.replica_connection = None
+
+            if state.connection and state.connection.is_connected():
+                state.connection.close()
+            state.connection = None
         except Exception as e:
             # Hata yönetimi
             raise MySQLError(f"Error closing database connection: {e}")
 
     def _ensure_connection(self):
-        """5.2.3. Bağlantının aktif olup olmadığını kontrol eder. Değilse, yeniden bağlanır."""
+        """7.2.3. Mevcut thread için aktif bağlantıyı döndürür. Gerekirse yeniden bağlanır."""
+        state = self._state()
         try:
-            if not self.connection or not self.connection.is_connected():
+            if _request_scope_available():
+                return get_request_connection()
+            if _pool is not None:
+                if state.pooled_connection is None:
+                    state.pooled_connection = _pool.acquire()
+                return state.pooled_connection
+            if not state.connection or not state.connection.is_connected():
                 # Keep only critical reconnection message
                 if not self.connect():
                     raise MySQLError("Veritabanına bağlanılamadı")
+            return state.connection
         except Exception as e:
             # Critical connection error - keep this print
             print(f"❌ Bağlantı kontrol hatası: {e}")
             raise MySQLError(f"Veritabanı bağlantı hatası: {e}")
 
+    def _replica_connection(self, state: threading.local):
+        """7.2.4. Replika bağlantısını döndürür; alınamazsa None (sorgu birincile gider)."""
+        try:
+            if has_app_context is not None and has_app_context():
+                connection = g.get(_REQUEST_REPLICA_KEY)
+                if connection is None:
+                    connection = _replica_pool.acquire()
+                    setattr(g, _REQUEST_REPLICA_KEY, connection)
+                return connection
+            if state.replica_connection is None:
+                state.replica_connection = _replica_pool.acquire()
+            return state.replica_connection
+        except Exception as e:
+            print(f"⚠️  Replika bağlantısı alınamadı, birincil kullanılıyor: {e}")
+            return None
+
     # -------------------------------------------------------------------------
-    # 5.3. Context Manager Metotları
+    # 7.3. Context Manager Metotları
     # -------------------------------------------------------------------------
-    def __enter__(self):
-        """5.3.1. 'with' bloğu için giriş metodu. Bağlantıyı sağlar ve yeni bir cursor döner."""
-        self._ensure_connection()
+    def __enter__(self) -> CursorContext:
+        """7.3.1. 'with' bloğu için giriş metodu. İzole bir cursor/bağlantı bağlamı döner."""
+        state = self._state()
+        connection = None
+        request_scoped = False
+        if state.contexts:
+            # İç içe bloklar dıştaki bloğun bağlantısını (ve transaction'ını) kullanır
+            connection = state.contexts[-1].connection
+            request_scoped = state.contexts[-1].request_scoped
+        elif _replica_requested():
+            connection = self._replica_connection(state)
+            request_scoped = connection is not None and has_app_context is not None and has_app_context()
+        if connection is None:
+            connection = self._ensure_connection()
+            request_scoped = _request_scope_available()
+            if request_scoped:
+                # Birincil kullanıldıktan sonra isteğin okumaları da birincilden yapılır
+                setattr(g, _REQUEST_PRIMARY_PINNED_KEY, True)
         # Her 'with' bloğu için yeni bir cursor oluşturmak, izolasyon sağlar.
-        if not self.cursor:
-            self.cursor = self.connection.cursor(dictionary=True)
-        return self
+        context = CursorContext(connection, request_scoped)
+        if request_scoped:
+            _enter_request_block(connection)
+        state.contexts.append(context)
+        return context
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        """5.3.2. 'with' bloğundan çıkıldığında sadece cursor'u kapatır, bağlantıyı korur."""
-        # Sadece cursor'u kapat, bağlantıyı koru
-        if self.cursor:
-            try:
-                self.cursor.close()
-            except Exception as e:
-                pass
-        self.cursor = None
-        
-        # Hata durumunda rollback, başarılı durumda commit
-        if exc_type and self.connection:
+        """7.3.2. 'with' bloğundan çıkıldığında cursor'u kapatır; en dıştaki blokta bağlantıyı havuza iade eder."""
+        state = self._state()
+        context = state.contexts.pop() if state.contexts else None
+        if context is None:
+            return
+        # Bu blok, bağlantı üzerindeki en dıştaki blok mu?
+        if context.request_scoped:
+            outermost = _exit_request_block(context.connection)
+        else:
+            outermost = not state.contexts
+
+        # Cursor'u kapat
+        try:
+            context.cursor.close()
+        except Exception as e:
+            pass
+
+        # Transaction yalnızca en dıştaki blokta sonlanır: iç blok dıştakinin
+        # yarım işini commit etmez, iç bloktaki hata tüm transaction'ı geri almaz
+        # (hata dış bloğa yayılırsa orada geri alınır)
+        if outermost:
             try:
-                self.connection.rollback()
+                if exc_type:
+                    context.connection.rollback()
+                else:
+                    context.connection.commit()
             except Exception as e:
                 pass
-        elif self.connection:
-            try:
-                self.connection.commit()
-            except Exception as e:
-                pass
\ No newline at end of file
+
+        # En dıştaki blok bitince bağlantıyı havuza iade et
+        if context.request_scoped:
+            if outermost:
+                _release_request_block_connection(context.connection)
+            return
+        if not state.contexts and state.pooled_connection is not None:
+            _pool.release(state.pooled_connection)
+            state.pooled_connection = None
+        if not state.contexts and state.replica_connection is not None:
+            _replica_pool.release(state.replica_connection)
+            state.replica_connection = None
@@ -16,19 +16,23 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 
 from app.database.db_connection import DatabaseConnection
 from app.database.curriculum_data_loader import JSONDataLoader
+from app.database.curriculum_cache import curriculum_cache
 from app.database.schemas import (
     GRADES_TABLE_SQL, GRADES_SAMPLE_DATA,
     SUBJECTS_TABLE_SQL, SUBJECTS_SAMPLE_DATA,
     UNITS_TABLE_SQL, UNITS_SAMPLE_DATA,
     TOPICS_TABLE_SQL, TOPICS_SAMPLE_DATA,
-    QUESTIONS_TABLE_SQL, QUESTIONS_SAMPLE_DATA,
+    QUESTIONS_TABLE_SQL, QUESTIONS_SAMPLE_DATA, QUESTIONS_HIERARCHY_BACKFILL_SQL, QUESTIONS_OPTION_COUNT_BACKFILL_SQL,
     QUESTION_OPTIONS_TABLE_SQL, QUESTION_OPTIONS_SAMPLE_DATA,
     USERS_TABLE_SQL, USERS_SAMPLE_DATA,
-    QUIZ_SESSIONS_TABLE_SQL, QUIZ_SESSIONS_SAMPLE_DATA,
-    QUIZ_SESSION_QUESTIONS_TABLE_SQL, QUIZ_SESSION_QUESTIONS_SAMPLE_DATA
+    QUIZ_SESSIONS_TABLE_SQL, QUIZ_SESSIONS_SAMPLE_DATA, QUIZ_SESSIONS_DEADLINE_BACKFILL_SQL,
+    QUIZ_SESSION_QUESTIONS_TABLE_SQL, QUIZ_SESSION_QUESTIONS_SAMPLE_DATA,
+    QUIZ_SESSION_RESULTS_TABLE_SQL, QUIZ_SESSION_RESULTS_SAMPLE_DATA
 )
 from app.database.schemas.chat_sessions_schema import get_chat_sessions_schema
 from app.database.schemas.chat_messages_schema import get_chat_messages_schema
+from app.database.schemas.ai_response_cache_schema import get_ai_response_cache_schema
+from app.database.schemas.question_ai_texts_schema import get_question_ai_texts_schema
 
 class DatabaseMigrations:
     """
@@ -60,12 +64,41 @@ class DatabaseMigrations:
             'users': (USERS_TABLE_SQL, USERS_SAMPLE_DATA),
             'quiz_sessions': (QUIZ_SESSIONS_TABLE_SQL, QUIZ_SESSIONS_SAMPLE_DATA),
             'quiz_session_questions': (QUIZ_SESSION_QUESTIONS_TABLE_SQL, QUIZ_SESSION_QUESTIONS_SAMPLE_DATA),
+            'quiz_session_results': (QUIZ_SESSION_RESULTS_TABLE_SQL, QUIZ_SESSION_RESULTS_SAMPLE_DATA),
             'chat_sessions': (get_chat_sessions_schema(), ""),  # Chat sessions
-            'chat_messages': (get_chat_messages_schema(), "")  # Chat messages
+            'chat_messages': (get_chat_messages_schema(), ""),  # Chat messages
+            'ai_response_cache': (get_ai_response_cache_schema(), ""),  # Shared quick action responses
+            'question_ai_texts': (get_question_ai_texts_schema(), "")  # Pre-generated quick action texts
         }
         
         # Tablo oluşturma sırası (foreign key bağımlılıklarına göre)
-        self.table_order = ['grades', 'subjects', 'units', 'topics', 'questions', 'question_options', 'users', 'quiz_sessions', 'quiz_session_questions', 'chat_sessions', 'chat_messages']
+        self.table_order = ['grades', 'subjects', 'units', 'topics', 'questions', 'question_options', 'users', 'quiz_sessions', 'quiz_session_questions', 'quiz_session_results', 'chat_sessions', 'chat_messages', 'ai_response_cache', 'question_ai_texts']
+        
+        # Mevcut veritabanlarına sonradan eklenen tablolar (migration atlansa da oluşturulur)
+        self.upgrade_tables = ['quiz_session_results', 'ai_response_cache', 'question_ai_texts']
+        
+        # Mevcut tablolara sonradan eklenen sütunlar ve indeksler: (tablo, ad, tanım)
+        self.upgrade_columns = [
+            ('quiz_sessions', 'deadline_at', 'TIMESTAMP NULL AFTER end_time'),
+            ('quiz_session_questions', 'option_permutation', 'VARCHAR(255) NULL AFTER question_order'),
+            ('questions', 'unit_id', 'INT NULL AFTER topic_id'),
+            ('questions', 'subject_id', 'INT NULL AFTER unit_id'),
+            ('questions', 'option_count', 'INT DEFAULT 0 AFTER points')
+        ]
+        self.upgrade_indexes = [
+            ('quiz_sessions', 'idx_sessions_status_deadline', '(status, deadline_at)'),
+            ('questions', 'idx_questions_topic_active_difficulty', '(topic_id, is_active, difficulty_level)'),
+            ('questions', 'idx_questions_subject_active_difficulty', '(subject_id, is_active, difficulty_level)'),
+            ('questions', 'idx_questions_playable', '(is_active, option_count)'),
+            ('quiz_session_questions', 'idx_session_questions_progress', '(session_id, user_answer_option_id, question_order)')
+        ]
+        
+        # Sütunlar eklendikten sonra her çalıştırmada uygulanan (tekrarlanabilir) veri düzeltmeleri
+        self.upgrade_backfills = [
+            ('questions.unit_id/subject_id', QUESTIONS_HIERARCHY_BACKFILL_SQL),
+            ('questions.option_count', QUESTIONS_OPTION_COUNT_BACKFILL_SQL),
+            ('quiz_sessions.deadline_at', QUIZ_SESSIONS_DEADLINE_BACKFILL_SQL)
+        ]
 
     def __del__(self):
         """Destructor - bağlantıyı temizle."""
@@ -174,6 +207,8 @@ class DatabaseMigrations:
             else:
                 print("   ⚠️  Unit ID map oluşturulamadı")
             
+            # Müfredat değişti; önbellekteki ağaç bir sonraki istekte yeniden yüklenir
+            curriculum_cache.invalidate()
             return True
             
         except Exception as e:
@@ -190,6 +225,9 @@ class DatabaseMigrations:
             
             # Tabloları sil (child tablolar önce)
             tables = [
+                'ai_response_cache',
+                'question_ai_texts',
+                'quiz_session_results',
                 'quiz_session_questions',
                 'quiz_sessions',
                 'question_options',
@@ -284,6 +322,54 @@ class DatabaseMigrations:
             print(f"❌ Genel tablo kontrol hatası: {e}")
             return False
 
+    def _schema_object_exists(self, query: str, params: tuple) -> bool:
+        """information_schema sorgusu en az bir satır döndürüyor mu?"""
+        with self.db as conn:
+            conn.cursor.execute(query, params)
+            return conn.cursor.fetchone() is not None
+
+    def apply_upgrades(self) -> bool:
+        """Mevcut veritabanında eksik olan, sonradan eklenmiş tablo, sütun ve indeksleri oluşturur."""
+        try:
+            for table_name in self.upgrade_tables:
+                table_sql, _ = self.table_schemas[table_name]
+                if not self._execute_sql(table_sql):
+                    print(f"⚠️  {table_name} tablosu güncellenemedi")
+                    return False
+            
+            for table_name, column_name, definition in self.upgrade_columns:
+                if self._schema_object_exists("""
+                    SELECT 1 FROM information_schema.COLUMNS
+                    WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND COLUMN_NAME = %s
+                """, (table_name, column_name)):
+                    continue
+                if not self._execute_sql(f"ALTER TABLE {table_name} ADD COLUMN {column_name} {definition}"):
+                    print(f"⚠️  {table_name}.{column_name} sütunu eklenemedi")
+                    return False
+                print(f"   ✅ {table_name}.{column_name} sütunu eklendi")
+            
+            for table_name, index_name, columns in self.upgrade_indexes:
+                if self._schema_object_exists("""
+                    SELECT 1 FROM information_schema.STATISTICS
+                    WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND INDEX_NAME = %s
+                """, (table_name, index_name)):
+                    continue
+                if not self._execute_sql(f"ALTER TABLE {table_name} ADD INDEX {index_name} {columns}"):
+                    print(f"⚠️  {table_name}.{index_name} indeksi eklenemedi")
+                    return False
+                print(f"   ✅ {table_name}.{index_name} indeksi eklendi")
+            
+            for target, backfill_sql in self.upgrade_backfills:
+                if not self._execute_sql(backfill_sql):
+                    print(f"⚠️  {target} verisi güncellenemedi")
+                    return False
+            
+            return True
+            
+        except Exception as e:
+            print(f"❌ Şema güncelleme hatası: {e}")
+            return False
+
     def run_migrations(self):
         """Ana migration işlemini çalıştırır."""
         try:
@@ -292,6 +378,7 @@ class DatabaseMigrations:
             
             # Tabloların mevcut olup olmadığını kontrol et
             if self.check_tables_exist():
+                self.apply_upgrades()
                 print("✅ Tablolar zaten mevcut. Migration atlanıyor...")
                 print("   💡 Eğer tabloları yeniden oluşturmak istiyorsanız:")
                 print("   💡 migrations.force_recreate() metodunu kullanın.")
@@ -304,6 +391,9 @@ class DatabaseMigrations:
             if not self.create_tables():
                 raise Exception("Tablolar oluşturulamadı!")
             
+            # Örnek verilerdeki türetilmiş sütunları doldur
+            self.apply_upgrades()
+            
             print("=" * 60)
             print("🎉 Veritabanı başarıyla oluşturuldu!")
             print("📊 Oluşturulan tablolar:")
@@ -316,6 +406,7 @@ class DatabaseMigrations:
             print("   • users (Kullanıcılar)")
             print("   • quiz_sessions (Quiz Oturumları)")
             print("   • quiz_session_questions (Quiz Oturumu Soruları)")
+            print("   • quiz_session_results (Quiz Oturumu Sonuçları)")
             print("\n📚 Hiyerarşik yapı:")
             print("   Grade → Subject → Unit → Topic → Question → Question Options")
             print("   Quiz Session → Quiz Session Questions")
@@ -338,6 +429,9 @@ class DatabaseMigrations:
             if not self.create_tables():
                 raise Exception("Tablolar oluşturulamadı!")
             
+            # Örnek verilerdeki türetilmiş sütunları doldur
+            self.apply_upgrades()
+            
             print("=" * 60)
             print("🎉 Veritabanı başarıyla yeniden oluşturuldu!")
             
@@ -0,0 +1,113 @@
+# =============================================================================
+# 1.0. MODÜL BAŞLIĞI VE AÇIKLAMASI
+# =============================================================================
+# Bu modül, bir arka plan işinin (write-behind buffer, oturum tarayıcısı)
+# aynı makinedeki birden çok worker sürecinden yalnızca birinde çalışmasını
+# sağlayan `ProcessLock` sınıfını içerir.
+# Kilit, instance dizinindeki bir dosya üzerinde engellemeyen (non-blocking)
+# bir işletim sistemi kilididir; süreç sonlandığında kendiliğinden bırakılır.
+# Kilidi alamayan süreç, isteğe bağlı olarak `<kilit>.contended` işaret
+# dosyasıyla kilit sahibine başka bir sürecin de çalıştığını bildirir.
+# =============================================================================
+
+# =============================================================================
+# 2.0. İÇİNDEKİLER
+# =============================================================================
+# 3.0. GEREKLİ KÜTÜPHANELER
+# 4.0. PROCESSLOCK SINIFI
+#   4.1. __init__(self, path)
+#   4.2. acquire(self)
+#   4.3. release(self)
+#   4.4. signal_contention(self)
+#   4.5. contended(self)
+#   4.6. clear_contention(self)
+# =============================================================================
+
+# =============================================================================
+# 3.0. GEREKLİ KÜTÜPHANELER
+# =============================================================================
+import os
+
+# Dosya kilidi platforma göre seçilir
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+try:
+    import msvcrt
+except ImportError:
+    msvcrt = None
+
+# =============================================================================
+# 4.0. PROCESSLOCK SINIFI
+# =============================================================================
+class ProcessLock:
+    """
+    Dosya tabanlı, süreçler arası tekil çalışma kilidi. Kilit, dosya açık
+    kaldığı sürece (release çağrılana veya süreç bitene kadar) tutulur.
+    """
+
+    def __init__(self, path: str):
+        """4.1. Kilit dosyasının yolunu ayarlar; kilit henüz alınmaz."""
+        self.path = path
+        self.contention_path = f"{path}.contended"
+        self._file = None
+
+    @property
+    def held(self) -> bool:
+        """Kilit bu süreçte mi?"""
+        return self._file is not None
+
+    def acquire(self) -> bool:
+        """4.2. Kilidi beklemeden almayı dener; başka süreçteyse False döndürür."""
+        if self._file is not None:
+            return True
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        lock_file = open(self.path, 'a+')
+        try:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            elif msvcrt is not None:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_NBLCK, 1)
+        except OSError:
+            lock_file.close()
+            return False
+        self._file = lock_file
+        return True
+
+    def release(self) -> None:
+        """4.3. Kilidi bırakır."""
+        lock_file, self._file = self._file, None
+        if lock_file is None:
+            return
+        try:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+            elif msvcrt is not None:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+        except OSError:
+            pass
+        lock_file.close()
+
+    def signal_contention(self) -> None:
+        """4.4. Kilit sahibine, kilidi isteyen başka bir süreç olduğunu bildirir."""
+        try:
+            with open(self.contention_path, 'w') as f:
+                f.write(str(os.getpid()))
+        except OSError:
+            pass
+
+    def contended(self) -> bool:
+        """4.5. Kilit alındıktan sonra başka bir süreç kilidi istedi mi?"""
+        return os.path.exists(self.contention_path)
+
+    def clear_contention(self) -> None:
+        """4.6. Önceki çalıştırmalardan kalan işareti siler."""
+        try:
+            os.remove(self.contention_path)
+        except OSError:
+            pass
@@ -0,0 +1,231 @@
+# =============================================================================
+# 1.0. MODÜL BAŞLIĞI VE AÇIKLAMASI
+# =============================================================================
+# Bu modül, Flask isteği başına çalışan SQL ifadelerini ölçen
+# `QueryRecorder` sınıfını ve cursor'ları saran `TimedCursor` sınıfını içerir.
+# Her istek için sorgu sayısı, toplam veritabanı süresi ve en yavaş ifade
+# kaydedilir. İstek sonunda bir log satırı yazılır; debug/test modunda
+# değerler `Server-Timing` ve `X-DB-Query-Count` başlıklarıyla döndürülür.
+# Aynı (normalize edilmiş) ifade bir istekte eşik değerinden fazla
+# çalışırsa N+1 uyarısı loglanır. Akış (streaming, ör. SSE) yanıtlarında
+# gövde üretilirken çalışan sorgular da sayılır; log satırı istek kapanırken
+# (teardown) yazılır ve başlıklar eklenmez.
+# İstek dışındaki (arka plan thread'leri, CLI) sorgular yalnızca yavaş sorgu
+# kaydı (slow_query_log) açıksa ölçülür.
+# =============================================================================
+
+# =============================================================================
+# 2.0. İÇİNDEKİLER
+# =============================================================================
+# 3.0. GEREKLİ KÜTÜPHANELER
+# 4.0. MODÜL SEVİYESİ YAPILANDIRMA
+# 5.0. QUERYRECORDER SINIFI
+#   5.1. __init__(self)
+#   5.2. normalize(statement)
+#   5.3. record(self, statement, elapsed)
+#   5.4. repeated(self, threshold)
+#   5.5. summary(self)
+# 6.0. TIMEDCURSOR SINIFI
+# 7.0. MODÜL SEVİYESİ FONKSİYONLAR
+#   7.1. current_recorder()
+#   7.2. wrap_cursor(cursor)
+#   7.3. init_app(app)
+# =============================================================================
+
+# =============================================================================
+# 3.0. GEREKLİ KÜTÜPHANELER
+# =============================================================================
+import os
+import re
+import time
+from typing import Dict, List, Optional, Tuple, Any
+
+from app.database.slow_query_log import slow_query_log
+
+# Flask opsiyoneldir; CLI scriptleri Flask olmadan da çalışabilmelidir.
+try:
+    from flask import g, has_app_context
+except ImportError:
+    g = None
+    has_app_context = None
+
+# =============================================================================
+# 4.0. MODÜL SEVİYESİ YAPILANDIRMA
+# =============================================================================
+# Aynı ifade bir istekte bu sayıdan fazla çalışırsa N+1 uyarısı verilir
+QUERY_REPEAT_WARN_THRESHOLD = int(os.getenv('QUERY_REPEAT_WARN_THRESHOLD', '10'))
+
+# Flask `g` nesnesinde istek kaydedicisinin tutulduğu anahtar
+_REQUEST_RECORDER_KEY = '_db_query_recorder'
+
+# Normalizasyon: IN (%s, %s, ...) listeleri, sayısal/metin sabitleri ve boşluklar
+_IN_LIST_RE = re.compile(r'\bIN\s*\(\s*%s(?:\s*,\s*%s)*\s*\)', re.IGNORECASE)
+_STRING_RE = re.compile(r"'(?:[^'\\]|\\.)*'")
+_NUMBER_RE = re.compile(r'\b\d+\b')
+_SPACE_RE = re.compile(r'\s+')
+
+# =============================================================================
+# 5.0. QUERYRECORDER SINIFI
+# =============================================================================
+class QueryRecorder:
+    """Tek bir isteğin SQL istatistiklerini tutar."""
+
+    def __init__(self):
+        """5.1. Boş bir kaydedici oluşturur."""
+        self.started = time.perf_counter()
+        self.count = 0
+        self.total_time = 0.0
+        self.slowest: Tuple[float, Optional[str]] = (0.0, None)
+        self.statements: Dict[str, int] = {}
+
+    @staticmethod
+    def normalize(statement: str) -> str:
+        """5.2. İfadeyi parametrelerden bağımsız bir biçime indirger."""
+        statement = _IN_LIST_RE.sub('IN (...)', statement)
+        statement = _STRING_RE.sub('?', statement)
+        statement = _NUMBER_RE.sub('?', statement)
+        return _SPACE_RE.sub(' ', statement).strip()
+
+    def record(self, statement: Any, elapsed: float) -> None:
+        """5.3. Çalışan bir ifadeyi ve süresini kaydeder."""
+        if isinstance(statement, (bytes, bytearray)):
+            statement = statement.decode('utf-8', 'replace')
+        normalized = self.normalize(str(statement))
+        self.count += 1
+        self.total_time += elapsed
+        self.statements[normalized] = self.statements.get(normalized, 0) + 1
+        if elapsed > self.slowest[0]:
+            self.slowest = (elapsed, normalized)
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        """5.4. Eşikten fazla tekrar eden ifadeleri (çoktan aza) döndürür."""
+        return sorted(
+            ((statement, count) for statement, count in self.statements.items() if count > threshold),
+            key=lambda item: item[1], reverse=True
+        )
+
+    def summary(self) -> Dict[str, Any]:
+        """5.5. İstek özetini döndürür."""
+        return {
+            'query_count': self.count,
+            'db_time_ms': round(self.total_time * 1000, 2),
+            'slowest_ms': round(self.slowest[0] * 1000, 2),
+            'slowest_statement': self.slowest[1],
+            'distinct_statements': len(self.statements)
+        }
+
+# =============================================================================
+# 6.0. TIMEDCURSOR SINIFI
+# =============================================================================
+class TimedCursor:
+    """
+    execute/executemany çağrılarını ölçüp istek kaydedicisine ve (açıksa)
+    yavaş sorgu kaydına yazan cursor sarmalayıcısı. Diğer tüm öznitelikler
+    (fetchone, rowcount, lastrowid, ...) asıl cursor'a yönlendirilir.
+    """
+    __slots__ = ('_cursor', '_recorder')
+
+    def __init__(self, cursor, recorder: Optional[QueryRecorder]):
+        self._cursor = cursor
+        self._recorder = recorder
+
+    def _finish(self, operation, params, started: float) -> None:
+        elapsed = time.perf_counter() - started
+        if self._recorder is not None:
+            self._recorder.record(operation, elapsed)
+        if slow_query_log.enabled:
+            slow_query_log.capture(operation, params, elapsed)
+
+    def execute(self, operation, params=None, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return self._cursor.execute(operation, params, *args, **kwargs)
+        finally:
+            self._finish(operation, params, started)
+
+    def executemany(self, operation, seq_params, *args, **kwargs):
+        # Generator verilirse ilk satır ölçüm için okunabilsin
+        seq_params = list(seq_params)
+        started = time.perf_counter()
+        try:
+            return self._cursor.executemany(operation, seq_params, *args, **kwargs)
+        finally:
+            # Plan için ilk parametre satırı yeterlidir
+            self._finish(operation, seq_params[0] if seq_params else None, started)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+# =============================================================================
+# 7.0. MODÜL SEVİYESİ FONKSİYONLAR
+# =============================================================================
+def current_recorder() -> Optional[QueryRecorder]:
+    """7.1. Mevcut isteğin kaydedicisini döndürür (istek dışında veya kapalıysa None)."""
+    if has_app_context is None or not has_app_context():
+        return None
+    return g.get(_REQUEST_RECORDER_KEY)
+
+def wrap_cursor(cursor):
+    """7.2. İstek ölçümü veya yavaş sorgu kaydı açıksa cursor'u sarar; değilse olduğu gibi döndürür."""
+    recorder = current_recorder()
+    if recorder is None and not slow_query_log.enabled:
+        return cursor
+    return TimedCursor(cursor, recorder)
+
+def init_app(app) -> bool:
+    """7.3. Flask config'i QUERY_STATS_ENABLED ise istek başına ölçümü etkinleştirir."""
+    if not app.config.get('QUERY_STATS_ENABLED', True):
+        return False
+
+    threshold = app.config.get('QUERY_REPEAT_WARN_THRESHOLD', QUERY_REPEAT_WARN_THRESHOLD)
+
+    @app.before_request
+    def _start_query_recorder():
+        setattr(g, _REQUEST_RECORDER_KEY, QueryRecorder())
+
+    def _log_query_stats(recorder: QueryRecorder) -> Dict[str, Any]:
+        """İstek özetini ve olası N+1 uyarılarını loglar."""
+        from flask import request
+
+        summary = recorder.summary()
+        app.logger.info(
+            f"{request.method} {request.path} -> {summary['query_count']} queries, "
+            f"{summary['db_time_ms']}ms db, slowest {summary['slowest_ms']}ms: {summary['slowest_statement']}"
+        )
+        for statement, count in recorder.repeated(threshold):
+            app.logger.warning(
+                f"Possible N+1 on {request.method} {request.path}: statement ran {count} times: {statement}"
+            )
+        return summary
+
+    @app.after_request
+    def _report_query_stats(response):
+        # Akış yanıtlarında gövde henüz üretilmedi; özet teardown'da yazılır
+        if response.is_streamed:
+            return response
+
+        recorder = g.pop(_REQUEST_RECORDER_KEY, None)
+        if recorder is None or recorder.count == 0:
+            return response
+
+        summary = _log_query_stats(recorder)
+        if app.debug or app.testing:
+            response.headers.add(
+                'Server-Timing',
+                f'db;dur={summary["db_time_ms"]};desc="{summary["query_count"]} queries", '
+                f'db-slowest;dur={summary["slowest_ms"]}'
+            )
+            response.headers['X-DB-Query-Count'] = str(summary['query_count'])
+        return response
+
+    @app.teardown_request
+    def _report_streamed_query_stats(exc=None):
+        # Akış yanıtlarında gövde tamamlanıp istek kapanınca çalışır
+        recorder = g.pop(_REQUEST_RECORDER_KEY, None)
+        if recorder is not None and recorder.count:
+            _log_query_stats(recorder)
+
+    return True
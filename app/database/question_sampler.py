@@ -0,0 +1,183 @@
+# =============================================================================
+# 1.0. MODÜL BAŞLIĞI VE AÇIKLAMASI
+# =============================================================================
+# Bu modül, quiz başlatırken rasgele soru seçimini `ORDER BY RAND()` yerine
+# bellek içi indekslerden yapan `QuestionSampler` sınıfını içerir.
+# Uygun (aktif ve en az 2 şıklı) soru ID'leri (konu, zorluk) ve
+# (ders, zorluk) anahtarlarıyla dizilerde tutulur; k soru O(k) sürede seçilir.
+# Soru bankası değiştiğinde (yükleyici bildirimi veya imza değişimi)
+# indeksler yeniden oluşturulur.
+# =============================================================================
+
+# =============================================================================
+# 2.0. İÇİNDEKİLER
+# =============================================================================
+# 3.0. GEREKLİ KÜTÜPHANELER
+# 4.0. MODÜL SEVİYESİ YAPILANDIRMA
+# 5.0. QUESTIONSAMPLER SINIFI
+#   5.1. __init__(self, check_interval)
+#   5.2. invalidate(self)
+#   5.3. refresh(self, db)
+#   5.4. sample_by_topic(self, db, topic_id, difficulty, count)
+#   5.5. sample_by_subject(self, db, subject_id, difficulty, count)
+#   5.6. get_stats(self)
+# 6.0. MODÜL SEVİYESİ ÖRNEK
+# =============================================================================
+
+# =============================================================================
+# 3.0. GEREKLİ KÜTÜPHANELER
+# =============================================================================
+import os
+import time
+import random
+import threading
+from array import array
+from typing import Dict, List, Optional, Tuple, Any
+
+# =============================================================================
+# 4.0. MODÜL SEVİYESİ YAPILANDIRMA
+# =============================================================================
+# Soru bankası imzasının en fazla hangi sıklıkla kontrol edileceği (saniye)
+QUESTION_SAMPLER_CHECK_SECONDS = float(os.getenv('QUESTION_SAMPLER_CHECK_SECONDS', '60'))
+
+# Bir soru havuzunu oluşturan uygun soruları getiren sorgu
+ELIGIBLE_QUESTIONS_SQL = """
+    SELECT q.id, q.topic_id, q.subject_id, q.difficulty_level
+    FROM questions q
+    WHERE q.is_active = 1 AND q.option_count >= 2
+"""
+
+# Soru bankasının değişip değişmediğini anlamak için kullanılan imza sorgusu
+BANK_SIGNATURE_SQL = """
+    SELECT (SELECT COUNT(*) FROM questions) AS question_count,
+           (SELECT MAX(updated_at) FROM questions) AS questions_updated_at,
+           (SELECT COUNT(*) FROM question_options) AS option_count,
+           (SELECT MAX(updated_at) FROM question_options) AS options_updated_at
+"""
+
+# =============================================================================
+# 5.0. QUESTIONSAMPLER SINIFI
+# =============================================================================
+class QuestionSampler:
+    """
+    Uygun soru ID'lerini (konu/ders, zorluk) anahtarlarıyla bellekte tutar
+    ve rasgele soru seçimini veritabanında sıralama yapmadan gerçekleştirir.
+    Zorluk anahtarı None ise o konu/dersin tüm zorluk seviyelerini kapsar.
+    """
+
+    def __init__(self, check_interval: float = QUESTION_SAMPLER_CHECK_SECONDS):
+        """5.1. Sampler'ı başlatır. İndeksler ilk kullanımda yüklenir."""
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._by_topic: Dict[Tuple[int, Optional[str]], array] = {}
+        self._by_subject: Dict[Tuple[int, Optional[str]], array] = {}
+        self._signature: Optional[Tuple] = None
+        self._checked_at = 0.0
+        self._loaded = False
+        self._refresh_count = 0
+
+    def invalidate(self) -> None:
+        """5.2. İndeksleri geçersiz kılar; bir sonraki seçimde yeniden yüklenir."""
+        with self._lock:
+            self._loaded = False
+            self._signature = None
+
+    def _read_signature(self, db) -> Tuple:
+        """Soru bankasının mevcut imzasını okur."""
+        with db as conn:
+            conn.cursor.execute(BANK_SIGNATURE_SQL)
+            row = conn.cursor.fetchone() or {}
+        return (
+            row.get('question_count'),
+            row.get('questions_updated_at'),
+            row.get('option_count'),
+            row.get('options_updated_at')
+        )
+
+    def refresh(self, db, signature: Optional[Tuple] = None) -> bool:
+        """5.3. Uygun soruları veritabanından okuyup indeksleri yeniden oluşturur."""
+        try:
+            if signature is None:
+                signature = self._read_signature(db)
+
+            with db as conn:
+                conn.cursor.execute(ELIGIBLE_QUESTIONS_SQL)
+                rows = conn.cursor.fetchall()
+
+            by_topic: Dict[Tuple[int, Optional[str]], array] = {}
+            by_subject: Dict[Tuple[int, Optional[str]], array] = {}
+            for row in rows:
+                question_id = row['id']
+                difficulty = row['difficulty_level']
+                for key in ((row['topic_id'], difficulty), (row['topic_id'], None)):
+                    by_topic.setdefault(key, array('I')).append(question_id)
+                for key in ((row['subject_id'], difficulty), (row['subject_id'], None)):
+                    by_subject.setdefault(key, array('I')).append(question_id)
+
+            # Okuyucular kilit almadan eski ya da yeni sözlüğü görür (atomik atama)
+            self._by_topic = by_topic
+            self._by_subject = by_subject
+            self._signature = signature
+            self._checked_at = time.monotonic()
+            self._loaded = True
+            self._refresh_count += 1
+            return True
+
+        except Exception as e:
+            print(f"❌ Soru indeksi yenileme hatası: {e}")
+            return False
+
+    def _ensure_fresh(self, db) -> None:
+        """İndeksler yüklü değilse yükler; kontrol aralığı dolduysa imzayı doğrular."""
+        if self._loaded and time.monotonic() - self._checked_at < self.check_interval:
+            return
+
+        with self._lock:
+            # Kilidi beklerken başka bir thread yenilemiş olabilir
+            if self._loaded and time.monotonic() - self._checked_at < self.check_interval:
+                return
+            signature = self._read_signature(db)
+            if self._loaded and signature == self._signature:
+                self._checked_at = time.monotonic()
+                return
+            self.refresh(db, signature)
+
+    @staticmethod
+    def _difficulty_key(difficulty: Optional[str]) -> Optional[str]:
+        """'random' zorluk seviyesini tüm seviyeleri kapsayan anahtara çevirir."""
+        return None if not difficulty or difficulty == 'random' else difficulty
+
+    @staticmethod
+    def _draw(pool: Optional[array], count: int) -> List[int]:
+        """Havuzdan tekrarsız `count` adet ID seçer (O(k))."""
+        if not pool:
+            return []
+        return random.sample(pool, min(count, len(pool)))
+
+    def sample_by_topic(self, db, topic_id: int, difficulty: str, count: int) -> List[int]:
+        """5.4. Konuya (ve zorluğa) göre rasgele soru ID'leri seçer."""
+        self._ensure_fresh(db)
+        pool = self._by_topic.get((topic_id, self._difficulty_key(difficulty)))
+        return self._draw(pool, count)
+
+    def sample_by_subject(self, db, subject_id: int, difficulty: str, count: int) -> List[int]:
+        """5.5. Derse (ve zorluğa) göre rasgele soru ID'leri seçer."""
+        self._ensure_fresh(db)
+        pool = self._by_subject.get((subject_id, self._difficulty_key(difficulty)))
+        return self._draw(pool, count)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """5.6. İndeks istatistiklerini döndürür."""
+        return {
+            'loaded': self._loaded,
+            'topic_pools': len(self._by_topic),
+            'subject_pools': len(self._by_subject),
+            'refresh_count': self._refresh_count,
+            'seconds_since_check': round(time.monotonic() - self._checked_at, 1) if self._loaded else None
+        }
+
+# =============================================================================
+# 6.0. MODÜL SEVİYESİ ÖRNEK
+# =============================================================================
+# Süreç (process) içinde tüm repository'ler aynı indeksi paylaşır.
+question_sampler = QuestionSampler()
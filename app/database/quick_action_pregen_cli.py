@@ -0,0 +1,294 @@
+# =============================================================================
+# QUICK ACTION PRE-GENERATION CLI SCRIPT
+# =============================================================================
+# Bu script, soru bankasındaki sorular için hızlı eylem metinlerini
+# (açıklama, ipucu) canlı istek yolundan önce, toplu olarak üretir ve
+# `question_ai_texts` tablosuna yazar. Hızlı eylemler önce bu tabloyu okur.
+# Eşzamanlılık ve istek hızı sınırlıdır; her soru grubundan sonra bir kontrol
+# noktası (checkpoint) dosyası yazılır ve iş kaldığı yerden devam eder.
+# =============================================================================
+
+import sys
+import os
+import json
+import time
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# Proje kök dizinini Python path'ine ekle
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(PROJECT_ROOT)
+
+from app.database.chat_repository import ChatRepository
+
+# Tekrar denemenin anlamsız olduğu, işi durduran hata kategorileri
+FATAL_ERRORS = ('not_configured', 'auth_error')
+
+
+class RateLimiter:
+    """İstekleri saniyede en fazla `rate` olacak şekilde aralıklandırır."""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._lock = threading.Lock()
+        self._next = 0.0
+
+    def acquire(self):
+        """Sıradaki istek zamanı gelene kadar bekler."""
+        with self._lock:
+            now = time.monotonic()
+            wait = max(0.0, self._next - now)
+            self._next = max(now, self._next) + self.interval
+        if wait:
+            time.sleep(wait)
+
+
+def load_checkpoint(path):
+    """Kontrol noktası dosyasını okur; yoksa veya bozuksa boş sözlük döndürür."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_checkpoint(path, data):
+    """Kontrol noktasını geçici dosya üzerinden atomik olarak yazar."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
+
+def main():
+    """
+    Ana fonksiyon - CLI argümanlarını işler ve metin üretimini başlatır.
+    """
+    parser = argparse.ArgumentParser(
+        description="Soru bankası için açıklama/ipucu metinlerini önceden üretir",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Örnekler:
+  # Tüm sorular için açıklama ve ipucu üret (kaldığı yerden devam eder)
+  python app/database/quick_action_pregen_cli.py
+
+  # 8 eşzamanlı istek, saniyede en fazla 4 istek
+  python app/database/quick_action_pregen_cli.py --concurrency 8 --rate 4
+
+  # Baştan tara (başarısız kalanları yeniden dener, üretilmişleri atlar)
+  python app/database/quick_action_pregen_cli.py --reset
+
+  # Yerel stub model sunucusuna karşı çalıştır
+  GEMINI_API_KEY=test python app/database/quick_action_pregen_cli.py --api-url http://127.0.0.1:8089/generate
+        """
+    )
+
+    parser.add_argument(
+        '--actions',
+        type=str,
+        default='explain,hint',
+        help='Üretilecek hızlı eylemler, virgülle ayrılmış (varsayılan: explain,hint)'
+    )
+
+    parser.add_argument(
+        '--concurrency',
+        type=int,
+        default=4,
+        help='Aynı anda gönderilecek en fazla istek (varsayılan: 4)'
+    )
+
+    parser.add_argument(
+        '--rate',
+        type=float,
+        default=2.0,
+        help='Saniyede en fazla istek, 0 sınırsız (varsayılan: 2)'
+    )
+
+    parser.add_argument(
+        '--batch-size',
+        type=int,
+        default=100,
+        help='Bir seferde işlenen soru sayısı; her gruptan sonra checkpoint yazılır (varsayılan: 100)'
+    )
+
+    parser.add_argument(
+        '--limit',
+        type=int,
+        default=0,
+        help='Bu çalıştırmada üretilecek en fazla metin, 0 sınırsız (varsayılan: 0)'
+    )
+
+    parser.add_argument(
+        '--checkpoint',
+        type=str,
+        default=os.path.join(PROJECT_ROOT, 'instance', 'quick_action_pregen.json'),
+        help='Kontrol noktası dosyası (varsayılan: instance/quick_action_pregen.json)'
+    )
+
+    parser.add_argument(
+        '--reset',
+        action='store_true',
+        help='Kontrol noktasını yok say ve baştan tara'
+    )
+
+    parser.add_argument(
+        '--force',
+        action='store_true',
+        help='Güncel metni olan soruları da yeniden üret'
+    )
+
+    parser.add_argument(
+        '--api-url',
+        type=str,
+        help='Gemini generateContent adresi (ör. yerel stub model sunucusu)'
+    )
+
+    parser.add_argument(
+        '--verbose', '-v',
+        action='store_true',
+        help='Detaylı çıktı göster'
+    )
+
+    parser.add_argument(
+        '--dry-run',
+        action='store_true',
+        help='AI çağrısı ve kayıt yapmadan üretilecek metinleri say'
+    )
+
+    args = parser.parse_args()
+
+    # Servis adresi örnek oluşturulurken okunduğu için önce ayarlanır
+    if args.api_url:
+        os.environ['GEMINI_API_URL'] = args.api_url
+
+    from app.services.gemini_api_service import GeminiAPIService
+    from app.services.chat_message_service import ChatMessageService
+    from app.services.chat_session_service import ChatSessionService
+
+    repo = ChatRepository()
+    message_service = ChatMessageService()
+    intro = ChatSessionService().context_templates['educational_intro']
+    gemini_service = GeminiAPIService()
+
+    actions = [action.strip() for action in args.actions.split(',') if action.strip()]
+    unknown = [action for action in actions if action not in message_service.quick_actions]
+    if unknown:
+        print(f"❌ Bilinmeyen hızlı eylem: {', '.join(unknown)}")
+        return 1
+    prompt_versions = {action: message_service.quick_actions[action].get('version', 1) for action in actions}
+
+    if not args.dry_run and not gemini_service.is_available():
+        print("❌ GEMINI_API_KEY tanımlı değil")
+        return 1
+
+    # Kontrol noktası yalnızca aynı eylem/şablon versiyonlarıyla geçerlidir
+    checkpoint = {} if args.reset else load_checkpoint(args.checkpoint)
+    if checkpoint.get('prompt_versions') != prompt_versions:
+        checkpoint = {}
+    cursor = checkpoint.get('last_question_id', 0)
+    if cursor:
+        print(f"↪️  Kontrol noktasından devam ediliyor (soru ID > {cursor})")
+
+    limiter = RateLimiter(args.rate)
+    # Ölümcül hata (geçersiz anahtar vb.) diğer işçileri durdurur
+    fatal = threading.Event()
+    limit_reached = False
+    counts_lock = threading.Lock()
+    counts = {'generated': 0, 'failed': 0, 'skipped': 0}
+
+    def generate(task):
+        """Tek bir soru/eylem için metni üretir ve kaydeder."""
+        question, action = task
+        if fatal.is_set():
+            return
+        limiter.acquire()
+
+        prompt = message_service.create_shared_quick_action_prompt(action, {
+            'question_text': question['question_text'],
+            'topic_name': question['topic_name']
+        }, intro)
+        start_time = time.time()
+        result = gemini_service.generate_content_result(prompt)
+        response_time_ms = int((time.time() - start_time) * 1000)
+
+        saved = False
+        if result['text']:
+            content = message_service.format_ai_response(result['text'])
+            saved = repo.save_question_ai_text(
+                question['id'], action, prompt_versions[action],
+                content, gemini_service.model_name, response_time_ms
+            )
+        elif result['error'] in FATAL_ERRORS:
+            fatal.set()
+
+        with counts_lock:
+            counts['generated' if saved else 'failed'] += 1
+        if args.verbose or not saved:
+            status = '✅' if saved else f"❌ {result['error'] or 'save_failed'}"
+            print(f"   {status} soru {question['id']} / {action} ({response_time_ms}ms)")
+
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, args.concurrency)) as executor:
+            while not limit_reached:
+                questions = repo.get_questions_for_ai_texts(cursor, args.batch_size)
+                if not questions:
+                    break
+
+                fresh = set() if args.force else repo.get_fresh_question_ai_texts(
+                    [question['id'] for question in questions], prompt_versions
+                )
+
+                # Limit dolarsa kontrol noktası yalnızca tamamen işlenen sorulara ilerler
+                tasks = []
+                batch_cursor = cursor
+                for question in questions:
+                    pending = [(question, action) for action in actions if (question['id'], action) not in fresh]
+                    if args.limit and counts['generated'] + counts['failed'] + len(tasks) + len(pending) > args.limit:
+                        limit_reached = True
+                        break
+                    tasks.extend(pending)
+                    counts['skipped'] += len(actions) - len(pending)
+                    batch_cursor = question['id']
+
+                if args.dry_run:
+                    print(f"🔍 {len(tasks)} metin üretilecek (soru ID {questions[0]['id']}-{questions[-1]['id']})")
+                    with counts_lock:
+                        counts['generated'] += len(tasks)
+                else:
+                    list(executor.map(generate, tasks))
+                    if fatal.is_set():
+                        # Ölümcül hata; bu grup tamamlanmadığı için kontrol noktası ilerletilmez
+                        print("❌ Gemini isteği reddetti, iş durduruldu")
+                        return 1
+
+                cursor = batch_cursor
+                if not args.dry_run:
+                    save_checkpoint(args.checkpoint, {
+                        'last_question_id': cursor,
+                        'prompt_versions': prompt_versions,
+                        'updated_at': time.strftime('%Y-%m-%dT%H:%M:%S')
+                    })
+
+        print(
+            f"📊 Üretilen: {counts['generated']}, başarısız: {counts['failed']}, "
+            f"güncel olduğu için atlanan: {counts['skipped']}"
+        )
+        return 0
+
+    except KeyboardInterrupt:
+        fatal.set()
+        print("\n⚠️  İşlem kullanıcı tarafından durduruldu (son kontrol noktasından devam edilebilir)")
+        return 1
+    except Exception as e:
+        print(f"❌ Genel hata: {e}")
+        if args.verbose:
+            import traceback
+            traceback.print_exc()
+        return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
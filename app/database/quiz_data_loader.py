@@ -9,6 +9,7 @@ import os
 from typing import Dict, List, Tuple, Optional, Any
 from pathlib import Path
 from .db_connection import DatabaseConnection
+from .question_sampler import question_sampler
 
 class QuestionLoader:
     """
@@ -103,9 +104,14 @@ class QuestionLoader:
         try:
             with self.db as conn:
                 # Question'ı ekle
+                # unit_id/subject_id topic'ten kopyalanır (ders bazlı sorgular join yapmaz);
+                # option_count eklenecek şık sayısıdır (örnekleme şıkları saymaz)
                 question_query = """
-                INSERT INTO questions (name, name_id, topic_id, difficulty_level, question_type, points, description)
-                VALUES (%s, %s, %s, %s, %s, %s, %s)
+                INSERT INTO questions (name, name_id, topic_id, unit_id, subject_id, difficulty_level, question_type, points, option_count, description)
+                SELECT %s, %s, t.id, t.unit_id, u.subject_id, %s, %s, %s, %s, %s
+                FROM topics t
+                JOIN units u ON t.unit_id = u.id
+                WHERE t.id = %s
                 """
                 
                 question_name = question_data['questionText']
@@ -115,14 +121,18 @@ class QuestionLoader:
                 question_values = (
                     question_name,
                     question_name_id,
-                    topic_id,
                     question_data['difficulty'],
                     question_data['questionType'],
                     1,  # Varsayılan puan
-                    question_explanation
+                    len(question_data['options']),
+                    question_explanation,
+                    topic_id
                 )
                 
                 conn.cursor.execute(question_query, question_values)
+                if conn.cursor.rowcount == 0:
+                    print(f"⚠️  Topic bulunamadı (ID: {topic_id}), soru eklenmedi")
+                    return None
                 question_id = conn.cursor.lastrowid
                 
                 # Question options'ları ekle
@@ -191,6 +201,10 @@ class QuestionLoader:
             question_id = self.insert_question(question, topic_id)
             if question_id:
                 success_count += 1
+        
+        # Soru bankası değişti; rasgele seçim indeksini yenilet
+        if success_count:
+            question_sampler.invalidate()
         return success_count, len(questions)
     
     def process_all_question_files(self) -> Dict[str, Tuple[int, int]]:
@@ -12,28 +12,44 @@
 #   4.1. Constructor ve Başlatma
 #   4.2. Quiz Session İşlemleri
 #     4.2.1. create_session(self, session_data)
+#     4.2.1b. create_session_with_questions(self, session_data, questions)
 #     4.2.2. get_session(self, session_id)
 #     4.2.3. update_session(self, session_id, update_data)
-#     4.2.4. complete_session(self, session_id, results)
+#     4.2.4. complete_session(self, session_id, results, results_snapshot)
+#     4.2.4b. save_completion_results(self, session_id, results, results_snapshot)
+#     4.2.5. get_results_snapshot(self, session_id)
+#     4.2.6. get_session_answer_key(self, session_id)
+#     4.2.6b. get_session_state(self, session_id)
+#     4.2.7. claim_expired_sessions(self, grace_seconds, limit)
+#     4.2.8. abandon_idle_sessions(self, idle_hours, limit)
+#     4.2.9. get_session_progress(self, session_id)
 #   4.3. Quiz Session Questions İşlemleri
 #     4.3.1. add_session_questions(self, session_id, questions)
 #     4.3.2. get_session_questions(self, session_id)
+#     4.3.2b. get_session_questions_with_details(self, session_id)
 #     4.3.3. update_answer(self, session_id, question_id, answer_data)
 #     4.3.4. get_session_results(self, session_id)
 #   4.4. Soru Seçimi İşlemleri
 #     4.4.1. get_random_questions(self, topic_id, difficulty, count)
 #     4.4.2. get_random_questions_by_subject(self, subject_id, difficulty, count)
+#     4.4.3. _load_sampled_questions(self, question_ids)
+#     4.4.4. get_options_for_questions(self, question_ids, shuffle)
+#     4.4.5. pack_option_permutation(options)
+#     4.4.6. apply_option_permutation(options, permutation)
 #   4.5. Yardımcı İşlemler
 #     4.5.1. get_correct_answer(self, question_id)
-#     4.5.2. get_question_options(self, question_id)
+#     4.5.2. get_question_options(self, question_id, option_permutation)
 #     4.5.3. get_question_details(self, question_id)
 # =============================================================================
 
 # =============================================================================
 # 3.0. GEREKLİ KÜTÜPHANELER VE MODÜLLER
 # =============================================================================
+import json
+import random
 from typing import Dict, List, Optional, Tuple, Any
-from app.database.db_connection import DatabaseConnection
+from app.database.db_connection import DatabaseConnection, read_only
+from app.database.question_sampler import question_sampler
 
 # =============================================================================
 # 4.0. QUIZ SESSION REPOSITORY SINIFI
@@ -52,30 +68,51 @@ class QuizSessionRepository:
     # 4.2. Quiz Session İşlemleri
     # -------------------------------------------------------------------------
     
+    def _insert_session(self, cursor, session_data: Dict[str, Any]) -> int:
+        """quiz_sessions satırını ekler ve yeni ID'yi döndürür (commit etmez)."""
+        cursor.execute("""
+            INSERT INTO quiz_sessions (
+                session_id, user_id, grade_id, subject_id, unit_id, topic_id,
+                difficulty_level, timer_enabled, timer_duration, quiz_mode, question_count,
+                deadline_at
+            ) VALUES (
+                %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s,
+                IF(%s, CURRENT_TIMESTAMP + INTERVAL %s MINUTE, NULL)
+            )
+        """, (
+            session_data['session_id'],
+            session_data['user_id'],
+            session_data['grade_id'],
+            session_data['subject_id'],
+            session_data.get('unit_id'),
+            session_data['topic_id'],
+            session_data.get('difficulty_level', 'random'),
+            session_data.get('timer_enabled', True),
+            session_data.get('timer_duration', 30),
+            session_data.get('quiz_mode', 'educational'),
+            session_data.get('question_count', 10),
+            # Bitiş zamanı sunucuda belirlenir; kalan süre bundan hesaplanır
+            bool(session_data.get('timer_enabled', True) and session_data.get('timer_duration', 30)),
+            session_data.get('timer_duration', 30) or 0
+        ))
+        return cursor.lastrowid
+
+    def _insert_session_questions(self, cursor, session_db_id: int, questions: List[Dict[str, Any]]) -> None:
+        """Session sorularını ve şık sıralarını tek çok satırlı INSERT ile ekler (commit etmez)."""
+        cursor.executemany("""
+            INSERT INTO quiz_session_questions (
+                session_id, question_id, question_order, option_permutation
+            ) VALUES (%s, %s, %s, %s)
+        """, [
+            (session_db_id, question['id'], i, self.pack_option_permutation(question.get('options') or []))
+            for i, question in enumerate(questions, 1)
+        ])
+
     def create_session(self, session_data: Dict[str, Any]) -> Tuple[bool, Optional[int]]:
         """4.2.1. Yeni quiz session'ı oluşturur."""
         try:
             with self.db as conn:
-                conn.cursor.execute("""
-                    INSERT INTO quiz_sessions (
-                        session_id, user_id, grade_id, subject_id, unit_id, topic_id,
-                        difficulty_level, timer_enabled, timer_duration, quiz_mode, question_count
-                    ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                """, (
-                    session_data['session_id'],
-                    session_data['user_id'],
-                    session_data['grade_id'],
-                    session_data['subject_id'],
-                    session_data.get('unit_id'),
-                    session_data['topic_id'],
-                    session_data.get('difficulty_level', 'random'),
-                    session_data.get('timer_enabled', True),
-                    session_data.get('timer_duration', 30),
-                    session_data.get('quiz_mode', 'educational'),
-                    session_data.get('question_count', 10)
-                ))
-                
-                session_db_id = conn.cursor.lastrowid
+                session_db_id = self._insert_session(conn.cursor, session_data)
                 conn.connection.commit()
                 
                 return True, session_db_id
@@ -85,12 +122,31 @@ class QuizSessionRepository:
             print(f"❌ Quiz session oluşturma hatası: {e}")
             return False, None
 
+    def create_session_with_questions(self, session_data: Dict[str, Any],
+                                      questions: List[Dict[str, Any]]) -> Tuple[bool, Optional[int]]:
+        """4.2.1b. Session'ı ve sorularını tek transaction içinde oluşturur."""
+        try:
+            with self.db as conn:
+                session_db_id = self._insert_session(conn.cursor, session_data)
+                self._insert_session_questions(conn.cursor, session_db_id, questions)
+                conn.connection.commit()
+                
+                return True, session_db_id
+                
+        except Exception as e:
+            # Hata durumunda bağlamdan çıkılırken transaction geri alınır
+            print(f"❌ Quiz session oluşturma hatası: {e}")
+            return False, None
+
     def get_session(self, session_id: str) -> Optional[Dict[str, Any]]:
         """4.2.2. Session ID'ye göre quiz session'ı getirir."""
         try:
             with self.db as conn:
                 conn.cursor.execute("""
                     SELECT qs.*, 
+                           GREATEST(0, TIMESTAMPDIFF(SECOND, CURRENT_TIMESTAMP,
+                               COALESCE(qs.deadline_at, qs.start_time + INTERVAL qs.timer_duration MINUTE)
+                           )) as seconds_remaining,
                            g.name as grade_name,
                            s.name as subject_name,
                            u.name as unit_name,
@@ -115,6 +171,9 @@ class QuizSessionRepository:
             with self.db as conn:
                 conn.cursor.execute("""
                     SELECT qs.*, 
+                           GREATEST(0, TIMESTAMPDIFF(SECOND, CURRENT_TIMESTAMP,
+                               COALESCE(qs.deadline_at, qs.start_time + INTERVAL qs.timer_duration MINUTE)
+                           )) as seconds_remaining,
                            g.name as grade_name,
                            s.name as subject_name,
                            u.name as unit_name,
@@ -153,16 +212,50 @@ class QuizSessionRepository:
         except Exception as e:
             return False
 
-    def update_session_timer(self, session_id: str, remaining_time_seconds: int) -> bool:
-        """4.2.3b. Quiz session timer'ını günceller."""
+    def complete_session(self, session_id: str, results: Dict[str, Any],
+                         results_snapshot: Optional[Dict[str, Any]] = None) -> bool:
+        """4.2.4. Aktif quiz session'ı tamamlar ve sonuçları kaydeder.
+        
+        results_snapshot verilirse, bitiş zamanı (end_time) eklenerek tam sonuç
+        belgesi aynı transaction içinde quiz_session_results tablosuna yazılır.
+        Session aktif değilse (zaten tamamlanmış/terk edilmiş) hiçbir şey
+        yazılmaz ve False döner; kayıtlı belge değiştirilmez.
+        """
         try:
             with self.db as conn:
                 conn.cursor.execute("""
                     UPDATE quiz_sessions 
-                    SET remaining_time_seconds = %s,
+                    SET status = 'completed',
+                        end_time = CURRENT_TIMESTAMP,
+                        total_score = %s,
+                        correct_answers = %s,
+                        completion_time_seconds = %s,
                         updated_at = CURRENT_TIMESTAMP
-                    WHERE session_id = %s
-                """, (remaining_time_seconds, session_id))
+                    WHERE session_id = %s AND status = 'active'
+                """, (
+                    results['total_score'],
+                    results['correct_answers'],
+                    results['completion_time_seconds'],
+                    session_id
+                ))
+                
+                if conn.cursor.rowcount == 0:
+                    return False
+                
+                if results_snapshot is not None:
+                    # Belge, UPDATE'in yazdığı bitiş zamanıyla saklanır
+                    conn.cursor.execute("""
+                        SELECT end_time FROM quiz_sessions WHERE session_id = %s
+                    """, (session_id,))
+                    row = conn.cursor.fetchone()
+                    end_time = row['end_time'] if row else None
+                    session_info = results_snapshot.setdefault('sessionInfo', {})
+                    session_info['endTime'] = end_time.isoformat() if hasattr(end_time, 'isoformat') else end_time
+                    
+                    conn.cursor.execute("""
+                        INSERT INTO quiz_session_results (session_id, results_json)
+                        VALUES (%s, %s)
+                    """, (session_id, json.dumps(results_snapshot, default=str, ensure_ascii=False)))
                 
                 conn.connection.commit()
                 return True
@@ -170,19 +263,25 @@ class QuizSessionRepository:
         except Exception as e:
             return False
 
-    def complete_session(self, session_id: str, results: Dict[str, Any]) -> bool:
-        """4.2.4. Quiz session'ı tamamlar ve sonuçları kaydeder."""
+    def save_completion_results(self, session_id: str, results: Dict[str, Any],
+                                results_snapshot: Dict[str, Any]) -> bool:
+        """4.2.4b. Zamanlayıcının tamamladığı session'ın puanlarını ve sonuç belgesini yazar.
+        
+        Belge bir kez yazılır; zaten varsa (birincil anahtar) hiçbir şey değişmez.
+        """
         try:
             with self.db as conn:
+                conn.cursor.execute("""
+                    INSERT INTO quiz_session_results (session_id, results_json)
+                    VALUES (%s, %s)
+                """, (session_id, json.dumps(results_snapshot, default=str, ensure_ascii=False)))
+                
                 conn.cursor.execute("""
                     UPDATE quiz_sessions 
-                    SET status = 'completed',
-                        end_time = CURRENT_TIMESTAMP,
-                        total_score = %s,
+                    SET total_score = %s,
                         correct_answers = %s,
-                        completion_time_seconds = %s,
-                        updated_at = CURRENT_TIMESTAMP
-                    WHERE session_id = %s
+                        completion_time_seconds = %s
+                    WHERE session_id = %s AND status = 'completed'
                 """, (
                     results['total_score'],
                     results['correct_answers'],
@@ -196,6 +295,202 @@ class QuizSessionRepository:
         except Exception as e:
             return False
 
+    def get_results_snapshot(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """4.2.5. Tamamlanmış session'ın kayıtlı sonuç belgesini getirir."""
+        try:
+            with self.db as conn:
+                conn.cursor.execute("""
+                    SELECT results_json FROM quiz_session_results WHERE session_id = %s
+                """, (session_id,))
+                row = conn.cursor.fetchone()
+                
+                if not row or row['results_json'] is None:
+                    return None
+                
+                snapshot = row['results_json']
+                if isinstance(snapshot, (bytes, bytearray)):
+                    snapshot = snapshot.decode('utf-8')
+                return json.loads(snapshot) if isinstance(snapshot, str) else snapshot
+                
+        except Exception as e:
+            return None
+
+    def get_session_answer_key(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """4.2.6. Session durumunu ve soruların doğru cevaplarını tek sorguda getirir."""
+        try:
+            with self.db as conn:
+                conn.cursor.execute("""
+                    SELECT qs.id, qs.status,
+                           TIMESTAMPDIFF(SECOND, CURRENT_TIMESTAMP, qs.deadline_at) as seconds_remaining,
+                           qsq.question_id,
+                           qo.id as correct_option_id,
+                           qo.name as correct_option_name
+                    FROM quiz_sessions qs
+                    LEFT JOIN quiz_session_questions qsq ON qsq.session_id = qs.id
+                    LEFT JOIN question_options qo ON qo.question_id = qsq.question_id AND qo.is_correct = 1
+                    WHERE qs.session_id = %s
+                    ORDER BY qsq.question_order, qo.option_order
+                """, (session_id,))
+                rows = conn.cursor.fetchall()
+                
+                if not rows:
+                    return None
+                
+                answers: Dict[int, Optional[Dict[str, Any]]] = {}
+                for row in rows:
+                    question_id = row['question_id']
+                    if question_id is None or answers.get(question_id):
+                        continue
+                    answers[question_id] = (
+                        {'id': row['correct_option_id'], 'name': row['correct_option_name']}
+                        if row['correct_option_id'] is not None else None
+                    )
+                
+                return {
+                    'id': rows[0]['id'],
+                    'status': rows[0]['status'],
+                    'answers': answers,
+                    'seconds_remaining': rows[0]['seconds_remaining']
+                }
+                
+        except Exception as e:
+            return None
+
+    def get_session_state(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """4.2.6b. Önbellekteki durumu doğrulamak için session durumunu ve kalan süresini getirir."""
+        try:
+            with self.db as conn:
+                conn.cursor.execute("""
+                    SELECT status,
+                           TIMESTAMPDIFF(SECOND, CURRENT_TIMESTAMP, deadline_at) as seconds_remaining
+                    FROM quiz_sessions
+                    WHERE session_id = %s
+                """, (session_id,))
+                return conn.cursor.fetchone()
+                
+        except Exception as e:
+            return None
+
+    def _claim_sessions(self, cursor, rows: List[Dict[str, Any]], set_sql: str) -> List[str]:
+        """Aday session'ları tek tek koşullu UPDATE ile sahiplenir.
+        
+        Yalnızca hâlâ aktif olan satırlar değişir; başka bir süreç veya
+        istemcinin tamamlama isteği arada davrandıysa satır atlanır.
+        """
+        claimed = []
+        for row in rows:
+            cursor.execute(f"""
+                UPDATE quiz_sessions
+                SET {set_sql}
+                WHERE id = %s AND status = 'active'
+            """, (row['id'],))
+            if cursor.rowcount:
+                claimed.append(row['session_id'])
+        return claimed
+
+    def claim_expired_sessions(self, grace_seconds: int, limit: int) -> List[str]:
+        """4.2.7. Süresi (deadline_at + tolerans) dolmuş aktif session'ları 'completed' yapar.
+        
+        Yalnızca bu çağrının durumunu değiştirdiği session'ların ID'lerini
+        döndürür; sonuçlar ardından save_completion_results ile yazılır.
+        Bitiş zamanı olarak süre sonu (deadline_at) kaydedilir.
+        """
+        try:
+            with self.db as conn:
+                conn.cursor.execute("""
+                    SELECT id, session_id
+                    FROM quiz_sessions
+                    WHERE status = 'active'
+                      AND deadline_at < CURRENT_TIMESTAMP - INTERVAL %s SECOND
+                    ORDER BY deadline_at
+                    LIMIT %s
+                """, (grace_seconds, limit))
+                rows = conn.cursor.fetchall()
+                
+                claimed = self._claim_sessions(conn.cursor, rows, """
+                    status = 'completed',
+                    end_time = deadline_at,
+                    updated_at = CURRENT_TIMESTAMP
+                """)
+                conn.connection.commit()
+                return claimed
+                
+        except Exception as e:
+            return []
+
+    def abandon_idle_sessions(self, idle_hours: int, limit: int) -> List[str]:
+        """4.2.8. Süresiz olup uzun süredir işlem görmeyen aktif session'ları 'abandoned' yapar.
+
+        Cevaplar session satırını güncellemediği için son etkinlik, session'ın
+        updated_at değeri ile sorularının answered_at değerlerinden bulunur.
+        Yalnızca bu çağrının durumunu değiştirdiği session'lar döndürülür.
+        """
+        try:
+            with self.db as conn:
+                conn.cursor.execute("""
+                    SELECT qs.id, qs.session_id
+                    FROM quiz_sessions qs
+                    WHERE qs.status = 'active'
+                      AND qs.deadline_at IS NULL
+                      AND qs.updated_at < CURRENT_TIMESTAMP - INTERVAL %s HOUR
+                      AND NOT EXISTS (
+                          SELECT 1
+                          FROM quiz_session_questions qsq
+                          WHERE qsq.session_id = qs.id
+                            AND qsq.answered_at >= CURRENT_TIMESTAMP - INTERVAL %s HOUR
+                      )
+                    LIMIT %s
+                """, (idle_hours, idle_hours, limit))
+                rows = conn.cursor.fetchall()
+                
+                claimed = self._claim_sessions(conn.cursor, rows, """
+                    status = 'abandoned',
+                    end_time = CURRENT_TIMESTAMP,
+                    updated_at = CURRENT_TIMESTAMP
+                """)
+                conn.connection.commit()
+                return claimed
+                
+        except Exception as e:
+            return []
+
+    def get_session_progress(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """4.2.9. Session başlığını, cevap sayılarını ve aktif soruyu tek sorguyla getirir.
+
+        Sayımlar ve aktif soru (session_id, user_answer_option_id, question_order)
+        indeksi üzerinden okunur; maliyet soru sayısından bağımsızdır.
+        """
+        try:
+            with self.db as conn:
+                conn.cursor.execute("""
+                    SELECT qs.id, qs.status, qs.timer_enabled, qs.timer_duration,
+                           qs.quiz_mode, qs.difficulty_level, qs.subject_id, qs.topic_id,
+                           GREATEST(0, TIMESTAMPDIFF(SECOND, CURRENT_TIMESTAMP,
+                               COALESCE(qs.deadline_at, qs.start_time + INTERVAL qs.timer_duration MINUTE)
+                           )) as seconds_remaining,
+                           (SELECT COUNT(*) FROM quiz_session_questions
+                            WHERE session_id = qs.id) as total_questions,
+                           (SELECT COUNT(*) FROM quiz_session_questions
+                            WHERE session_id = qs.id AND user_answer_option_id IS NOT NULL) as answered_questions,
+                           q.id as current_question_id,
+                           q.subject_id as current_subject_id,
+                           q.topic_id as current_topic_id,
+                           q.difficulty_level as current_difficulty_level
+                    FROM quiz_sessions qs
+                    LEFT JOIN questions q ON q.id = (
+                        SELECT question_id FROM quiz_session_questions
+                        WHERE session_id = qs.id AND user_answer_option_id IS NULL
+                        ORDER BY question_order
+                        LIMIT 1
+                    )
+                    WHERE qs.session_id = %s
+                """, (session_id,))
+                
+                return conn.cursor.fetchone()
+                
+        except Exception as e:
+            return None
+
     # -------------------------------------------------------------------------
     # 4.3. Quiz Session Questions İşlemleri
     # -------------------------------------------------------------------------
@@ -204,13 +499,7 @@ class QuizSessionRepository:
         """4.3.1. Session'a soruları ekler."""
         try:
             with self.db as conn:
-                for i, question in enumerate(questions, 1):
-                    conn.cursor.execute("""
-                        INSERT INTO quiz_session_questions (
-                            session_id, question_id, question_order
-                        ) VALUES (%s, %s, %s)
-                    """, (session_id, question['id'], i))
-                
+                self._insert_session_questions(conn.cursor, session_id, questions)
                 conn.connection.commit()
                 return True
                 
@@ -239,19 +528,78 @@ class QuizSessionRepository:
         except Exception as e:
             return []
 
+    def get_session_questions_with_details(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """4.3.2b. Session başlığını, sorularını, soru detaylarını ve şıklarını sabit sayıda sorguyla getirir."""
+        try:
+            with self.db as conn:
+                conn.cursor.execute("""
+                    SELECT qs.id AS session_db_id,
+                           qs.status,
+                           qs.quiz_mode,
+                           qsq.question_id,
+                           qsq.question_order,
+                           qsq.user_answer_option_id,
+                           qsq.option_permutation,
+                           q.name AS question_text,
+                           q.description,
+                           q.difficulty_level,
+                           q.points,
+                           t.name AS topic_name,
+                           s.name AS subject_name
+                    FROM quiz_sessions qs
+                    LEFT JOIN quiz_session_questions qsq ON qsq.session_id = qs.id
+                    LEFT JOIN questions q ON qsq.question_id = q.id
+                    LEFT JOIN topics t ON q.topic_id = t.id
+                    LEFT JOIN subjects s ON q.subject_id = s.id
+                    WHERE qs.session_id = %s
+                    ORDER BY qsq.question_order
+                """, (session_id,))
+                rows = conn.cursor.fetchall()
+
+            if not rows:
+                return None
+
+            header = rows[0]
+            session = {
+                'id': header['session_db_id'],
+                'session_id': session_id,
+                'status': header['status'],
+                'quiz_mode': header['quiz_mode']
+            }
+            questions = [row for row in rows if row['question_id'] is not None]
+
+            # Tüm şıklar tek sorguda; sıra session başında kaydedilen permütasyondan gelir
+            options_by_question = self.get_options_for_questions(
+                [q['question_id'] for q in questions], shuffle=False
+            )
+            for question in questions:
+                question['options'] = self.apply_option_permutation(
+                    options_by_question.get(question['question_id'], []),
+                    question.pop('option_permutation', None)
+                )
+
+            return {
+                'session': session,
+                'questions': questions
+            }
+                
+        except Exception as e:
+            return None
+
     def update_answer(self, session_id: int, question_id: int, answer_data: Dict[str, Any]) -> bool:
-        """4.3.3. Soru cevabını günceller."""
+        """4.3.3. Soru cevabını günceller; yalnızca aktif session'larda yazar."""
         try:
             with self.db as conn:
                 conn.cursor.execute("""
-                    UPDATE quiz_session_questions 
-                    SET user_answer_option_id = %s,
-                        is_correct = %s,
-                        points_earned = %s,
-                        time_spent_seconds = %s,
-                        answered_at = CURRENT_TIMESTAMP,
-                        updated_at = CURRENT_TIMESTAMP
-                    WHERE session_id = %s AND question_id = %s
+                    UPDATE quiz_session_questions qsq
+                    JOIN quiz_sessions qs ON qs.id = qsq.session_id AND qs.status = 'active'
+                    SET qsq.user_answer_option_id = %s,
+                        qsq.is_correct = %s,
+                        qsq.points_earned = %s,
+                        qsq.time_spent_seconds = %s,
+                        qsq.answered_at = CURRENT_TIMESTAMP,
+                        qsq.updated_at = CURRENT_TIMESTAMP
+                    WHERE qsq.session_id = %s AND qsq.question_id = %s
                 """, (
                     answer_data.get('user_answer_option_id'),
                     answer_data.get('is_correct'),
@@ -268,12 +616,14 @@ class QuizSessionRepository:
             return False
 
     def get_session_results(self, session_id: str) -> Dict[str, Any]:
-        """4.3.4. Session sonuçlarını getirir."""
+        """4.3.4. Session sonuçlarını soru, konu/ders ve cevap detaylarıyla birlikte getirir."""
         try:
             with self.db as conn:
                 # Session bilgilerini al
                 conn.cursor.execute("""
-                    SELECT * FROM quiz_sessions WHERE session_id = %s
+                    SELECT *,
+                           TIMESTAMPDIFF(SECOND, start_time, COALESCE(end_time, CURRENT_TIMESTAMP)) as elapsed_seconds
+                    FROM quiz_sessions WHERE session_id = %s
                 """, (session_id,))
                 session = conn.cursor.fetchone()
                 
@@ -285,6 +635,10 @@ class QuizSessionRepository:
                     SELECT qsq.*, 
                            q.name as question_text,
                            q.points,
+                           q.description,
+                           q.difficulty_level,
+                           t.name as topic_name,
+                           s.name as subject_name,
                            qo.id as correct_answer_id,
                            qo.name as correct_answer_text,
                            uao.id as user_answer_id,
@@ -299,6 +653,8 @@ class QuizSessionRepository:
                            END as points_earned
                     FROM quiz_session_questions qsq
                     JOIN questions q ON qsq.question_id = q.id
+                    LEFT JOIN topics t ON q.topic_id = t.id
+                    LEFT JOIN subjects s ON q.subject_id = s.id
                     LEFT JOIN question_options qo ON qo.question_id = q.id AND qo.is_correct = 1
                     LEFT JOIN question_options uao ON qsq.user_answer_option_id = uao.id
                     WHERE qsq.session_id = %s
@@ -322,41 +678,9 @@ class QuizSessionRepository:
     def get_random_questions(self, topic_id: int, difficulty: str, count: int) -> List[Dict[str, Any]]:
         """4.4.1. Belirli kriterlere göre rasgele sorular getirir."""
         try:
-            with self.db as conn:
-                # Zorluk seviyesine göre filtreleme
-                if difficulty == 'random':
-                    difficulty_filter = ""
-                    params = (topic_id, count)
-                else:
-                    difficulty_filter = "AND q.difficulty_level = %s"
-                    params = (topic_id, difficulty, count)
-                
-                conn.cursor.execute(f"""
-                    SELECT q.*, 
-                           COUNT(qo.id) as option_count
-                    FROM questions q
-                    LEFT JOIN question_options qo ON q.id = qo.question_id
-                    WHERE q.topic_id = %s 
-                    AND q.is_active = 1
-                    {difficulty_filter}
-                    GROUP BY q.id
-                    HAVING option_count >= 2
-                    ORDER BY RAND()
-                    LIMIT %s
-                """, params)
-                
-                questions = conn.cursor.fetchall()
-                
-                # Her soru için seçenekleri al
-                for question in questions:
-                    conn.cursor.execute("""
-                        SELECT * FROM question_options 
-                        WHERE question_id = %s AND is_active = 1
-                        ORDER BY RAND()
-                    """, (question['id'],))
-                    question['options'] = conn.cursor.fetchall()
-                
-                return questions
+            # Soru ID'leri bellek içi indeksten seçilir (ORDER BY RAND() yok)
+            question_ids = question_sampler.sample_by_topic(self.db, topic_id, difficulty, count)
+            return self._load_sampled_questions(question_ids)
                 
         except Exception as e:
             return []
@@ -364,47 +688,80 @@ class QuizSessionRepository:
     def get_random_questions_by_subject(self, subject_id: int, difficulty: str, count: int) -> List[Dict[str, Any]]:
         """4.4.1b. Subject ID'ye göre rasgele sorular getirir."""
         try:
-            with self.db as conn:
-                # Zorluk seviyesine göre filtreleme
-                if difficulty == 'random':
-                    difficulty_filter = ""
-                    params = (subject_id, count)
-                else:
-                    difficulty_filter = "AND q.difficulty_level = %s"
-                    params = (subject_id, difficulty, count)
-                
-                conn.cursor.execute(f"""
-                    SELECT q.*, 
-                           COUNT(qo.id) as option_count
-                    FROM questions q
-                    LEFT JOIN question_options qo ON q.id = qo.question_id
-                    JOIN topics t ON q.topic_id = t.id
-                    JOIN units u ON t.unit_id = u.id
-                    WHERE u.subject_id = %s 
-                    AND q.is_active = 1
-                    {difficulty_filter}
-                    GROUP BY q.id
-                    HAVING option_count >= 2
-                    ORDER BY RAND()
-                    LIMIT %s
-                """, params)
-                
-                questions = conn.cursor.fetchall()
-                
-                # Her soru için seçenekleri al
-                for question in questions:
-                    conn.cursor.execute("""
-                        SELECT * FROM question_options 
-                        WHERE question_id = %s AND is_active = 1
-                        ORDER BY RAND()
-                    """, (question['id'],))
-                    question['options'] = conn.cursor.fetchall()
-                
-                return questions
+            # Soru ID'leri bellek içi indeksten seçilir (ORDER BY RAND() yok)
+            question_ids = question_sampler.sample_by_subject(self.db, subject_id, difficulty, count)
+            return self._load_sampled_questions(question_ids)
                 
         except Exception as e:
             return []
 
+    @read_only
+    def _load_sampled_questions(self, question_ids: List[int]) -> List[Dict[str, Any]]:
+        """4.4.3. Seçilen soru ID'lerini, seçim sırası korunarak yükler."""
+        if not question_ids:
+            return []
+
+        with self.db as conn:
+            placeholders = ", ".join(["%s"] * len(question_ids))
+            conn.cursor.execute(f"""
+                SELECT * FROM questions
+                WHERE id IN ({placeholders})
+            """, tuple(question_ids))
+            rows = {row['id']: row for row in conn.cursor.fetchall()}
+            questions = [rows[qid] for qid in question_ids if qid in rows]
+            
+        # Tüm soruların seçenekleri tek sorguda alınır (soru başına sorgu yok)
+        options_by_question = self.get_options_for_questions([q['id'] for q in questions])
+        for question in questions:
+            question['options'] = options_by_question.get(question['id'], [])
+        
+        return questions
+
+    @read_only
+    def get_options_for_questions(self, question_ids: List[int], shuffle: bool = True) -> Dict[int, List[Dict[str, Any]]]:
+        """4.4.4. Birden fazla sorunun seçeneklerini tek sorguda getirir ve soruya göre gruplar."""
+        if not question_ids:
+            return {}
+
+        with self.db as conn:
+            placeholders = ", ".join(["%s"] * len(question_ids))
+            conn.cursor.execute(f"""
+                SELECT * FROM question_options
+                WHERE question_id IN ({placeholders}) AND is_active = 1
+                ORDER BY question_id, option_order
+            """, tuple(question_ids))
+            rows = conn.cursor.fetchall()
+
+        options_by_question: Dict[int, List[Dict[str, Any]]] = {}
+        for row in rows:
+            options_by_question.setdefault(row['question_id'], []).append(row)
+
+        # Şık sırası veritabanı yerine Python'da karıştırılır
+        if shuffle:
+            for options in options_by_question.values():
+                random.shuffle(options)
+
+        return options_by_question
+
+    @staticmethod
+    def pack_option_permutation(options: List[Dict[str, Any]]) -> Optional[str]:
+        """4.4.5. Şıkların gösterim sırasını virgülle ayrılmış option ID'leri olarak paketler."""
+        if not options:
+            return None
+        return ",".join(str(option['id']) for option in options)
+
+    @staticmethod
+    def apply_option_permutation(options: List[Dict[str, Any]], permutation: Optional[str]) -> List[Dict[str, Any]]:
+        """4.4.6. option_order sırasındaki şıkları kaydedilmiş permütasyona göre dizer.
+
+        Permütasyonda olmayan şıklar (sonradan eklenen veya eski session'lar)
+        option_order sırasıyla sona eklenir; böylece sıra her okumada aynıdır.
+        """
+        if not permutation:
+            return options
+        position = {int(option_id): i for i, option_id in enumerate(permutation.split(",")) if option_id}
+        return sorted(options, key=lambda option: position.get(option['id'], len(position)))
+
     # -------------------------------------------------------------------------
     # 4.5. Yardımcı İşlemler
     # -------------------------------------------------------------------------
@@ -426,22 +783,24 @@ class QuizSessionRepository:
         except Exception as e:
             return None
 
-    def get_question_options(self, question_id: int) -> List[Dict[str, Any]]:
-        """4.5.2. Soru seçeneklerini getirir."""
+    @read_only
+    def get_question_options(self, question_id: int, option_permutation: Optional[str] = None) -> List[Dict[str, Any]]:
+        """4.5.2. Soru seçeneklerini getirir (varsa session'a kayıtlı şık sırasıyla)."""
         try:
             with self.db as conn:
                 conn.cursor.execute("""
                     SELECT * FROM question_options 
                     WHERE question_id = %s AND is_active = 1
-                    ORDER BY RAND()
+                    ORDER BY option_order
                 """, (question_id,))
                 
                 options = conn.cursor.fetchall()
-                return options
+                return self.apply_option_permutation(options, option_permutation)
                 
         except Exception as e:
             return []
 
+    @read_only
     def get_question_details(self, question_id: int) -> Optional[Dict[str, Any]]:
         """4.5.3. Soru detaylarını getirir."""
         try:
@@ -452,8 +811,7 @@ class QuizSessionRepository:
                            s.name as subject_name
                     FROM questions q
                     JOIN topics t ON q.topic_id = t.id
-                    JOIN units u ON t.unit_id = u.id
-                    JOIN subjects s ON u.subject_id = s.id
+                    LEFT JOIN subjects s ON q.subject_id = s.id
                     WHERE q.id = %s
                 """, (question_id,))
                 
@@ -17,7 +17,7 @@ from .units_schema import UNITS_TABLE_SQL, UNITS_SAMPLE_DATA
 from .topics_schema import TOPICS_TABLE_SQL, TOPICS_SAMPLE_DATA
 
 # Questions (Sorular) şeması
-from .questions_schema import QUESTIONS_TABLE_SQL, QUESTIONS_SAMPLE_DATA
+from .questions_schema import QUESTIONS_TABLE_SQL, QUESTIONS_SAMPLE_DATA, QUESTIONS_HIERARCHY_BACKFILL_SQL, QUESTIONS_OPTION_COUNT_BACKFILL_SQL
 
 # Question Options (Soru Seçenekleri) şeması
 from .question_options_schema import QUESTION_OPTIONS_TABLE_SQL, QUESTION_OPTIONS_SAMPLE_DATA
@@ -26,20 +26,25 @@ from .question_options_schema import QUESTION_OPTIONS_TABLE_SQL, QUESTION_OPTION
 from .users_schema import USERS_TABLE_SQL, USERS_SAMPLE_DATA
 
 # Quiz Sessions (Quiz Oturumları) şeması
-from .quiz_sessions_schema import QUIZ_SESSIONS_TABLE_SQL, QUIZ_SESSIONS_SAMPLE_DATA
+from .quiz_sessions_schema import QUIZ_SESSIONS_TABLE_SQL, QUIZ_SESSIONS_SAMPLE_DATA, QUIZ_SESSIONS_DEADLINE_BACKFILL_SQL
 
 # Quiz Session Questions (Quiz Oturumu Soruları) şeması
 from .quiz_session_questions_schema import QUIZ_SESSION_QUESTIONS_TABLE_SQL, QUIZ_SESSION_QUESTIONS_SAMPLE_DATA
 
+# Quiz Session Results (Quiz Oturumu Sonuçları) şeması
+from .quiz_session_results_schema import QUIZ_SESSION_RESULTS_TABLE_SQL, QUIZ_SESSION_RESULTS_SAMPLE_DATA
+
 # Tüm şemaları export et
 __all__ = [
     'GRADES_TABLE_SQL', 'GRADES_SAMPLE_DATA',
     'SUBJECTS_TABLE_SQL', 'SUBJECTS_SAMPLE_DATA',
     'UNITS_TABLE_SQL', 'UNITS_SAMPLE_DATA',
     'TOPICS_TABLE_SQL', 'TOPICS_SAMPLE_DATA',
-    'QUESTIONS_TABLE_SQL', 'QUESTIONS_SAMPLE_DATA',
+    'QUESTIONS_TABLE_SQL', 'QUESTIONS_SAMPLE_DATA', 'QUESTIONS_HIERARCHY_BACKFILL_SQL',
+    'QUESTIONS_OPTION_COUNT_BACKFILL_SQL',
     'QUESTION_OPTIONS_TABLE_SQL', 'QUESTION_OPTIONS_SAMPLE_DATA',
     'USERS_TABLE_SQL', 'USERS_SAMPLE_DATA',
-    'QUIZ_SESSIONS_TABLE_SQL', 'QUIZ_SESSIONS_SAMPLE_DATA',
-    'QUIZ_SESSION_QUESTIONS_TABLE_SQL', 'QUIZ_SESSION_QUESTIONS_SAMPLE_DATA'
+    'QUIZ_SESSIONS_TABLE_SQL', 'QUIZ_SESSIONS_SAMPLE_DATA', 'QUIZ_SESSIONS_DEADLINE_BACKFILL_SQL',
+    'QUIZ_SESSION_QUESTIONS_TABLE_SQL', 'QUIZ_SESSION_QUESTIONS_SAMPLE_DATA',
+    'QUIZ_SESSION_RESULTS_TABLE_SQL', 'QUIZ_SESSION_RESULTS_SAMPLE_DATA'
 ] 
\ No newline at end of file
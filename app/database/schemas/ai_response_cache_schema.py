@@ -0,0 +1,32 @@
+# =============================================================================
+# AI RESPONSE CACHE SCHEMA
+# =============================================================================
+# Bu modül, soruya bağlı hızlı eylem (açıkla, ipucu, ilgili) AI yanıtlarının
+# paylaşılan önbelleği için veritabanı şemasını tanımlar.
+# Aynı soru için üretilen yanıt tüm öğrencilere yeniden kullanılır.
+# =============================================================================
+
+def get_ai_response_cache_schema():
+    """AI response cache tablosu için SQL şeması döndürür."""
+    return """
+    CREATE TABLE IF NOT EXISTS ai_response_cache (
+        cache_key CHAR(64) PRIMARY KEY COMMENT 'SHA-256 of action, question, prompt version and prompt',
+        
+        -- Anahtar bileşenleri
+        action_type VARCHAR(50) NOT NULL COMMENT 'Quick action: explain, hint, related',
+        question_id INT NOT NULL,
+        prompt_version INT NOT NULL DEFAULT 1 COMMENT 'Quick action prompt template version',
+        
+        -- Yanıt
+        content TEXT NOT NULL COMMENT 'Formatted AI response',
+        ai_model VARCHAR(50) COMMENT 'AI model used for response',
+        
+        -- Zaman damgaları
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        expires_at TIMESTAMP NOT NULL,
+        
+        -- Indexes for performance
+        INDEX idx_ai_cache_question (question_id, action_type),
+        INDEX idx_ai_cache_expires (expires_at)
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+    """
@@ -0,0 +1,31 @@
+# =============================================================================
+# QUESTION AI TEXTS SCHEMA
+# =============================================================================
+# Bu modül, soru bankası için önceden (çevrimdışı) üretilmiş hızlı eylem
+# metinlerinin (açıklama, ipucu) veritabanı şemasını tanımlar.
+# Metinler quick_action_pregen_cli.py ile üretilir; hızlı eylemler önce
+# bu tabloyu okur.
+# =============================================================================
+
+def get_question_ai_texts_schema():
+    """Question AI texts tablosu için SQL şeması döndürür."""
+    return """
+    CREATE TABLE IF NOT EXISTS question_ai_texts (
+        question_id INT NOT NULL,
+        action_type VARCHAR(50) NOT NULL COMMENT 'Quick action: explain, hint, related',
+        prompt_version INT NOT NULL DEFAULT 1 COMMENT 'Quick action prompt template version',
+        
+        -- Üretilen metin
+        content TEXT NOT NULL COMMENT 'Formatted AI response',
+        ai_model VARCHAR(50) COMMENT 'AI model used for response',
+        response_time_ms INT COMMENT 'AI response time in milliseconds',
+        
+        -- Zaman damgaları (soru bundan sonra güncellendiyse metin eskimiştir)
+        generated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        
+        PRIMARY KEY (question_id, action_type),
+        
+        -- Foreign key constraints
+        FOREIGN KEY (question_id) REFERENCES questions(id) ON DELETE CASCADE
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+    """
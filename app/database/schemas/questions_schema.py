@@ -8,24 +8,60 @@ QUESTIONS_TABLE_SQL = """
 CREATE TABLE IF NOT EXISTS questions (
     id INT AUTO_INCREMENT PRIMARY KEY,
     topic_id INT NOT NULL,
+    unit_id INT NULL,
+    subject_id INT NULL,
     name TEXT NOT NULL,
     name_id VARCHAR(100) NOT NULL,
     difficulty_level ENUM('easy', 'medium', 'hard') DEFAULT 'medium',
     question_type ENUM('multiple_choice', 'true_false', 'fill_blank', 'essay') DEFAULT 'multiple_choice',
     points INT DEFAULT 1,
+    option_count INT DEFAULT 0,
     description TEXT,
     is_active BOOLEAN DEFAULT true,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
     FOREIGN KEY (topic_id) REFERENCES topics(id) ON DELETE CASCADE,
     INDEX idx_questions_topic (topic_id),
+    INDEX idx_questions_topic_active_difficulty (topic_id, is_active, difficulty_level),
+    INDEX idx_questions_subject_active_difficulty (subject_id, is_active, difficulty_level),
     INDEX idx_questions_name_id (name_id),
     INDEX idx_questions_difficulty (difficulty_level),
     INDEX idx_questions_type (question_type),
-    INDEX idx_questions_active (is_active)
+    INDEX idx_questions_active (is_active),
+    INDEX idx_questions_playable (is_active, option_count)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 """
 
+# unit_id/subject_id, topic hiyerarşisinden türetilen kopyalardır (ders bazlı
+# filtrelemede topics → units join'ine gerek kalmaz). Eksik veya topic'i
+# taşınmış satırları düzeltir; her çalıştırmada güvenle tekrarlanabilir.
+QUESTIONS_HIERARCHY_BACKFILL_SQL = """
+UPDATE questions q
+JOIN topics t ON q.topic_id = t.id
+JOIN units u ON t.unit_id = u.id
+SET q.unit_id = t.unit_id,
+    q.subject_id = u.subject_id
+WHERE q.unit_id IS NULL
+   OR q.subject_id IS NULL
+   OR q.unit_id <> t.unit_id
+   OR q.subject_id <> u.subject_id
+"""
+
+# option_count, sorunun aktif şık sayısıdır (en az 2 şıklı sorular oynanabilir).
+# Quiz başlatılırken question_options gruplanmaz; bu sütun filtrelenir.
+QUESTIONS_OPTION_COUNT_BACKFILL_SQL = """
+UPDATE questions q
+LEFT JOIN (
+    SELECT question_id, COUNT(*) AS active_options
+    FROM question_options
+    WHERE is_active = 1
+    GROUP BY question_id
+) qo ON qo.question_id = q.id
+SET q.option_count = COALESCE(qo.active_options, 0)
+WHERE q.option_count IS NULL
+   OR q.option_count <> COALESCE(qo.active_options, 0)
+"""
+
 QUESTIONS_SAMPLE_DATA = """
 INSERT INTO questions (name, name_id, topic_id, difficulty_level, question_type, points) VALUES
 -- Matematik Soruları (Sayılar konusu - topic_id: 1)
@@ -10,6 +10,7 @@ CREATE TABLE IF NOT EXISTS quiz_session_questions (
     session_id INT NOT NULL,
     question_id INT NOT NULL,
     question_order INT NOT NULL,
+    option_permutation VARCHAR(255) NULL,
     user_answer_option_id INT NULL,
     is_correct BOOLEAN NULL,
     points_earned INT DEFAULT 0,
@@ -21,6 +22,7 @@ CREATE TABLE IF NOT EXISTS quiz_session_questions (
     FOREIGN KEY (question_id) REFERENCES questions(id) ON DELETE CASCADE,
     FOREIGN KEY (user_answer_option_id) REFERENCES question_options(id) ON DELETE SET NULL,
     INDEX idx_session_questions_session (session_id),
+    INDEX idx_session_questions_progress (session_id, user_answer_option_id, question_order),
     INDEX idx_session_questions_question (question_id),
     INDEX idx_session_questions_order (question_order),
     INDEX idx_session_questions_correct (is_correct),
@@ -0,0 +1,17 @@
+# =============================================================================
+# QUIZ SESSION RESULTS TABLE SCHEMA
+# =============================================================================
+# Tamamlanan quiz oturumlarının sonuç belgesi (snapshot) tablosu için Python şeması.
+# Sonuçlar oturum tamamlanırken bir kez hesaplanıp JSON olarak saklanır.
+# =============================================================================
+
+QUIZ_SESSION_RESULTS_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS quiz_session_results (
+    session_id VARCHAR(50) PRIMARY KEY,
+    results_json JSON NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (session_id) REFERENCES quiz_sessions(session_id) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+"""
+
+QUIZ_SESSION_RESULTS_SAMPLE_DATA = ""
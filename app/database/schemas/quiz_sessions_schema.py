@@ -22,6 +22,7 @@ CREATE TABLE IF NOT EXISTS quiz_sessions (
     status ENUM('active', 'completed', 'abandoned') DEFAULT 'active',
     start_time TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     end_time TIMESTAMP NULL,
+    deadline_at TIMESTAMP NULL,
     total_score INT DEFAULT 0,
     correct_answers INT DEFAULT 0,
     completion_time_seconds INT DEFAULT 0,
@@ -35,9 +36,23 @@ CREATE TABLE IF NOT EXISTS quiz_sessions (
     INDEX idx_sessions_user (user_id),
     INDEX idx_sessions_session_id (session_id),
     INDEX idx_sessions_status (status),
+    INDEX idx_sessions_status_deadline (status, deadline_at),
     INDEX idx_sessions_start_time (start_time),
     INDEX idx_sessions_grade_subject (grade_id, subject_id)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 """
 
-QUIZ_SESSIONS_SAMPLE_DATA = "" 
\ No newline at end of file
+QUIZ_SESSIONS_SAMPLE_DATA = ""
+
+# deadline_at sütunundan önce başlamış süreli aktif oturumların bitiş zamanını
+# doldurur; aksi halde zamanlayıcı bu oturumları süresiz sayıp terk edilmiş
+# olarak işaretler. updated_at korunur; tekrar çalıştırılması güvenlidir.
+QUIZ_SESSIONS_DEADLINE_BACKFILL_SQL = """
+UPDATE quiz_sessions
+SET deadline_at = start_time + INTERVAL timer_duration MINUTE,
+    updated_at = updated_at
+WHERE status = 'active'
+  AND timer_enabled
+  AND timer_duration > 0
+  AND deadline_at IS NULL
+""" 
\ No newline at end of file
@@ -0,0 +1,265 @@
+# =============================================================================
+# 1.0. MODÜL BAŞLIĞI VE AÇIKLAMASI
+# =============================================================================
+# Bu modül, eşik süresini aşan SQL ifadelerini çağıran repository metoduyla
+# birlikte kaydeden `SlowQueryLog` sınıfını içerir.
+# Mod isteğe bağlıdır (SLOW_QUERY_LOG_ENABLED). Yavaş ifade, parametreleri ve
+# çağrı yeri sorgunun çalıştığı thread'de yakalanır; `EXPLAIN FORMAT=JSON`
+# ise arka plan thread'inde ayrı bir bağlantıyla alınır (isteğin bağlantısı
+# ve okunmamış sonuçları etkilenmez). Kayıtlar dönen (rotating) bir log
+# dosyasına satır başına bir JSON nesnesi olarak yazılır.
+# Parametre değerleri (şifre özeti, e-posta vb.) dosyaya yazılmaz; yalnızca
+# EXPLAIN için bellekte tutulur. Dosyada sayıları ve türleri, plandaki metin
+# sabitleri ise '?' olarak yer alır.
+# =============================================================================
+
+# =============================================================================
+# 2.0. İÇİNDEKİLER
+# =============================================================================
+# 3.0. GEREKLİ KÜTÜPHANELER
+# 4.0. MODÜL SEVİYESİ YAPILANDIRMA
+# 5.0. SLOWQUERYLOG SINIFI
+#   5.1. __init__(self, threshold_ms, max_queue)
+#   5.2. configure(self, path, max_bytes, backup_count)
+#   5.3. start(self)
+#   5.4. stop(self)
+#   5.5. capture(self, statement, params, elapsed)
+#   5.6. process_pending(self)
+#   5.7. get_stats(self)
+# 6.0. MODÜL SEVİYESİ FONKSİYONLAR
+#   6.1. init_app(app)
+# =============================================================================
+
+# =============================================================================
+# 3.0. GEREKLİ KÜTÜPHANELER
+# =============================================================================
+import os
+import re
+import sys
+import json
+import atexit
+import logging
+import threading
+from collections import deque
+from datetime import datetime
+from logging.handlers import RotatingFileHandler
+from typing import Dict, Optional, Any
+
+# =============================================================================
+# 4.0. MODÜL SEVİYESİ YAPILANDIRMA
+# =============================================================================
+# Bu süreyi (milisaniye) aşan ifadeler kaydedilir
+SLOW_QUERY_THRESHOLD_MS = float(os.getenv('SLOW_QUERY_THRESHOLD_MS', '200'))
+
+# EXPLAIN bekleyen en fazla kayıt; aşılırsa en eskiler atılır
+SLOW_QUERY_MAX_QUEUE = int(os.getenv('SLOW_QUERY_MAX_QUEUE', '100'))
+
+# Log dosyasının dönme boyutu ve saklanan eski dosya sayısı
+SLOW_QUERY_LOG_MAX_BYTES = int(os.getenv('SLOW_QUERY_LOG_MAX_BYTES', str(5 * 1024 * 1024)))
+SLOW_QUERY_LOG_BACKUP_COUNT = int(os.getenv('SLOW_QUERY_LOG_BACKUP_COUNT', '3'))
+
+# EXPLAIN desteklenen ifade türleri
+EXPLAINABLE_STATEMENTS = ('SELECT', 'INSERT', 'UPDATE', 'DELETE', 'REPLACE', 'WITH')
+
+# Çağrı yeri aranırken atlanan veritabanı katmanı dosyaları
+_DB_LAYER_FILES = ('db_connection.py', 'query_stats.py', 'slow_query_log.py')
+
+# Plandaki koşullara gömülen metin sabitleri (parametre değerleri)
+_STRING_LITERAL_RE = re.compile(r"'(?:[^'\\]|\\.)*'")
+
+# =============================================================================
+# 5.0. SLOWQUERYLOG SINIFI
+# =============================================================================
+class SlowQueryLog:
+    """
+    Yavaş ifadeleri kuyruğa alır; arka planda planlarını (EXPLAIN) alıp
+    log dosyasına yazar.
+    """
+
+    def __init__(self, threshold_ms: float = SLOW_QUERY_THRESHOLD_MS,
+                 max_queue: int = SLOW_QUERY_MAX_QUEUE):
+        """5.1. Kaydı başlatır. start() çağrılana kadar devre dışıdır."""
+        self.threshold_ms = threshold_ms
+        self.enabled = False
+        self.db = None
+        self._logger = logging.getLogger('btk_app.slow_query')
+        self._logger.propagate = False
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._pending: deque = deque(maxlen=max(1, max_queue))
+        self._captured = 0
+        self._dropped = 0
+        self._written = 0
+        self._explain_failures = 0
+
+    def configure(self, path: str, max_bytes: int = SLOW_QUERY_LOG_MAX_BYTES,
+                  backup_count: int = SLOW_QUERY_LOG_BACKUP_COUNT) -> None:
+        """5.2. Kayıtların yazılacağı dönen log dosyasını ayarlar."""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        for handler in list(self._logger.handlers):
+            self._logger.removeHandler(handler)
+            handler.close()
+        handler = RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backup_count, encoding='utf-8')
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        self._logger.addHandler(handler)
+        self._logger.setLevel(logging.INFO)
+
+    def start(self) -> None:
+        """5.3. EXPLAIN thread'ini başlatır ve kaydı etkinleştirir."""
+        if self._thread is not None:
+            return
+        self.enabled = True
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name='slow-query-log', daemon=True)
+        self._thread.start()
+        atexit.register(self.stop)
+
+    def stop(self) -> None:
+        """5.4. Thread'i durdurur; bekleyen kayıtları yazar."""
+        self.enabled = False
+        self._stopped.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _run(self) -> None:
+        """Yeni kayıt geldiğinde planları alıp yazar."""
+        while not self._stopped.is_set():
+            self._wakeup.wait()
+            self._wakeup.clear()
+            self.process_pending()
+
+    @staticmethod
+    def _call_site() -> str:
+        """İfadeyi çalıştıran ilk veritabanı katmanı dışı fonksiyonu bulur."""
+        frame = sys._getframe(1)
+        while frame is not None and frame.f_code.co_filename.endswith(_DB_LAYER_FILES):
+            frame = frame.f_back
+        if frame is None:
+            return 'unknown'
+        code = frame.f_code
+        return f"{getattr(code, 'co_qualname', code.co_name)} ({os.path.basename(code.co_filename)}:{frame.f_lineno})"
+
+    def capture(self, statement: Any, params: Any, elapsed: float) -> None:
+        """5.5. Eşiği aşan ifadeyi çağrı yeriyle birlikte kuyruğa alır."""
+        elapsed_ms = elapsed * 1000
+        if not self.enabled or elapsed_ms < self.threshold_ms:
+            return
+        if isinstance(statement, (bytes, bytearray)):
+            statement = statement.decode('utf-8', 'replace')
+        statement = str(statement)
+        if statement.lstrip().upper().startswith('EXPLAIN'):
+            return
+
+        entry = {
+            'timestamp': datetime.now().isoformat(),
+            'duration_ms': round(elapsed_ms, 2),
+            'call_site': self._call_site(),
+            'thread': threading.current_thread().name,
+            'statement': ' '.join(statement.split()),
+            # Değerler yalnızca EXPLAIN için bellekte tutulur, dosyaya yazılmaz
+            'params': params
+        }
+        with self._lock:
+            if len(self._pending) == self._pending.maxlen:
+                self._dropped += 1
+            self._pending.append(entry)
+            self._captured += 1
+        self._wakeup.set()
+
+    @staticmethod
+    def _describe_params(params: Any) -> Optional[Dict[str, Any]]:
+        """Parametreleri değerleri olmadan (sayı ve türler) tanımlar."""
+        if params is None:
+            return None
+        if isinstance(params, dict):
+            return {'count': len(params), 'types': {key: type(value).__name__ for key, value in params.items()}}
+        if isinstance(params, (list, tuple)):
+            return {'count': len(params), 'types': [type(value).__name__ for value in params]}
+        return {'count': 1, 'types': [type(params).__name__]}
+
+    @classmethod
+    def _redact_plan(cls, plan: Any) -> Any:
+        """Plandaki metin sabitlerini '?' ile değiştirir (koşullar bağlı değerleri içerir)."""
+        if isinstance(plan, dict):
+            return {key: cls._redact_plan(value) for key, value in plan.items()}
+        if isinstance(plan, list):
+            return [cls._redact_plan(value) for value in plan]
+        if isinstance(plan, str):
+            return _STRING_LITERAL_RE.sub("'?'", plan)
+        return plan
+
+    def _explain(self, statement: str, params: Any) -> Any:
+        """İfadenin planını ayrı bir bağlantıda EXPLAIN FORMAT=JSON ile alır."""
+        if not statement.upper().startswith(EXPLAINABLE_STATEMENTS):
+            return None
+        if self.db is None:
+            from app.database.db_connection import DatabaseConnection
+            self.db = DatabaseConnection()
+        with self.db as conn:
+            conn.cursor.execute(f"EXPLAIN FORMAT=JSON {statement}", params or None)
+            row = conn.cursor.fetchone() or {}
+        plan = next(iter(row.values()), None)
+        return self._redact_plan(json.loads(plan) if isinstance(plan, str) else plan)
+
+    def process_pending(self) -> int:
+        """5.6. Kuyruktaki kayıtların planlarını alır ve log dosyasına yazar."""
+        written = 0
+        while True:
+            with self._lock:
+                if not self._pending:
+                    return written
+                entry = self._pending.popleft()
+
+            params = entry.pop('params', None)
+            entry['params'] = self._describe_params(params)
+            try:
+                entry['explain'] = self._explain(entry['statement'], params)
+            except Exception as e:
+                self._explain_failures += 1
+                entry['explain'] = {'error': self._redact_plan(str(e))}
+
+            try:
+                self._logger.info(json.dumps(entry, ensure_ascii=False, default=str))
+                self._written += 1
+                written += 1
+            except Exception as e:
+                print(f"❌ Yavaş sorgu kaydı yazılamadı: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """5.7. Yavaş sorgu kaydı istatistiklerini döndürür."""
+        with self._lock:
+            pending = len(self._pending)
+        return {
+            'enabled': self.enabled,
+            'threshold_ms': self.threshold_ms,
+            'captured': self._captured,
+            'pending': pending,
+            'dropped': self._dropped,
+            'written': self._written,
+            'explain_failures': self._explain_failures
+        }
+
+# =============================================================================
+# 6.0. MODÜL SEVİYESİ FONKSİYONLAR
+# =============================================================================
+# Süreç (process) içinde tüm bağlantılar aynı kaydı paylaşır.
+slow_query_log = SlowQueryLog()
+
+def init_app(app) -> bool:
+    """6.1. Flask config'i SLOW_QUERY_LOG_ENABLED ise yavaş sorgu kaydını başlatır."""
+    if not app.config.get('SLOW_QUERY_LOG_ENABLED', False):
+        return False
+    slow_query_log.threshold_ms = app.config.get('SLOW_QUERY_THRESHOLD_MS', SLOW_QUERY_THRESHOLD_MS)
+    slow_query_log.configure(
+        app.config.get('SLOW_QUERY_LOG_FILE') or os.path.join(app.instance_path, 'slow_queries.log'),
+        max_bytes=app.config.get('SLOW_QUERY_LOG_MAX_BYTES', SLOW_QUERY_LOG_MAX_BYTES),
+        backup_count=app.config.get('SLOW_QUERY_LOG_BACKUP_COUNT', SLOW_QUERY_LOG_BACKUP_COUNT)
+    )
+    slow_query_log.start()
+    return True
@@ -36,7 +36,7 @@
 # =============================================================================
 from mysql.connector import Error as MySQLError
 from typing import Optional, Dict, List, Tuple
-from app.database.db_connection import DatabaseConnection
+from app.database.db_connection import DatabaseConnection, read_only
 
 # =============================================================================
 # 4.0. USERREPOSITORY SINIFI
@@ -143,6 +143,7 @@ class UserRepository:
         finally:
             self._close_if_owned()
 
+    @read_only
     def get_user_by_id(self, user_id: int) -> Optional[Dict]:
         """4.3.4. ID'ye göre bir kullanıcıyı getirir."""
         self._ensure_connection()
@@ -163,6 +164,7 @@ class UserRepository:
         finally:
             self._close_if_owned()
 
+    @read_only
     def get_all_users(self) -> List[Dict]:
         """4.3.5. Veritabanındaki tüm kullanıcıları getirir."""
         self._ensure_connection()
@@ -213,7 +215,7 @@ class UserRepository:
                 row_count = conn.cursor.rowcount
                 return row_count > 0
         except MySQLError as e:
-            conn.connection.rollback()
+            # Rollback bağlamdan çıkılırken yapıldı; bağlantı havuza dönmüş olabilir
             return False
         except Exception as e:
             return False
@@ -230,7 +232,7 @@ class UserRepository:
                 conn.connection.commit()
                 return conn.cursor.rowcount > 0
         except MySQLError:
-            conn.connection.rollback()
+            # Rollback bağlamdan çıkılırken yapıldı
             return False
         finally:
             self._close_if_owned()
@@ -245,7 +247,7 @@ class UserRepository:
                 conn.connection.commit()
                 return conn.cursor.rowcount > 0
         except MySQLError:
-            conn.connection.rollback()
+            # Rollback bağlamdan çıkılırken yapıldı
             return False
         finally:
             self._close_if_owned()
@@ -301,6 +303,7 @@ class UserRepository:
         finally:
             self._close_if_owned()
 
+    @read_only
     def get_user_profile(self, user_id: int) -> Optional[Dict]:
         """4.3.12. Kullanıcının profil bilgilerini getirir (şifre hariç)."""
         self._ensure_connection()
@@ -320,6 +323,7 @@ class UserRepository:
         finally:
             self._close_if_owned()
 
+    @read_only
     def search_users(self, search_term: str) -> List[Dict]:
         """4.3.13. Kullanıcıları arama terimine göre arar."""
         self._ensure_connection()
@@ -0,0 +1,234 @@
+# =============================================================================
+# 1.0. MODÜL BAŞLIĞI VE AÇIKLAMASI
+# =============================================================================
+# Bu modül, cevap güncellemelerini bellekte biriktirip kısa
+# aralıklarla toplu (executemany) yazan `WriteBehindBuffer` sınıfını içerir.
+# Mod isteğe bağlıdır (WRITE_BEHIND_ENABLED); kapalıyken servisler
+# güncellemeleri eskisi gibi doğrudan veritabanına yazar.
+# Dayanıklılık: oturum tamamlanırken, oturumun verisi okunmadan önce ve
+# süreç kapanırken (atexit) bekleyen tüm güncellemeler yazılır. Süreç
+# beklenmedik şekilde sonlanırsa en fazla bir flush aralığındaki
+# güncellemeler kaybolabilir.
+# Buffer süreç içidir; oturumu tamamlayan worker yalnızca kendi bekleyen
+# cevaplarını yazabilir. Bu yüzden mod tek süreçte çalışır: instance
+# dizinindeki kilidi alan süreç buffer'ı açar, diğerleri doğrudan yazar ve
+# kilit sahibine haber verir; sahibi de bir sonraki flush'ta buffer'ı kapatır.
+# answered_at, boşta kalma kontrolüyle aynı saat olsun diye veritabanı
+# saatinden (CURRENT_TIMESTAMP) yazılır.
+# =============================================================================
+
+# =============================================================================
+# 2.0. İÇİNDEKİLER
+# =============================================================================
+# 3.0. GEREKLİ KÜTÜPHANELER
+# 4.0. MODÜL SEVİYESİ YAPILANDIRMA
+# 5.0. WRITEBEHINDBUFFER SINIFI
+#   5.1. __init__(self, flush_interval, max_pending)
+#   5.2. start(self)
+#   5.3. stop(self)
+#   5.4. add_answer(self, session_id, session_db_id, question_id, answer_data)
+#   5.5. has_pending(self, session_id)
+#   5.6. flush(self)
+#   5.7. get_stats(self)
+# 6.0. MODÜL SEVİYESİ FONKSİYONLAR
+#   6.1. init_app(app)
+# =============================================================================
+
+# =============================================================================
+# 3.0. GEREKLİ KÜTÜPHANELER
+# =============================================================================
+import os
+import time
+import atexit
+import threading
+from typing import Dict, List, Optional, Tuple, Any
+
+from app.database.db_connection import DatabaseConnection
+from app.database.process_lock import ProcessLock
+
+# =============================================================================
+# 4.0. MODÜL SEVİYESİ YAPILANDIRMA
+# =============================================================================
+# Bekleyen güncellemelerin yazılma aralığı (saniye)
+WRITE_BEHIND_FLUSH_INTERVAL = float(os.getenv('WRITE_BEHIND_FLUSH_INTERVAL', '0.5'))
+
+# Bu sayıda bekleyen güncelleme birikirse aralık beklenmeden yazılır
+WRITE_BEHIND_MAX_PENDING = int(os.getenv('WRITE_BEHIND_MAX_PENDING', '500'))
+
+# Bu arada başka bir süreçte tamamlanan session'ların cevapları yazılmaz
+ANSWER_UPDATE_SQL = """
+    UPDATE quiz_session_questions qsq
+    JOIN quiz_sessions qs ON qs.id = qsq.session_id AND qs.status = 'active'
+    SET qsq.user_answer_option_id = %s,
+        qsq.is_correct = %s,
+        qsq.points_earned = %s,
+        qsq.time_spent_seconds = %s,
+        qsq.answered_at = CURRENT_TIMESTAMP,
+        qsq.updated_at = CURRENT_TIMESTAMP
+    WHERE qsq.session_id = %s AND qsq.question_id = %s
+"""
+
+# =============================================================================
+# 5.0. WRITEBEHINDBUFFER SINIFI
+# =============================================================================
+class WriteBehindBuffer:
+    """
+    Cevap güncellemelerini (session, soru) anahtarıyla birleştirerek (son
+    yazan kazanır) bellekte tutar ve tek transaction içinde toplu olarak yazar.
+    """
+
+    def __init__(self, flush_interval: float = WRITE_BEHIND_FLUSH_INTERVAL,
+                 max_pending: int = WRITE_BEHIND_MAX_PENDING):
+        """5.1. Buffer'ı başlatır. start() çağrılana kadar devre dışıdır."""
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.enabled = False
+        self.db: Optional[DatabaseConnection] = None
+        self.process_lock: Optional[ProcessLock] = None
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._answers: Dict[Tuple[int, int], Tuple] = {}
+        self._pending_sessions: Dict[str, int] = {}
+        self._flushes = 0
+        self._flushed_rows = 0
+        self._failed_flushes = 0
+        self._last_flush_ms = 0.0
+
+    def start(self) -> None:
+        """5.2. Arka plan flush thread'ini başlatır ve modu etkinleştirir."""
+        if self._thread is not None:
+            return
+        self.enabled = True
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name='write-behind-flush', daemon=True)
+        self._thread.start()
+        atexit.register(self.stop)
+
+    def stop(self) -> None:
+        """5.3. Thread'i durdurur ve bekleyen tüm güncellemeleri yazar."""
+        self.enabled = False
+        self._stopped.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout=max(self.flush_interval * 4, 1.0))
+            self._thread = None
+        self.flush()
+
+    def _run(self) -> None:
+        """Arka planda aralıklarla veya eşik aşıldığında flush yapar."""
+        while not self._stopped.is_set():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            if self.enabled and self.process_lock is not None and self.process_lock.contended():
+                # Başka bir worker başladı; tamamlama bu sürecin buffer'ını göremez
+                print("⚠️  Birden çok worker algılandı, write-behind buffer kapatılıyor")
+                self.enabled = False
+            self.flush()
+
+    def _mark_pending(self, session_id: str) -> None:
+        """Session'ın bekleyen güncelleme sayısını artırır (kilit altında çağrılır)."""
+        self._pending_sessions[session_id] = self._pending_sessions.get(session_id, 0) + 1
+
+    def add_answer(self, session_id: str, session_db_id: int, question_id: int,
+                   answer_data: Dict[str, Any]) -> None:
+        """5.4. Cevap güncellemesini kuyruğa ekler."""
+        params = (
+            answer_data.get('user_answer_option_id'),
+            answer_data.get('is_correct'),
+            answer_data.get('points_earned', 0),
+            answer_data.get('time_spent_seconds', 0),
+            session_db_id,
+            question_id
+        )
+        with self._lock:
+            self._answers[(session_db_id, question_id)] = (session_id, params)
+            self._mark_pending(session_id)
+            depth = len(self._answers)
+        if depth >= self.max_pending:
+            self._wakeup.set()
+
+    def has_pending(self, session_id: str) -> bool:
+        """5.5. Session için henüz commit edilmemiş (yazılmakta olanlar dahil) güncelleme var mı?"""
+        return session_id in self._pending_sessions
+
+    def flush(self) -> bool:
+        """5.6. Bekleyen güncellemeleri tek transaction içinde toplu olarak yazar."""
+        with self._flush_lock:
+            with self._lock:
+                if not self._answers:
+                    return True
+                answers, self._answers = self._answers, {}
+                # Session'lar commit başarılı olana kadar bekleyen olarak kalır
+                pending_sessions = dict(self._pending_sessions)
+
+            started = time.perf_counter()
+            try:
+                if self.db is None:
+                    self.db = DatabaseConnection()
+                with self.db as conn:
+                    conn.cursor.executemany(ANSWER_UPDATE_SQL, [params for _, params in answers.values()])
+                    conn.connection.commit()
+
+                with self._lock:
+                    # Flush sırasında gelen güncellemeler sayaçta kalır
+                    for session_id, count in pending_sessions.items():
+                        remaining = self._pending_sessions.get(session_id, 0) - count
+                        if remaining > 0:
+                            self._pending_sessions[session_id] = remaining
+                        else:
+                            self._pending_sessions.pop(session_id, None)
+                self._flushes += 1
+                self._flushed_rows += len(answers)
+                self._last_flush_ms = round((time.perf_counter() - started) * 1000, 2)
+                return True
+
+            except Exception as e:
+                print(f"❌ Write-behind flush hatası: {e}")
+                self._failed_flushes += 1
+                # Yazılamayanları geri koy; bu arada gelen daha yeni güncellemeler korunur
+                with self._lock:
+                    for key, value in answers.items():
+                        self._answers.setdefault(key, value)
+                return False
+
+    def get_stats(self) -> Dict[str, Any]:
+        """5.7. Buffer istatistiklerini (bekleyen kuyruk derinliği dahil) döndürür."""
+        with self._lock:
+            pending_answers = len(self._answers)
+        return {
+            'enabled': self.enabled,
+            'backlog_depth': pending_answers,
+            'pending_answers': pending_answers,
+            'pending_sessions': len(self._pending_sessions),
+            'flush_interval': self.flush_interval,
+            'flushes': self._flushes,
+            'flushed_rows': self._flushed_rows,
+            'failed_flushes': self._failed_flushes,
+            'last_flush_ms': self._last_flush_ms
+        }
+
+# =============================================================================
+# 6.0. MODÜL SEVİYESİ FONKSİYONLAR
+# =============================================================================
+# Süreç (process) içinde tüm servisler aynı buffer'ı paylaşır.
+write_behind_buffer = WriteBehindBuffer()
+
+def init_app(app) -> bool:
+    """6.1. Flask config'i WRITE_BEHIND_ENABLED ise buffer'ı (tek süreçte) başlatır."""
+    if not app.config.get('WRITE_BEHIND_ENABLED', False):
+        return False
+    process_lock = ProcessLock(os.path.join(app.instance_path, 'write_behind.lock'))
+    if not process_lock.acquire():
+        # Buffer başka bir süreçte açık: bu süreç doğrudan yazar, sahibi de buffer'ı kapatır
+        process_lock.signal_contention()
+        print("⚠️  Write-behind buffer başka bir süreçte açık; birden çok worker ile kullanılamaz")
+        return False
+    process_lock.clear_contention()
+    write_behind_buffer.process_lock = process_lock
+    write_behind_buffer.flush_interval = app.config.get('WRITE_BEHIND_FLUSH_INTERVAL', WRITE_BEHIND_FLUSH_INTERVAL)
+    write_behind_buffer.max_pending = app.config.get('WRITE_BEHIND_MAX_PENDING', WRITE_BEHIND_MAX_PENDING)
+    write_behind_buffer.start()
+    return True
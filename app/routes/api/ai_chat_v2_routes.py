@@ -5,8 +5,10 @@
 # Modüler servis yapısı: GeminiAPI + ChatSession + ChatMessage services
 # =============================================================================
 
-from flask import Blueprint, request, jsonify, session
+from flask import Blueprint, Response, request, jsonify, session, stream_with_context
 from typing import Dict, Any
+import json
+import time
 import traceback
 
 # Create the AI chat v2 blueprint
@@ -19,19 +21,41 @@ try:
     from app.services.chat_message_service import ChatMessageService
     from app.services.quiz_session_service import QuizSessionService
     from app.database.db_connection import DatabaseConnection
+    from app.services.ai_response_cache import ai_response_cache
 except ImportError as e:
     GeminiAPIService = None
     ChatSessionService = None
     ChatMessageService = None
     QuizSessionService = None
     DatabaseConnection = None
+    ai_response_cache = None
 
 # Global service instances
+# DatabaseConnection thread/istek bazlı durum tuttuğu için bu global nesne
+# eşzamanlı isteklerde paylaşılabilir; her 'with' bloğu kendi cursor'unu alır.
 db_connection = DatabaseConnection() if DatabaseConnection else None
 gemini_service = GeminiAPIService() if GeminiAPIService else None
 chat_session_service = ChatSessionService(db_connection) if ChatSessionService else None
 chat_message_service = ChatMessageService() if ChatMessageService else None
 
+# Gemini hata kategorisi -> (kullanıcı mesajı tipi, HTTP durum kodu)
+AI_ERROR_RESPONSES = {
+    'timeout': ('timeout', 504),
+    'rate_limited': ('api_error', 503),
+    'server_error': ('api_error', 502),
+    'connection_error': ('api_error', 503),
+    'not_configured': ('api_error', 503),
+}
+
+def _ai_error_response(error: str):
+    """Gemini hata kategorisini kullanıcı mesajı ve durum koduna çevirir."""
+    error_type, status_code = AI_ERROR_RESPONSES.get(error, ('api_error', 500))
+    return jsonify({
+        'status': 'error',
+        'message': chat_message_service.get_error_message(error_type),
+        'error_code': error
+    }), status_code
+
 # ===========================================================================
 # SYSTEM ROUTES
 # ===========================================================================
@@ -252,123 +276,142 @@ def get_session_info(chat_session_id):
 # CHAT ROUTES
 # ===========================================================================
 
-@ai_chat_v2_bp.route('/ai/chat/message', methods=['POST'])
-def send_chat_message():
-    """Chat mesajı gönderir ve AI yanıtı alır"""
-    try:
-        if not all([gemini_service, chat_session_service, chat_message_service]):
-            return jsonify({
-                'status': 'error',
-                'message': 'AI services not fully available'
-            }), 503
-        
-        data = request.get_json()
-        if not data:
-            return jsonify({
-                'status': 'error',
-                'message': 'Request data is required'
-            }), 400
-        
-        # Required fields
-        required_fields = ['message', 'chat_session_id']
-        for field in required_fields:
-            if field not in data:
-                return jsonify({
-                    'status': 'error',
-                    'message': f'{field} is required'
-                }), 400
-        
-        message = data['message']
-        chat_session_id = data['chat_session_id']
-        question_id = data.get('question_id')
-        question_context = data.get('question_context')  # Yeni: Soru ve şıkların içeriği
-        
-        # Mesaj validasyonu
-        is_valid, error_msg = chat_message_service.validate_message(message)
-        if not is_valid:
-            return jsonify({
-                'status': 'error',
-                'message': error_msg
-            }), 400
-        
-        # Chat session kontrol
-        session_info = chat_session_service.get_session(chat_session_id)
-        if not session_info:
-            return jsonify({
+def _prepare_chat_message(data):
+    """
+    Chat mesajı isteğini doğrular, kullanıcı mesajını kaydeder ve AI prompt'unu hazırlar.
+    
+    Returns:
+        (hazırlık sözlüğü, None) veya (None, hata yanıtı)
+    """
+    if not all([gemini_service, chat_session_service, chat_message_service]):
+        return None, (jsonify({
+            'status': 'error',
+            'message': 'AI services not fully available'
+        }), 503)
+    
+    if not data:
+        return None, (jsonify({
+            'status': 'error',
+            'message': 'Request data is required'
+        }), 400)
+    
+    # Required fields
+    required_fields = ['message', 'chat_session_id']
+    for field in required_fields:
+        if field not in data:
+            return None, (jsonify({
                 'status': 'error',
-                'message': 'Chat session not found'
-            }), 404
-        
-        # Mesajı sanitize et
-        sanitized_message = chat_message_service.sanitize_message(message)
-        
-        # User mesajını veritabanına kaydet
-        import time
-        start_time = time.time()
-        
-        user_metadata = chat_message_service.create_message_metadata('user', question_id=question_id)
-        user_message_id = chat_session_service.add_message(
-            chat_session_id, 'user', sanitized_message, 
-            action_type='general', metadata=user_metadata
-        )
-        
-        # AI için prompt oluştur - question_context varsa ekle
-        if question_context:
-            # Soru ve şıkların içeriğini prompt'a ekle
-            context_message = f"""
+                'message': f'{field} is required'
+            }), 400)
+    
+    message = data['message']
+    chat_session_id = data['chat_session_id']
+    question_id = data.get('question_id')
+    question_context = data.get('question_context')  # Yeni: Soru ve şıkların içeriği
+    
+    # Mesaj validasyonu
+    is_valid, error_msg = chat_message_service.validate_message(message)
+    if not is_valid:
+        return None, (jsonify({
+            'status': 'error',
+            'message': error_msg
+        }), 400)
+    
+    # Chat session kontrol
+    session_info = chat_session_service.get_session(chat_session_id)
+    if not session_info:
+        return None, (jsonify({
+            'status': 'error',
+            'message': 'Chat session not found'
+        }), 404)
+    
+    # Mesajı sanitize et
+    sanitized_message = chat_message_service.sanitize_message(message)
+    
+    # User mesajını veritabanına kaydet
+    user_metadata = chat_message_service.create_message_metadata('user', question_id=question_id)
+    chat_session_service.add_message(
+        chat_session_id, 'user', sanitized_message, 
+        action_type='general', metadata=user_metadata
+    )
+    
+    # AI için prompt oluştur - question_context varsa ekle
+    if question_context:
+        # Soru ve şıkların içeriğini prompt'a ekle
+        context_message = f"""
 SORU İÇERİĞİ:
 {question_context.get('question_text', 'Soru metni bulunamadı')}
 
 ŞIKLAR:
 """
-            for i, option in enumerate(question_context.get('options', []), 1):
-                context_message += f"{i}. {option.get('option_text', 'Şık metni bulunamadı')}\n"
-            
-            context_message += f"\nKULLANICI MESAJI: {sanitized_message}"
-            
-            print(f"[AI_CHAT_V2] First message with question context: {context_message}")
-            
-            prompt = chat_session_service.build_prompt(chat_session_id, context_message, 'general')
-        else:
-            # Normal prompt oluştur
-            prompt = chat_session_service.build_prompt(chat_session_id, sanitized_message, 'general')
-        
-        # Token sınırı uyarısını prompt'un sonuna ekle
-        prompt += "\n\nÖNEMLİ: Cevabında 5000 token geçmemeye çalış. Kısa ve öz cevaplar ver."
+        for i, option in enumerate(question_context.get('options', []), 1):
+            context_message += f"{i}. {option.get('option_text', 'Şık metni bulunamadı')}\n"
+        
+        context_message += f"\nKULLANICI MESAJI: {sanitized_message}"
+        
+        print(f"[AI_CHAT_V2] First message with question context: {context_message}")
+        
+        prompt = chat_session_service.build_prompt(chat_session_id, context_message, 'general')
+    else:
+        # Normal prompt oluştur
+        prompt = chat_session_service.build_prompt(chat_session_id, sanitized_message, 'general')
+    
+    # Token sınırı uyarısını prompt'un sonuna ekle
+    prompt += "\n\nÖNEMLİ: Cevabında 5000 token geçmemeye çalış. Kısa ve öz cevaplar ver."
+    
+    return {
+        'chat_session_id': chat_session_id,
+        'question_id': question_id,
+        'prompt': prompt
+    }, None
+
+def _save_ai_message(prepared, formatted_response, response_time_ms):
+    """AI yanıtını chat session'a kaydeder."""
+    ai_metadata = chat_message_service.create_message_metadata('ai', question_id=prepared['question_id'])
+    return chat_session_service.add_message(
+        prepared['chat_session_id'], 'ai', formatted_response,
+        action_type='general',
+        ai_model='gemini-2.5-flash',
+        prompt_used=prepared['prompt'],
+        response_time_ms=response_time_ms,
+        metadata=ai_metadata
+    )
+
+def _sse_event(event, data):
+    """Tek bir Server-Sent Events olayını biçimlendirir."""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+@ai_chat_v2_bp.route('/ai/chat/message', methods=['POST'])
+def send_chat_message():
+    """Chat mesajı gönderir ve AI yanıtı alır"""
+    try:
+        start_time = time.time()
+        prepared, error_response = _prepare_chat_message(request.get_json())
+        if error_response:
+            return error_response
         
         # AI'dan yanıt al
-        ai_response = gemini_service.generate_content(prompt)
+        ai_result = gemini_service.generate_content_result(prepared['prompt'])
+        ai_response = ai_result['text']
         
         # Response time hesapla
         response_time_ms = int((time.time() - start_time) * 1000)
         
         if not ai_response:
-            error_msg = chat_message_service.get_error_message('api_error')
-            return jsonify({
-                'status': 'error',
-                'message': error_msg
-            }), 500
+            return _ai_error_response(ai_result['error'])
         
         # AI yanıtını format et
         formatted_response = chat_message_service.format_ai_response(ai_response)
         
         # AI mesajını veritabanına kaydet
-        ai_metadata = chat_message_service.create_message_metadata('ai', question_id=question_id)
-        ai_message_id = chat_session_service.add_message(
-            chat_session_id, 'ai', formatted_response,
-            action_type='general',
-            ai_model='gemini-2.5-flash',
-            prompt_used=prompt,
-            response_time_ms=response_time_ms,
-            metadata=ai_metadata
-        )
+        _save_ai_message(prepared, formatted_response, response_time_ms)
         
         return jsonify({
             'status': 'success',
             'message': 'Chat message processed successfully',
             'data': {
                 'ai_response': formatted_response,
-                'chat_session_id': chat_session_id
+                'chat_session_id': prepared['chat_session_id']
             }
         }), 200
         
@@ -380,6 +423,79 @@ SORU İÇERİĞİ:
             'error': str(e)
         }), 500
 
+@ai_chat_v2_bp.route('/ai/chat/message/stream', methods=['POST'])
+def stream_chat_message():
+    """
+    Chat mesajı gönderir ve AI yanıtını Server-Sent Events olarak stream eder.
+    
+    Olaylar: 'chunk' ({html}), 'done' ({ai_response, chat_session_id}),
+    'error' ({message, error_code}). Yanıt stream bitince kaydedilir.
+    
+    stream_with_context istek bağlamını stream boyunca açık tutar; havuz
+    bağlantıları 'with' bloğu bitince iade edildiğinden stream süresince
+    bağlantı tutulmaz, kayıt için yenisi alınır.
+    """
+    try:
+        start_time = time.time()
+        prepared, error_response = _prepare_chat_message(request.get_json())
+        if error_response:
+            return error_response
+    except Exception as e:
+        error_msg = chat_message_service.get_error_message('general_error') if chat_message_service else 'System error'
+        return jsonify({
+            'status': 'error',
+            'message': error_msg,
+            'error': str(e)
+        }), 500
+    
+    def generate():
+        formatter = chat_message_service.create_stream_formatter()
+        stream = gemini_service.stream_content(prepared['prompt'])
+        try:
+            for event in stream:
+                if 'error' in event:
+                    error_type = AI_ERROR_RESPONSES.get(event['error'], ('api_error', 500))[0]
+                    yield _sse_event('error', {
+                        'message': chat_message_service.get_error_message(error_type),
+                        'error_code': event['error']
+                    })
+                    return
+                if 'text' in event:
+                    html_chunk = formatter.feed(event['text'])
+                    if html_chunk:
+                        yield _sse_event('chunk', {'html': html_chunk})
+                    if formatter.truncated:
+                        # Uzunluk sınırı aşıldı; üretimin devamı beklenmez
+                        break
+            
+            html_chunk = formatter.finish()
+            if html_chunk:
+                yield _sse_event('chunk', {'html': html_chunk})
+            
+            formatted_response = formatter.text
+            _save_ai_message(prepared, formatted_response, int((time.time() - start_time) * 1000))
+            yield _sse_event('done', {
+                'ai_response': formatted_response,
+                'chat_session_id': prepared['chat_session_id']
+            })
+        except Exception as e:
+            print(f"[AI_CHAT_V2] Stream error: {e}")
+            yield _sse_event('error', {
+                'message': chat_message_service.get_error_message('general_error'),
+                'error_code': 'general_error'
+            })
+        finally:
+            stream.close()
+    
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={
+            'Cache-Control': 'no-cache',
+            'X-Accel-Buffering': 'no'
+        }
+    )
+
 @ai_chat_v2_bp.route('/ai/chat/quick-action', methods=['POST'])
 def quick_action():
     """Hızlı eylemler (açıkla, ipucu)"""
@@ -406,9 +522,17 @@ def quick_action():
                     'message': f'{field} is required'
                 }), 400
         
+        # question_id önbellek anahtarında ve sorgularda kullanılır
+        try:
+            question_id = int(data['question_id'])
+        except (TypeError, ValueError):
+            return jsonify({
+                'status': 'error',
+                'message': 'question_id must be an integer'
+            }), 400
+        
         action = data['action']
         chat_session_id = data['chat_session_id']
-        question_id = data['question_id']
         question_context = data.get('question_context')  # Yeni: Soru ve şıkların içeriği
         
         # Chat session kontrol
@@ -450,36 +574,56 @@ def quick_action():
                 'message': 'Quiz service not available'
             }), 503
         
-        # Quick action prompt oluştur
-        prompt = chat_message_service.create_quick_action_prompt(action, question_data)
-        if not prompt:
+        # Quick action prompt oluştur - yanıt tüm öğrencilerle paylaşıldığından sohbet geçmişi eklenmez
+        full_prompt = chat_message_service.create_shared_quick_action_prompt(
+            action, question_data, chat_session_service.context_templates['educational_intro']
+        )
+        if not full_prompt:
             return jsonify({
                 'status': 'error',
                 'message': 'Invalid action type'
             }), 400
         
-        # Context ekle
-        full_prompt = chat_session_service.get_conversation_context(chat_session_id, question_id) + "\n\n" + prompt
-        
-        # Token sınırı uyarısını prompt'un sonuna ekle
-        full_prompt += "\n\nÖNEMLİ: Cevabında 20000 token geçmemeye çalış. Kısa ve öz cevaplar ver."
-        
-        # AI'dan yanıt al
-        ai_response = gemini_service.generate_content(full_prompt)
-        
-        if not ai_response:
-            error_msg = chat_message_service.get_error_message('api_error')
-            return jsonify({
-                'status': 'error',
-                'message': error_msg
-            }), 500
-        
-        # AI yanıtını format et
-        formatted_response = chat_message_service.format_ai_response(ai_response)
+        # Önce önceden üretilmiş metin, sonra paylaşılan önbellek; ikisi de yoksa AI çağrılır
+        start_time = time.time()
+        prompt_version = chat_message_service.quick_actions[action].get('version', 1)
+        pregenerated = chat_message_service.chat_repo.get_question_ai_text(question_id, action, prompt_version)
+        cache_key = ai_response_cache.make_key(action, question_id, prompt_version, full_prompt)
+        cached = None if pregenerated else ai_response_cache.get(cache_key)
+        
+        if pregenerated:
+            formatted_response = pregenerated['content']
+            ai_model = pregenerated['ai_model']
+            cache_status = 'pregenerated'
+        elif cached:
+            formatted_response = cached['content']
+            ai_model = cached['ai_model']
+            cache_status = cached['tier']
+        else:
+            # AI'dan yanıt al
+            ai_result = gemini_service.generate_content_result(full_prompt)
+            ai_response = ai_result['text']
+            
+            if not ai_response:
+                return _ai_error_response(ai_result['error'])
+            
+            # AI yanıtını format et
+            formatted_response = chat_message_service.format_ai_response(ai_response)
+            ai_model = 'gemini-2.5-flash'
+            cache_status = 'miss'
+            ai_response_cache.put(cache_key, action, question_id, prompt_version, formatted_response, ai_model)
         
-        # AI mesajını session'a ekle
+        # AI mesajını session'a ekle (önbellekten gelse de kaydedilir)
         ai_metadata = chat_message_service.create_message_metadata('ai', action=action, question_id=question_id)
-        chat_session_service.add_message(chat_session_id, 'ai', formatted_response, ai_metadata)
+        ai_metadata['cache'] = cache_status
+        chat_session_service.add_message(
+            chat_session_id, 'ai', formatted_response,
+            action_type=action,
+            ai_model=ai_model,
+            prompt_used=full_prompt,
+            response_time_ms=int((time.time() - start_time) * 1000),
+            metadata=ai_metadata
+        )
         
         return jsonify({
             'status': 'success',
@@ -488,7 +632,8 @@ def quick_action():
                 'action': action,
                 'ai_response': formatted_response,
                 'question_id': question_id,
-                'chat_session_id': chat_session_id
+                'chat_session_id': chat_session_id,
+                'cached': cache_status != 'miss'
             }
         }), 200
         
@@ -12,10 +12,12 @@
 # 4.0. SERVİS BAŞLATMA
 # 5.0. QUIZ API ROTALARI (QUIZ API ROUTES)
 #   5.1. Quiz Verileri
+#     5.1.0. GET /quiz/curriculum
 #     5.1.1. GET /quiz/grades
 #     5.1.2. GET /quiz/subjects
-#     5.1.3. GET /quiz/topics
-#     5.1.4. GET /quiz/data
+#     5.1.3. GET /quiz/units
+#     5.1.4. GET /quiz/topics
+#     5.1.5. GET /quiz/data
 #   5.2. Quiz İşlemleri
 #     5.2.1. POST /quiz/start
 #     5.2.2. POST /quiz/submit
@@ -36,12 +38,13 @@ try:
     from app.services import get_quiz_service
     from app.services.quiz_session_service import QuizSessionService
     from app.services.auth_service import login_required
-    from app.database.db_connection import DatabaseConnection
+    from app.database.curriculum_cache import curriculum_cache, CURRICULUM_HTTP_MAX_AGE
 except ImportError as e:
     get_quiz_service = None
     QuizSessionService = None
     login_required = None
-    DatabaseConnection = None
+    curriculum_cache = None
+    CURRICULUM_HTTP_MAX_AGE = 0
 
 # =============================================================================
 # 4.0. SERVİS BAŞLATMA
@@ -56,40 +59,50 @@ except ImportError as e:
 # 5.1. Quiz Verileri
 # -------------------------------------------------------------------------
 
+def _curriculum_response(snapshot, data, message, etag_suffix):
+    """Müfredat yanıtını sürüm tabanlı ETag ve Cache-Control ile döndürür (eşleşirse 304)."""
+    response = jsonify({
+        'status': 'success',
+        'message': message,
+        'data': data
+    })
+    response.set_etag(f"{snapshot['version']}-{etag_suffix}")
+    response.cache_control.public = True
+    response.cache_control.max_age = CURRICULUM_HTTP_MAX_AGE
+    return response.make_conditional(request)
+
+@quiz_bp.route('/quiz/curriculum', methods=['GET'])
+def get_curriculum():
+    """5.1.0. Sınıf → ders → ünite → konu ağacının tamamını döndürür."""
+    try:
+        snapshot = curriculum_cache.get() if curriculum_cache else None
+        if not snapshot:
+            return jsonify({
+                'status': 'error',
+                'message': 'Database connection not available'
+            }), 500
+        
+        return _curriculum_response(snapshot, snapshot['tree'], 'Curriculum retrieved successfully', 'tree')
+            
+    except Exception as e:
+        return jsonify({
+            'status': 'error',
+            'message': 'Failed to retrieve curriculum',
+            'error': str(e)
+        }), 500
+
 @quiz_bp.route('/quiz/grades', methods=['GET'])
 def get_grades():
     """5.1.1. Tüm sınıfları listeler."""
     try:
-        if not DatabaseConnection:
+        snapshot = curriculum_cache.get() if curriculum_cache else None
+        if not snapshot:
             return jsonify({
                 'status': 'error',
                 'message': 'Database connection not available'
             }), 500
         
-        with DatabaseConnection() as conn:
-            conn.cursor.execute("""
-                SELECT id, name, level, description 
-                FROM grades 
-                WHERE is_active = 1 
-                ORDER BY level
-            """)
-            grades = conn.cursor.fetchall()
-            
-            # Convert to list of dictionaries
-            grades_list = []
-            for grade in grades:
-                grades_list.append({
-                    'id': grade['id'],
-                    'name': grade['name'],
-                    'level': grade['level'],
-                    'description': grade['description']
-                })
-            
-            return jsonify({
-                'status': 'success',
-                'message': 'Grades retrieved successfully',
-                'data': grades_list
-            }), 200
+        return _curriculum_response(snapshot, snapshot['grades'], 'Grades retrieved successfully', 'grades')
             
     except Exception as e:
         return jsonify({
@@ -110,38 +123,14 @@ def get_subjects():
         }), 400
     
     try:
-        if not DatabaseConnection:
+        snapshot = curriculum_cache.get() if curriculum_cache else None
+        if not snapshot:
             return jsonify({
                 'status': 'error',
                 'message': 'Database connection not available'
             }), 500
         
-        with DatabaseConnection() as conn:
-            conn.cursor.execute("""
-                SELECT s.id, s.name, s.name_id, s.description, g.name as grade_name
-                FROM subjects s 
-                JOIN grades g ON s.grade_id = g.id
-                WHERE s.grade_id = %s AND s.is_active = 1 
-                ORDER BY s.name
-            """, (grade_id,))
-            subjects = conn.cursor.fetchall()
-            
-            # Convert to list of dictionaries
-            subjects_list = []
-            for subject in subjects:
-                subjects_list.append({
-                    'id': subject['id'],
-                    'name': subject['name'],
-                    'name_id': subject['name_id'],
-                    'description': subject['description'],
-                    'grade_name': subject['grade_name']
-                })
-            
-            return jsonify({
-                'status': 'success',
-                'message': 'Subjects retrieved successfully',
-                'data': subjects_list
-            }), 200
+        return _curriculum_response(snapshot, snapshot['subjects_by_grade'].get(grade_id, []), 'Subjects retrieved successfully', f'subjects-{grade_id}')
             
     except Exception as e:
         return jsonify({
@@ -162,38 +151,14 @@ def get_units():
         }), 400
     
     try:
-        if not DatabaseConnection:
+        snapshot = curriculum_cache.get() if curriculum_cache else None
+        if not snapshot:
             return jsonify({
                 'status': 'error',
                 'message': 'Database connection not available'
             }), 500
         
-        with DatabaseConnection() as conn:
-            conn.cursor.execute("""
-                SELECT u.id, u.name, u.name_id, u.description, s.name as subject_name
-                FROM units u 
-                JOIN subjects s ON u.subject_id = s.id
-                WHERE u.subject_id = %s AND u.is_active = 1 
-                ORDER BY u.name
-            """, (subject_id,))
-            units = conn.cursor.fetchall()
-            
-            # Convert to list of dictionaries
-            units_list = []
-            for unit in units:
-                units_list.append({
-                    'id': unit['id'],
-                    'name': unit['name'],
-                    'name_id': unit['name_id'],
-                    'description': unit['description'],
-                    'subject_name': unit['subject_name']
-                })
-            
-            return jsonify({
-                'status': 'success',
-                'message': 'Units retrieved successfully',
-                'data': units_list
-            }), 200
+        return _curriculum_response(snapshot, snapshot['units_by_subject'].get(subject_id, []), 'Units retrieved successfully', f'units-{subject_id}')
             
     except Exception as e:
         return jsonify({
@@ -214,37 +179,14 @@ def get_topics():
         }), 400
     
     try:
-        if not DatabaseConnection:
+        snapshot = curriculum_cache.get() if curriculum_cache else None
+        if not snapshot:
             return jsonify({
                 'status': 'error',
                 'message': 'Database connection not available'
             }), 500
         
-        with DatabaseConnection() as conn:
-            conn.cursor.execute("""
-                SELECT t.id, t.name, t.description, u.name as unit_name
-                FROM topics t 
-                JOIN units u ON t.unit_id = u.id
-                WHERE t.unit_id = %s AND t.is_active = 1 
-                ORDER BY t.name
-            """, (unit_id,))
-            topics = conn.cursor.fetchall()
-            
-            # Convert to list of dictionaries
-            topics_list = []
-            for topic in topics:
-                topics_list.append({
-                    'id': topic['id'],
-                    'name': topic['name'],
-                    'description': topic['description'],
-                    'unit_name': topic['unit_name']
-                })
-            
-            return jsonify({
-                'status': 'success',
-                'message': 'Topics retrieved successfully',
-                'data': topics_list
-            }), 200
+        return _curriculum_response(snapshot, snapshot['topics_by_unit'].get(unit_id, []), 'Topics retrieved successfully', f'topics-{unit_id}')
             
     except Exception as e:
         return jsonify({
@@ -255,7 +197,7 @@ def get_topics():
 
 @quiz_bp.route('/quiz/data', methods=['GET'])
 def get_quiz_data():
-    """5.1.4. Quiz verilerini döndürür."""
+    """5.1.5. Quiz verilerini döndürür."""
     quiz_service = get_quiz_service()
     if not quiz_service:
         return jsonify({
@@ -388,79 +330,16 @@ def get_session_status(session_id):
             }), 500
         
         session_service = QuizSessionService()
-        session_info = session_service.get_session_info(session_id)
         
-        if not session_info:
+        # Polling endpoint'i: sorular yüklenmez, tek indeksli sorgu yapılır
+        status_data = session_service.get_session_status(session_id)
+        
+        if not status_data:
             return jsonify({
                 'status': 'error',
                 'message': 'Session not found'
             }), 404
         
-        # Session durumunu hesapla
-        total_questions = len(session_info['questions'])
-        answered_questions = len([q for q in session_info['questions'] if q['user_answer_option_id'] is not None])
-        progress_percentage = round((answered_questions / total_questions * 100) if total_questions > 0 else 0, 2)
-        
-        # Calculate remaining time
-        remaining_time_seconds = 0
-        if session_info['session']['timer_enabled'] and session_info['session']['timer_duration']:
-            start_time = session_info['session']['start_time']
-            timer_duration = session_info['session']['timer_duration']
-            
-            if start_time:
-                try:
-                    from datetime import datetime
-                    # Handle different datetime formats
-                    if isinstance(start_time, str):
-                        # Remove timezone info if present and parse
-                        start_time_clean = start_time.split('+')[0].split('Z')[0]
-                        start_datetime = datetime.fromisoformat(start_time_clean)
-                    else:
-                        start_datetime = start_time
-                    
-                    current_datetime = datetime.now()
-                    elapsed_seconds = int((current_datetime - start_datetime).total_seconds())
-                    remaining_time_seconds = max(0, (timer_duration * 60) - elapsed_seconds)
-                    
-                    
-                except Exception as e:
-                    remaining_time_seconds = 0
-            else:
-                pass
-        else:
-            pass
-        
-        # Aktif sorunun bilgilerini al
-        current_question_info = None
-        if session_info['questions'] and answered_questions < total_questions:
-            current_question = session_info['questions'][answered_questions]
-            if current_question:
-                # Aktif sorunun detaylarını al
-                question_details = session_service.get_question_details(current_question['question_id'])
-                if question_details:
-                    current_question_info = {
-                        'subject_name': question_details.get('subject_name'),
-                        'topic_name': question_details.get('topic_name'),
-                        'difficulty_level': question_details.get('difficulty_level')
-                    }
-        
-        status_data = {
-            'session_id': session_id,
-            'is_completed': session_info['session']['status'] == 'completed',
-            'timer_enabled': session_info['session']['timer_enabled'],
-            'timer_duration': session_info['session']['timer_duration'],
-            'total_questions': total_questions,
-            'answered_questions': answered_questions,
-            'progress_percentage': progress_percentage,
-            'current_question': answered_questions + 1 if answered_questions < total_questions else total_questions,
-            # Aktif sorunun bilgilerini kullan, yoksa session bilgilerini kullan
-            'subject': current_question_info.get('subject_name') if current_question_info else session_info['session'].get('subject_name'),
-            'topic': current_question_info.get('topic_name') if current_question_info else session_info['session'].get('topic_name'),
-            'difficulty': current_question_info.get('difficulty_level') if current_question_info else session_info['session'].get('difficulty_level'),
-            'quiz_mode': session_info['session'].get('quiz_mode'),
-            'remaining_time_seconds': remaining_time_seconds
-        }
-        
         return jsonify({
             'status': 'success',
             'message': 'Session status retrieved successfully',
@@ -477,7 +356,11 @@ def get_session_status(session_id):
 @quiz_bp.route('/quiz/session/<session_id>/timer', methods=['PUT'])
 # @login_required  # Temporarily disabled for testing
 def update_session_timer(session_id):
-    """5.2.2c. Quiz session timer'ını günceller."""
+    """5.2.2c. Quiz session'ın sunucu tarafındaki kalan süresini döndürür.
+    
+    Süre sunucuda (deadline_at) tutulur; istemcinin gönderdiği değer
+    yazılmaz. Endpoint eski istemciler için korunmuştur.
+    """
     try:
         if not QuizSessionService:
             return jsonify({
@@ -485,27 +368,18 @@ def update_session_timer(session_id):
                 'message': 'Quiz session service not available'
             }), 500
         
-        data = request.get_json()
-        if not data or 'remaining_time_seconds' not in data:
-            return jsonify({
-                'status': 'error',
-                'message': 'remaining_time_seconds is required'
-            }), 400
-        
-        remaining_time_seconds = data['remaining_time_seconds']
-        
         session_service = QuizSessionService()
-        success = session_service.update_session_timer(session_id, remaining_time_seconds)
+        remaining_time_seconds = session_service.get_remaining_time(session_id)
         
-        if not success:
+        if remaining_time_seconds is None:
             return jsonify({
                 'status': 'error',
-                'message': 'Session not found or update failed'
+                'message': 'Session not found'
             }), 404
         
         return jsonify({
             'status': 'success',
-            'message': 'Timer updated successfully',
+            'message': 'Timer is managed by the server',
             'data': {
                 'session_id': session_id,
                 'remaining_time_seconds': remaining_time_seconds
@@ -515,7 +389,7 @@ def update_session_timer(session_id):
     except Exception as e:
         return jsonify({
             'status': 'error',
-            'message': 'Failed to update timer',
+            'message': 'Failed to get timer',
             'error': str(e)
         }), 500
 
@@ -532,33 +406,21 @@ def get_all_questions(session_id):
         
         session_service = QuizSessionService()
         
-        # Session'ın var olup olmadığını kontrol et
-        session = session_service.session_repo.get_session(session_id)
-        if not session:
+        # Session, sorular, detaylar ve şıklar sabit sayıda sorguyla alınır
+        session_data = session_service.get_session_questions_with_details(session_id)
+        if not session_data:
             return jsonify({
                 'status': 'error',
                 'message': f'Session not found: {session_id}'
             }), 404
         
-        session_info = session_service.get_session_info(session_id)
-        
-        if not session_info:
-            return jsonify({
-                'status': 'error',
-                'message': 'Session info not available'
-            }), 404
+        session = session_data['session']
         
         # Tüm soruları hazırla
-        questions = session_info['questions']
+        questions = session_data['questions']
         all_questions = []
         
         for i, question in enumerate(questions):
-            # Her soru için seçenekleri yükle
-            question_options = session_service.get_question_options(question['question_id'])
-            
-            # Her soru için detayları (açıklama dahil) yükle
-            question_details = session_service.get_question_details(question['question_id'])
-            
             # Educational features için veri hazırla
             hint = None
             related_topics = []
@@ -566,12 +428,12 @@ def get_all_questions(session_id):
             # Quiz modu educational ise ek verileri ekle
             if session.get('quiz_mode') == 'educational':
                 # İpucu - şimdilik açıklamadan türet
-                if question_details and question_details.get('description'):
-                    hint = f"Bu soru için ipucu: {question_details['description'][:100]}..."
+                if question.get('description'):
+                    hint = f"Bu soru için ipucu: {question['description'][:100]}..."
                 
                 # İlgili konular - şimdilik topic adından türet
-                if question_details and question_details.get('topic_name'):
-                    related_topics = [question_details['topic_name']]
+                if question.get('topic_name'):
+                    related_topics = [question['topic_name']]
             
             question_data = {
                 'question_number': i + 1,
@@ -579,14 +441,14 @@ def get_all_questions(session_id):
                 'question': {
                     'id': question['question_id'],
                     'text': question['question_text'],
-                    'explanation': question_details['description'] if question_details else None,
+                    'explanation': question['description'],
                     'hint': hint,
                     'related_topics': related_topics,
-                    'difficulty_level': question_details['difficulty_level'] if question_details else None,
-                    'points': question_details['points'] if question_details else None,
-                    'subject_name': question_details['subject_name'] if question_details else None,
-                    'topic_name': question_details['topic_name'] if question_details else None,
-                    'options': question_options
+                    'difficulty_level': question['difficulty_level'],
+                    'points': question['points'],
+                    'subject_name': question['subject_name'],
+                    'topic_name': question['topic_name'],
+                    'options': question['options']
                 },
                 'user_answer_option_id': question['user_answer_option_id'],
                 'progress': {
@@ -668,6 +530,7 @@ def get_current_question(session_id):
                         'related_topics': related_topics,
                         'options': []  # Seçenekleri ayrıca yüklenecek
                     },
+                    'option_permutation': question.get('option_permutation'),
                     'progress': {
                         'current': i + 1,
                         'total': len(questions),
@@ -682,8 +545,10 @@ def get_current_question(session_id):
                 'message': 'No more questions available'
             }), 404
         
-        # Soru seçeneklerini yükle
-        question_options = session_service.get_question_options(current_question['question']['id'])
+        # Soru seçeneklerini session başında belirlenen sırayla yükle
+        question_options = session_service.get_question_options(
+            current_question['question']['id'], current_question.pop('option_permutation', None)
+        )
         current_question['question']['options'] = question_options
         
         return jsonify({
@@ -790,7 +655,7 @@ def get_session_results(session_id):
             }), 500
         
         session_service = QuizSessionService()
-        results = session_service.calculate_session_results(session_id)
+        results = session_service.get_session_results(session_id)
         
         if not results:
             return jsonify({
@@ -0,0 +1,176 @@
+# =============================================================================
+# 1.0. MODÜL BAŞLIĞI VE AÇIKLAMASI
+# =============================================================================
+# Bu modül, soruya bağlı hızlı eylem (açıkla, ipucu, ilgili) AI yanıtlarını
+# öğrenciler arasında paylaşan `AIResponseCache` sınıfını içerir.
+# Anahtar; eylem, soru ID'si, prompt şablonu versiyonu ve prompt metninin
+# özetinden oluşur. Prompt özeti, istemciden gelen soru metniyle
+# oluşturulmuş bir yanıtın başka bir prompt için sunulmasını engeller.
+# Birinci katman süreç içi LRU + TTL önbelleğidir; isteğe bağlı ikinci katman
+# `ai_response_cache` tablosudur (worker'lar ve yeniden başlatmalar arası).
+# =============================================================================
+
+# =============================================================================
+# 2.0. İÇİNDEKİLER
+# =============================================================================
+# 3.0. GEREKLİ KÜTÜPHANELER
+# 4.0. MODÜL SEVİYESİ YAPILANDIRMA
+# 5.0. AIRESPONSECACHE SINIFI
+#   5.1. __init__(self, ttl_seconds, max_entries)
+#   5.2. make_key(action, question_id, prompt_version, prompt)
+#   5.3. get(self, key)
+#   5.4. put(self, key, action, question_id, prompt_version, content, ai_model)
+#   5.5. get_stats(self)
+# 6.0. MODÜL SEVİYESİ FONKSİYONLAR
+#   6.1. init_app(app)
+# =============================================================================
+
+# =============================================================================
+# 3.0. GEREKLİ KÜTÜPHANELER
+# =============================================================================
+import os
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Any
+
+# =============================================================================
+# 4.0. MODÜL SEVİYESİ YAPILANDIRMA
+# =============================================================================
+# Bir yanıtın önbellekte tutulacağı süre (saniye)
+AI_RESPONSE_CACHE_TTL_SECONDS = float(os.getenv('AI_RESPONSE_CACHE_TTL_SECONDS', '86400'))
+
+# Bellekte tutulacak en fazla yanıt sayısı (en eski kullanılan çıkarılır)
+AI_RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv('AI_RESPONSE_CACHE_MAX_ENTRIES', '2000'))
+
+# Süresi dolmuş veritabanı kayıtlarının en fazla hangi sıklıkla silineceği (saniye)
+AI_RESPONSE_CACHE_CLEANUP_SECONDS = 3600
+
+# =============================================================================
+# 5.0. AIRESPONSECACHE SINIFI
+# =============================================================================
+class AIResponseCache:
+    """
+    Önbellek anahtarı → {'content', 'ai_model', 'expires_at'} eşlemesini
+    TTL ve LRU ile tutar. Veritabanı katmanı açıksa bellekte bulunmayan
+    yanıtlar tablodan okunur ve yeni yanıtlar tabloya da yazılır.
+    """
+
+    def __init__(self, ttl_seconds: float = AI_RESPONSE_CACHE_TTL_SECONDS,
+                 max_entries: int = AI_RESPONSE_CACHE_MAX_ENTRIES):
+        """5.1. Önbelleği başlatır. Veritabanı katmanı init_app ile açılır."""
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.enabled = True
+        self.db_enabled = False
+        self._repo = None
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._cleaned_at = 0.0
+        self._memory_hits = 0
+        self._db_hits = 0
+        self._misses = 0
+
+    @staticmethod
+    def make_key(action: str, question_id: int, prompt_version: int, prompt: str) -> str:
+        """5.2. Eylem, soru, şablon versiyonu ve prompt metninden önbellek anahtarı üretir."""
+        raw = f"{action}\x1f{int(question_id)}\x1f{int(prompt_version)}\x1f{prompt}"
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def _get_repo(self):
+        """ChatRepository'yi ilk kullanımda oluşturur."""
+        if self._repo is None:
+            from app.database.chat_repository import ChatRepository
+            self._repo = ChatRepository()
+        return self._repo
+
+    def _remember(self, key: str, entry: Dict[str, Any]) -> None:
+        """Yanıtı bellek katmanına ekler (kilit altında çağrılır)."""
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """5.3. Anahtarın yanıtını döndürür ({'content', 'ai_model', 'tier'}); yoksa None."""
+        if not self.enabled:
+            return None
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry['expires_at'] > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self._memory_hits += 1
+                    return {'content': entry['content'], 'ai_model': entry['ai_model'], 'tier': 'memory'}
+                del self._entries[key]
+
+        if self.db_enabled:
+            row = self._get_repo().get_cached_response(key)
+            if row:
+                # Bellekte en fazla veritabanı kaydının kalan süresi kadar tutulur
+                remaining = self.ttl_seconds
+                expires_at = row.get('expires_at')
+                if hasattr(expires_at, 'timestamp'):
+                    remaining = min(remaining, max(0.0, expires_at.timestamp() - time.time()))
+                with self._lock:
+                    self._remember(key, {
+                        'content': row['content'],
+                        'ai_model': row.get('ai_model'),
+                        'expires_at': time.monotonic() + remaining
+                    })
+                    self._db_hits += 1
+                return {'content': row['content'], 'ai_model': row.get('ai_model'), 'tier': 'database'}
+
+        with self._lock:
+            self._misses += 1
+        return None
+
+    def put(self, key: str, action: str, question_id: int, prompt_version: int,
+            content: str, ai_model: Optional[str] = None) -> None:
+        """5.4. Yanıtı bellek ve (açıksa) veritabanı katmanına yazar."""
+        if not self.enabled or not content:
+            return
+
+        with self._lock:
+            self._remember(key, {
+                'content': content,
+                'ai_model': ai_model,
+                'expires_at': time.monotonic() + self.ttl_seconds
+            })
+
+        if self.db_enabled:
+            repo = self._get_repo()
+            repo.save_cached_response(key, action, question_id, prompt_version, content, ai_model, self.ttl_seconds)
+            if time.monotonic() - self._cleaned_at >= AI_RESPONSE_CACHE_CLEANUP_SECONDS:
+                self._cleaned_at = time.monotonic()
+                repo.cleanup_expired_cached_responses()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """5.5. Önbellek istatistiklerini döndürür."""
+        with self._lock:
+            return {
+                'enabled': self.enabled,
+                'db_enabled': self.db_enabled,
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'ttl_seconds': self.ttl_seconds,
+                'memory_hits': self._memory_hits,
+                'db_hits': self._db_hits,
+                'misses': self._misses
+            }
+
+# =============================================================================
+# 6.0. MODÜL SEVİYESİ FONKSİYONLAR
+# =============================================================================
+# Süreç (process) içinde tüm istekler aynı önbelleği paylaşır.
+ai_response_cache = AIResponseCache()
+
+def init_app(app) -> bool:
+    """6.1. Önbelleği Flask config'ine göre yapılandırır; etkinse True döndürür."""
+    ai_response_cache.enabled = app.config.get('AI_RESPONSE_CACHE_ENABLED', True)
+    ai_response_cache.ttl_seconds = app.config.get('AI_RESPONSE_CACHE_TTL_SECONDS', AI_RESPONSE_CACHE_TTL_SECONDS)
+    ai_response_cache.max_entries = app.config.get('AI_RESPONSE_CACHE_MAX_ENTRIES', AI_RESPONSE_CACHE_MAX_ENTRIES)
+    ai_response_cache.db_enabled = ai_response_cache.enabled and app.config.get('AI_RESPONSE_CACHE_DB_ENABLED', False)
+    return ai_response_cache.enabled
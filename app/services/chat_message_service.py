@@ -34,18 +34,23 @@ class ChatMessageService:
         }
         
         # Quick action definitions
+        # 'version': şablon veya beklenen yanıt değiştiğinde artırılır;
+        # önbellekteki eski paylaşılan yanıtlar böylece kullanılmaz.
         self.quick_actions = {
             'explain': {
                 'prompt_template': 'Bu soruyu öğrenciye basit ve anlaşılır bir şekilde açıkla: {question_text}',
-                'context_hint': 'Açıklama yaparken adım adım ilerle ve örnekler ver.'
+                'context_hint': 'Açıklama yaparken adım adım ilerle ve örnekler ver.',
+                'version': 1
             },
             'hint': {
                 'prompt_template': 'Bu soru için öğrenciye yardımcı olacak bir ipucu ver (cevabı verme): {question_text}',
-                'context_hint': 'İpucu verirken doğrudan cevabı söyleme, düşünmeye yönlendir.'
+                'context_hint': 'İpucu verirken doğrudan cevabı söyleme, düşünmeye yönlendir.',
+                'version': 1
             },
             'related': {
                 'prompt_template': 'Bu konu ile ilgili benzer sorular ve konular öner: {topic}',
-                'context_hint': 'İlgili konuları ve pratik önerilerini paylaş.'
+                'context_hint': 'İlgili konuları ve pratik önerilerini paylaş.',
+                'version': 1
             }
         }
     
@@ -116,14 +121,23 @@ class ChatMessageService:
             formatted = formatted[:self.format_rules['max_length'] - 3] + "..."
         
         # Markdown-style formatting'i HTML'e çevir
-        formatted = self._convert_markdown_to_html(formatted)
+        formatted = self.convert_markdown_to_html(formatted)
         
         # Emoji ekleme
-        formatted = self._add_contextual_emojis(formatted)
+        formatted = self.add_contextual_emojis(formatted)
         
         return formatted
     
-    def _convert_markdown_to_html(self, text: str) -> str:
+    def create_stream_formatter(self) -> 'StreamingResponseFormatter':
+        """
+        Parça parça gelen AI yanıtı için artımlı formatlayıcı oluşturur.
+        
+        Returns:
+            format_ai_response ile aynı kuralları uygulayan StreamingResponseFormatter
+        """
+        return StreamingResponseFormatter(self)
+    
+    def convert_markdown_to_html(self, text: str) -> str:
         """
         Basit markdown formatını HTML'e çevirir.
         
@@ -144,12 +158,13 @@ class ChatMessageService:
         
         return text
     
-    def _add_contextual_emojis(self, text: str) -> str:
+    def add_contextual_emojis(self, text: str, used_emojis: Optional[set] = None) -> str:
         """
         Context'e göre uygun emoji'ler ekler.
         
         Args:
             text: Emoji eklenecek text
+            used_emojis: Daha önceki parçalarda eklenmiş emoji'ler (stream için, optional)
             
         Returns:
             Emoji'li text
@@ -168,10 +183,14 @@ class ChatMessageService:
         }
         
         for pattern, emoji in emoji_map.items():
+            if used_emojis is not None and emoji in used_emojis:
+                continue
             if re.search(pattern, text, re.IGNORECASE):
                 # Her cümlenin sonuna değil, sadece ilk bulduğumuz yere ekle
                 if emoji not in text:
                     text = re.sub(pattern, f'\\g<0> {emoji}', text, count=1, flags=re.IGNORECASE)
+                if used_emojis is not None:
+                    used_emojis.add(emoji)
         
         return text
     
@@ -205,6 +224,26 @@ class ChatMessageService:
         
         return prompt
     
+    def create_shared_quick_action_prompt(self, action: str, question_data: Dict[str, Any], intro: str) -> Optional[str]:
+        """
+        Öğrenciler arasında paylaşılan (sohbet geçmişi içermeyen) quick action prompt'unu oluşturur.
+        Canlı istekler ve önceden üretim aynı prompt'u kullanır.
+        
+        Args:
+            action: Action tipi ('explain', 'hint', 'related')
+            question_data: Soru bilgileri
+            intro: Asistan tanıtım metni
+            
+        Returns:
+            Prompt string veya None
+        """
+        prompt = self.create_quick_action_prompt(action, question_data)
+        if not prompt:
+            return None
+        
+        # Token sınırı uyarısını prompt'un sonuna ekle
+        return intro + "\n\n" + prompt + "\n\nÖNEMLİ: Cevabında 20000 token geçmemeye çalış. Kısa ve öz cevaplar ver."
+    
     def create_message_metadata(self, message_type: str, action: Optional[str] = None, question_id: Optional[int] = None) -> Dict[str, Any]:
         """
         Mesaj için metadata oluşturur.
@@ -311,4 +350,101 @@ class ChatMessageService:
             if subject and topic:
                 base_message = f'{subject} - {topic} hakkında yeni bir soru! Yardıma ihtiyacın var mı? 🤔'
         
-        return base_message
\ No newline at end of file
+        return base_message
+
+
+class StreamingResponseFormatter:
+    """
+    Stream edilen AI yanıtını satır satır formatlar.
+    
+    Markdown dönüşümü satır sınırını aşmadığından tamamlanan satırlar hemen
+    gönderilir; yarım satırın yalnızca ilk '*' işaretinden önceki tam
+    kelimeleri gönderilir, kalanı bir sonraki parçayı bekler. Satır sonları ve boşluklar
+    bir sonraki içerik gelene kadar bekletilir (sondaki boşluklar atılır),
+    emoji'ler yanıt başına bir kez eklenir ve uzunluk sınırı aşılırsa yanıt
+    format_ai_response'taki gibi kısaltılır.
+    """
+    
+    def __init__(self, message_service: ChatMessageService):
+        """Formatlayıcıyı başlatır."""
+        self.message_service = message_service
+        self.max_length = message_service.format_rules['max_length']
+        self.truncated = False
+        self._raw = ''
+        self._emitted = 0
+        self._pending_whitespace = ''
+        self._used_emojis: set = set()
+        self._parts: List[str] = []
+    
+    def feed(self, chunk: str) -> str:
+        """
+        Yeni parçayı ekler ve gönderilmeye hazır HTML'i döndürür.
+        
+        Args:
+            chunk: AI'dan gelen ham metin parçası
+            
+        Returns:
+            Formatlanmış HTML (henüz tamamlanan satır yoksa boş string)
+        """
+        if self.truncated:
+            return ''
+        
+        self._raw += chunk
+        if not self._emitted:
+            self._raw = self._raw.lstrip()
+        if len(self._raw.rstrip()) > self.max_length:
+            # Sınır aşıldı; kalan kısım finish() ile kısaltılarak gönderilir
+            self.truncated = True
+            return ''
+        
+        # Kısaltma payı bırakılarak son tamamlanan satıra kadar gönder
+        limit = min(len(self._raw), self.max_length - 3)
+        output = ''
+        end = self._raw.rfind('\n', self._emitted, limit)
+        if end >= 0:
+            output += self._format(self._raw[self._emitted:end])
+            self._pending_whitespace += '\n'
+            self._emitted = end + 1
+        
+        # Yarım satırın ilk '*' işaretinden önceki son kelime sınırına kadarki
+        # kısmı da gönderilir; markdown eşleşmeleri bu sınırı aşmaz
+        star = self._raw.find('*', self._emitted, limit)
+        cut = self._raw.rfind(' ', self._emitted, limit if star < 0 else star)
+        if cut > self._emitted:
+            output += self._format(self._raw[self._emitted:cut])
+            self._emitted = cut
+        return output
+    
+    def finish(self) -> str:
+        """
+        Kalan metni formatlar ve döndürür.
+        
+        Returns:
+            Son formatlanmış HTML parçası
+        """
+        if self.truncated:
+            tail = self._raw[self._emitted:self.max_length - 3] + "..."
+        else:
+            tail = self._raw[self._emitted:].rstrip()
+        self._emitted = len(self._raw)
+        return self._format(tail) if tail else ''
+    
+    @property
+    def text(self) -> str:
+        """Şimdiye kadar gönderilen formatlanmış yanıtın tamamı."""
+        return ''.join(self._parts) or self.message_service.format_ai_response('')
+    
+    def _format(self, segment: str) -> str:
+        """Bekleyen boşluklarla birlikte bir metin parçasını formatlar."""
+        if not segment.strip():
+            self._pending_whitespace += segment
+            return ''
+        
+        # Sondaki boşluklar bir sonraki içeriğe kadar bekletilir
+        body = segment.rstrip()
+        formatted = self.message_service.convert_markdown_to_html(body)
+        formatted = self.message_service.add_contextual_emojis(formatted, self._used_emojis)
+        output = self._pending_whitespace.replace('\n', '<br>') + formatted
+        self._pending_whitespace = segment[len(body):]
+        self._parts.append(output)
+        return output
@@ -7,10 +7,44 @@
 
 import os
 import json
+import time
+import random
+import threading
 import requests
-from typing import Dict, Any, Optional
+from requests.adapters import HTTPAdapter
+from typing import Dict, Any, Iterator, Optional, Tuple
 from datetime import datetime
 
+from app.services.single_flight import SingleFlight
+
+# Kullanılan model; kayıtlarda (ai_model) da bu ad saklanır
+GEMINI_DEFAULT_MODEL = 'gemini-2.5-flash'
+
+# HTTP istemci ayarları (bağlantı / okuma zaman aşımı ayrı tutulur)
+GEMINI_CONNECT_TIMEOUT = float(os.getenv('GEMINI_CONNECT_TIMEOUT', '5'))
+GEMINI_READ_TIMEOUT = float(os.getenv('GEMINI_READ_TIMEOUT', '30'))
+GEMINI_MAX_RETRIES = int(os.getenv('GEMINI_MAX_RETRIES', '2'))
+GEMINI_BACKOFF_BASE = float(os.getenv('GEMINI_BACKOFF_BASE', '0.5'))
+GEMINI_BACKOFF_MAX = float(os.getenv('GEMINI_BACKOFF_MAX', '8'))
+GEMINI_POOL_SIZE = int(os.getenv('GEMINI_POOL_SIZE', '10'))
+
+# Aynı anda gelen özdeş istekleri tek Gemini çağrısında birleştir
+GEMINI_COALESCE_REQUESTS = os.getenv('GEMINI_COALESCE_REQUESTS', 'True').lower() in ('true', '1', 't')
+
+# Tekrar denenen HTTP durum kodları
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# Hata kategorileri (generate_content_result()['error'])
+ERROR_NOT_CONFIGURED = 'not_configured'
+ERROR_TIMEOUT = 'timeout'
+ERROR_CONNECTION = 'connection_error'
+ERROR_RATE_LIMITED = 'rate_limited'
+ERROR_SERVER = 'server_error'
+ERROR_AUTH = 'auth_error'
+ERROR_CLIENT = 'client_error'
+ERROR_INVALID_RESPONSE = 'invalid_response'
+ERROR_EMPTY_RESPONSE = 'empty_response'
+
 class GeminiAPIService:
     """
     Gemini AI API ile doğrudan iletişim kuran servis.
@@ -20,8 +54,33 @@ class GeminiAPIService:
     def __init__(self):
         """Gemini API servisini başlatır."""
         self.api_key = os.getenv('GEMINI_API_KEY')
-        self.base_url = "https://generativelanguage.googleapis.com/v1beta/models/gemini-2.5-flash:generateContent"
+        self.model_name = os.getenv('GEMINI_MODEL', GEMINI_DEFAULT_MODEL)
+        self.base_url = os.getenv(
+            'GEMINI_API_URL',
+            f"https://generativelanguage.googleapis.com/v1beta/models/{self.model_name}:generateContent"
+        )
+        self.stream_url = os.getenv(
+            'GEMINI_STREAM_API_URL',
+            self.base_url.replace(':generateContent', ':streamGenerateContent') + '?alt=sse'
+        )
         self.is_configured = self._check_configuration()
+        self.timeout = (GEMINI_CONNECT_TIMEOUT, GEMINI_READ_TIMEOUT)
+        self.max_retries = GEMINI_MAX_RETRIES
+        
+        # Kalıcı HTTP oturumu: TLS bağlantısı istekler arasında yeniden kullanılır
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=GEMINI_POOL_SIZE, max_retries=0)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        
+        # İstatistikler
+        self._stats_lock = threading.Lock()
+        self._stats = {'requests': 0, 'attempts': 0, 'retries': 0, 'succeeded': 0}
+        self._errors: Dict[str, int] = {}
+        
+        # Eşzamanlı özdeş istekler (normalize prompt + config) tek çağrı paylaşır
+        self.coalesce_requests = GEMINI_COALESCE_REQUESTS
+        self._single_flight = SingleFlight()
         
         # Default generation config
         self.default_config = {
@@ -51,68 +110,246 @@ class GeminiAPIService:
             config: Generation konfigürasyonu (optional)
             
         Returns:
-            AI yanıtı veya None
+            AI yanıtı veya None (hata kategorisi için generate_content_result kullanın)
+        """
+        return self.generate_content_result(prompt, config)['text']
+    
+    def generate_content_result(self, prompt: str, config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Gemini API'sine istek gönderir; 429/5xx ve bağlantı hatalarında
+        jitter'lı üstel bekleme ile sınırlı sayıda tekrar dener.
+        
+        Args:
+            prompt: AI'ya gönderilecek prompt
+            config: Generation konfigürasyonu (optional)
+            
+        Aynı prompt ve config ile devam eden bir istek varsa yeni istek
+        gönderilmez; o isteğin sonucu paylaşılır.
+        
+        Returns:
+            {'text': yanıt veya None, 'error': hata kategorisi veya None,
+             'status_code': son HTTP durum kodu, 'attempts': deneme sayısı,
+             'coalesced': sonuç başka bir isteğin çağrısından geldiyse True}
         """
         if not self.is_configured:
-            return None
+            return dict(self._result(None, ERROR_NOT_CONFIGURED, None, 0), coalesced=False)
+        
+        if not self.coalesce_requests:
+            return dict(self._generate(prompt, config), coalesced=False)
+        
+        key = SingleFlight.make_key(prompt, config or {})
+        result, shared = self._single_flight.do(key, lambda: self._generate(prompt, config))
+        return dict(result, coalesced=shared)
+    
+    def _generate(self, prompt: str, config: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Tek bir (tekrar denemeli) generateContent çağrısı yapar."""
+        response, error, status_code, attempts = self._post(
+            self.base_url, self._build_request_body(prompt, config)
+        )
+        if response is None:
+            return self._result(None, error, status_code, attempts)
+        return self._parse_response(response, attempts)
+    
+    def stream_content(self, prompt: str, config: Optional[Dict[str, Any]] = None) -> Iterator[Dict[str, Any]]:
+        """
+        streamGenerateContent (SSE) uç noktasını kullanarak yanıtı parça parça üretir.
+        Tekrar denemeler yalnızca ilk bayt gelmeden önce yapılır.
+        
+        Args:
+            prompt: AI'ya gönderilecek prompt
+            config: Generation konfigürasyonu (optional)
             
+        Yields:
+            {'text': parça} olayları; ardından {'done': True, 'finish_reason': ...}
+            veya {'error': hata kategorisi}
+        """
+        if not self.is_configured:
+            self._result(None, ERROR_NOT_CONFIGURED, None, 0)
+            yield {'error': ERROR_NOT_CONFIGURED}
+            return
+        
+        response, error, status_code, attempts = self._post(
+            self.stream_url, self._build_request_body(prompt, config), stream=True
+        )
+        if response is None:
+            self._result(None, error, status_code, attempts)
+            yield {'error': error}
+            return
+        
+        received = False
+        finish_reason = None
         try:
-            # Config'i birleştir
-            generation_config = {**self.default_config, **(config or {})}
-            
-            # Request body'yi hazırla
-            request_body = {
-                "contents": [{
-                    "parts": [{
-                        "text": prompt
-                    }]
-                }],
-                "generationConfig": generation_config
-            }
-            
-            # Headers
-            headers = {
-                "Content-Type": "application/json",
-                "x-goog-api-key": self.api_key
-            }
-            
-            # API call yap
-            response = requests.post(
-                self.base_url,
-                headers=headers,
-                json=request_body,
-                timeout=30
-            )
-            
-            if response.status_code == 200:
-                result = response.json()
-                
-                # Response'dan text'i çıkar
-                if 'candidates' in result and len(result['candidates']) > 0:
-                    candidate = result['candidates'][0]
+            # Generator erken kapatılırsa bağlantı kapanır ve üretim kesilir
+            with response:
+                response.encoding = 'utf-8'
+                for line in response.iter_lines(chunk_size=None, decode_unicode=True):
+                    if not line or not line.startswith('data:'):
+                        continue
+                    try:
+                        payload = json.loads(line[5:].strip())
+                    except ValueError:
+                        self._result(None, ERROR_INVALID_RESPONSE, status_code, attempts)
+                        yield {'error': ERROR_INVALID_RESPONSE}
+                        return
                     
-                    # Check if response was truncated due to token limits
-                    if 'finishReason' in candidate and candidate['finishReason'] == 'MAX_TOKENS':
-                        return "Üzgünüm, yanıtım çok uzun oldu. Lütfen sorunuzu daha kısa tutabilir misiniz?"
-                    
-                    if 'content' in candidate and 'parts' in candidate['content']:
-                        parts = candidate['content']['parts']
-                        if len(parts) > 0 and 'text' in parts[0]:
-                            return parts[0]['text']
+                    candidate = (payload.get('candidates') or [{}])[0]
+                    finish_reason = candidate.get('finishReason') or finish_reason
+                    text = self._extract_text(candidate)
+                    if text:
+                        received = True
+                        yield {'text': text}
+        except requests.exceptions.Timeout:
+            # Parçalar arasında okuma zaman aşımı
+            self._result(None, ERROR_TIMEOUT, status_code, attempts)
+            yield {'error': ERROR_TIMEOUT}
+            return
+        except requests.exceptions.RequestException:
+            self._result(None, ERROR_CONNECTION, status_code, attempts)
+            yield {'error': ERROR_CONNECTION}
+            return
+        
+        if not received:
+            self._result(None, ERROR_EMPTY_RESPONSE, status_code, attempts)
+            yield {'error': ERROR_EMPTY_RESPONSE}
+            return
+        
+        self._result('', None, status_code, attempts)
+        yield {'done': True, 'finish_reason': finish_reason}
+    
+    def _build_request_body(self, prompt: str, config: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Prompt ve birleştirilmiş generation config'den istek gövdesini oluşturur."""
+        # Config'i birleştir
+        generation_config = {**self.default_config, **(config or {})}
+        
+        return {
+            "contents": [{
+                "parts": [{
+                    "text": prompt
+                }]
+            }],
+            "generationConfig": generation_config
+        }
+    
+    def _post(self, url: str, request_body: Dict[str, Any],
+              stream: bool = False) -> Tuple[Optional[requests.Response], Optional[str], Optional[int], int]:
+        """
+        İsteği gönderir; 429/5xx ve bağlantı hatalarında jitter'lı üstel
+        bekleme ile sınırlı sayıda tekrar dener.
+        
+        Returns:
+            (200 yanıtı veya None, hata kategorisi, son durum kodu, deneme sayısı)
+        """
+        headers = {
+            "Content-Type": "application/json",
+            "x-goog-api-key": self.api_key
+        }
+        
+        self._count('requests')
+        attempt = 0
+        while True:
+            attempt += 1
+            self._count('attempts')
+            retry_after = None
+            try:
+                response = self.session.post(
+                    url,
+                    headers=headers,
+                    json=request_body,
+                    timeout=self.timeout,
+                    stream=stream
+                )
+                status_code = response.status_code
                 
-                return None
+                if status_code == 200:
+                    return response, None, status_code, attempt
                 
-            else:
-                return None
+                if status_code == 429:
+                    error = ERROR_RATE_LIMITED
+                    retry_after = response.headers.get('Retry-After')
+                elif status_code >= 500:
+                    error = ERROR_SERVER
+                elif status_code in (401, 403):
+                    error = ERROR_AUTH
+                else:
+                    error = ERROR_CLIENT
+                # Hata gövdesi tüketilir; bağlantı havuza geri döner
+                response.content
+                response.close()
                 
-        except requests.exceptions.Timeout:
-            return None
-        except requests.exceptions.RequestException as e:
-            return None
-        except json.JSONDecodeError as e:
-            return None
-        except Exception as e:
-            return None
+                if status_code not in RETRYABLE_STATUS_CODES or attempt > self.max_retries:
+                    return None, error, status_code, attempt
+                
+            except requests.exceptions.ConnectTimeout:
+                # Bağlantı kurulamadı; istek sunucuya ulaşmadı, tekrar denenebilir
+                if attempt > self.max_retries:
+                    return None, ERROR_TIMEOUT, None, attempt
+            except requests.exceptions.Timeout:
+                # Okuma zaman aşımı: üretim pahalı olduğundan tekrar denenmez
+                return None, ERROR_TIMEOUT, None, attempt
+            except requests.exceptions.ConnectionError:
+                if attempt > self.max_retries:
+                    return None, ERROR_CONNECTION, None, attempt
+            except requests.exceptions.RequestException:
+                return None, ERROR_CONNECTION, None, attempt
+            
+            self._count('retries')
+            time.sleep(self._backoff_delay(attempt, retry_after))
+    
+    def _backoff_delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """Tekrar denemeden önce beklenecek süre (full jitter; Retry-After varsa ona uyulur)."""
+        if retry_after:
+            try:
+                return min(float(retry_after), GEMINI_BACKOFF_MAX)
+            except ValueError:
+                pass
+        return random.uniform(0, min(GEMINI_BACKOFF_MAX, GEMINI_BACKOFF_BASE * (2 ** (attempt - 1))))
+    
+    def _parse_response(self, response: requests.Response, attempt: int) -> Dict[str, Any]:
+        """Başarılı yanıttan metni çıkarır."""
+        try:
+            result = response.json()
+        except (json.JSONDecodeError, ValueError):
+            return self._result(None, ERROR_INVALID_RESPONSE, response.status_code, attempt)
+        
+        # Response'dan text'i çıkar
+        if 'candidates' in result and len(result['candidates']) > 0:
+            candidate = result['candidates'][0]
+            
+            # Check if response was truncated due to token limits
+            if 'finishReason' in candidate and candidate['finishReason'] == 'MAX_TOKENS':
+                return self._result(
+                    "Üzgünüm, yanıtım çok uzun oldu. Lütfen sorunuzu daha kısa tutabilir misiniz?",
+                    None, response.status_code, attempt
+                )
+            
+            text = self._extract_text(candidate)
+            if text:
+                return self._result(text, None, response.status_code, attempt)
+        
+        return self._result(None, ERROR_EMPTY_RESPONSE, response.status_code, attempt)
+    
+    @staticmethod
+    def _extract_text(candidate: Dict[str, Any]) -> str:
+        """Aday yanıttaki metin parçalarını birleştirir."""
+        parts = candidate.get('content', {}).get('parts', [])
+        return ''.join(part.get('text', '') for part in parts)
+    
+    def _result(self, text: Optional[str], error: Optional[str],
+                status_code: Optional[int], attempts: int) -> Dict[str, Any]:
+        """Sonucu oluşturur ve istatistiklere işler."""
+        with self._stats_lock:
+            if error:
+                self._errors[error] = self._errors.get(error, 0) + 1
+            else:
+                self._stats['succeeded'] += 1
+        if error:
+            print(f"❌ Gemini API hatası: {error} (status={status_code}, deneme={attempts})")
+        return {'text': text, 'error': error, 'status_code': status_code, 'attempts': attempts}
+    
+    def _count(self, key: str) -> None:
+        """Sayaç artırır."""
+        with self._stats_lock:
+            self._stats[key] += 1
     
     def get_service_status(self) -> Dict[str, Any]:
         """API servisinin durumunu döndürür."""
@@ -120,9 +357,22 @@ class GeminiAPIService:
             'available': self.is_configured,
             'api_key_configured': bool(self.api_key),
             'model': 'gemini-pro',
+            'http_client': self.get_client_stats(),
             'timestamp': datetime.now().isoformat()
         }
     
+    def get_client_stats(self) -> Dict[str, Any]:
+        """HTTP istemcisinin istek, tekrar deneme ve hata sayılarını döndürür."""
+        with self._stats_lock:
+            return {
+                **self._stats,
+                'errors': dict(self._errors),
+                'connect_timeout': self.timeout[0],
+                'read_timeout': self.timeout[1],
+                'max_retries': self.max_retries,
+                'coalescing': dict(self._single_flight.get_stats(), enabled=self.coalesce_requests)
+            }
+    
     def test_connection(self) -> bool:
         """
         API bağlantısını test eder.
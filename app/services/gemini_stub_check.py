@@ -0,0 +1,288 @@
+# =============================================================================
+# GEMINI STUB CHECK SCRIPT
+# =============================================================================
+# Bu script, Gemini istemcisinin hata davranışını gerçek API'ye gitmeden,
+# yerel bir stub model sunucusuna karşı doğrular:
+#   - 429 + Retry-After yanıtından sonra belirtilen süre beklenip tekrar denenir
+#   - 5xx yanıtları GEMINI_MAX_RETRIES kadar tekrar denenip 'server_error' olur
+#   - 401 tekrar denenmez, 'auth_error' olur
+#   - Okuma zaman aşımı tekrar denenmez, 'timeout' olur
+#   - Kapalı porta bağlantı 'connection_error' olur
+# Ayrıca ön üretim CLI'ının (quick_action_pregen_cli.py) istek hızı sınırını
+# ve kontrol noktasından devam etmesini, veritabanı yerine bellek içi bir
+# soru deposuyla aynı stub sunucuya karşı çalıştırarak doğrular.
+#
+# Kullanım (veritabanı ve API anahtarı gerekmez):
+#   python app/services/gemini_stub_check.py
+#   python app/services/gemini_stub_check.py --verbose
+# Tüm kontroller geçerse 0, biri başarısız olursa 1 ile çıkar.
+# =============================================================================
+
+import sys
+import os
+import json
+import time
+import socket
+import argparse
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Proje kök dizinini Python path'ine ekle
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(PROJECT_ROOT)
+
+
+class StubModelServer:
+    """
+    generateContent yanıtlarını taklit eden yerel HTTP sunucusu.
+    Her istek `plan` listesinden sıradaki davranışı alır; liste bitince
+    `default` davranışı kullanılır. Davranış: {'status', 'headers', 'delay', 'text'}.
+    """
+
+    def __init__(self):
+        self.plan = []
+        self.default = {'status': 200}
+        self.requests = []
+        self._lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get('Content-Length') or 0))
+                with stub._lock:
+                    stub.requests.append((time.monotonic(), json.loads(body or b'{}')))
+                    behaviour = stub.plan.pop(0) if stub.plan else stub.default
+                if behaviour.get('delay'):
+                    time.sleep(behaviour['delay'])
+
+                status = behaviour.get('status', 200)
+                if status == 200:
+                    payload = {'candidates': [{
+                        'content': {'parts': [{'text': behaviour.get('text', 'stub yanıt')}]},
+                        'finishReason': 'STOP'
+                    }]}
+                else:
+                    payload = {'error': {'code': status}}
+                data = json.dumps(payload).encode('utf-8')
+                try:
+                    self.send_response(status)
+                    for name, value in behaviour.get('headers', {}).items():
+                        self.send_header(name, value)
+                    self.send_header('Content-Type', 'application/json')
+                    self.send_header('Content-Length', str(len(data)))
+                    self.end_headers()
+                    self.wfile.write(data)
+                except OSError:
+                    # İstemci zaman aşımıyla bağlantıyı kapatmış olabilir
+                    pass
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/generate"
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def reset(self, plan=None, default=None):
+        """Davranış planını ve istek kayıtlarını sıfırlar."""
+        with self._lock:
+            self.plan = list(plan or [])
+            self.default = default or {'status': 200}
+            self.requests = []
+
+
+def _closed_port_url():
+    """Dinlenmeyen bir yerel port adresi döndürür."""
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+    return f"http://127.0.0.1:{port}/generate"
+
+
+def _make_service(url):
+    """Stub adresine bağlı, birleştirme (coalescing) kapalı bir istemci oluşturur."""
+    os.environ.setdefault('GEMINI_API_KEY', 'stub-key')
+    os.environ['GEMINI_API_URL'] = url
+    from app.services.gemini_api_service import GeminiAPIService
+    service = GeminiAPIService()
+    service.coalesce_requests = False
+    service.max_retries = 2
+    return service
+
+
+def check_retry_after(stub):
+    """429 + Retry-After: 1 sonrası en az 1 sn beklenip ikinci denemede başarılı olur."""
+    stub.reset(plan=[{'status': 429, 'headers': {'Retry-After': '1'}}])
+    result = _make_service(stub.url).generate_content_result('retry-after')
+    gap = stub.requests[1][0] - stub.requests[0][0] if len(stub.requests) == 2 else 0
+    return (result['text'] == 'stub yanıt' and result['attempts'] == 2 and gap >= 0.9,
+            f"attempts={result['attempts']}, bekleme={gap:.2f}s")
+
+
+def check_server_error_retries(stub):
+    """Sürekli 503: 1 + max_retries deneme yapılır ve 'server_error' döner."""
+    stub.reset(default={'status': 503})
+    result = _make_service(stub.url).generate_content_result('server-error')
+    return (result['error'] == 'server_error' and result['attempts'] == 3 and len(stub.requests) == 3,
+            f"error={result['error']}, attempts={result['attempts']}")
+
+
+def check_auth_not_retried(stub):
+    """401 tekrar denenmez ve 'auth_error' olarak sınıflanır."""
+    stub.reset(default={'status': 401})
+    result = _make_service(stub.url).generate_content_result('auth')
+    return (result['error'] == 'auth_error' and len(stub.requests) == 1,
+            f"error={result['error']}, istek={len(stub.requests)}")
+
+
+def check_read_timeout(stub):
+    """Okuma zaman aşımı tek denemede 'timeout' olarak sınıflanır."""
+    stub.reset(plan=[{'status': 200, 'delay': 1.5}])
+    service = _make_service(stub.url)
+    service.timeout = (1.0, 0.5)
+    result = service.generate_content_result('timeout')
+    return (result['error'] == 'timeout' and result['attempts'] == 1,
+            f"error={result['error']}, attempts={result['attempts']}")
+
+
+def check_connection_error(stub):
+    """Kapalı porta bağlantı tekrar denemelerden sonra 'connection_error' olur."""
+    result = _make_service(_closed_port_url()).generate_content_result('connection')
+    return (result['error'] == 'connection_error' and result['attempts'] == 3,
+            f"error={result['error']}, attempts={result['attempts']}")
+
+
+class InMemoryQuestionRepository:
+    """Ön üretim CLI'ının kullandığı ChatRepository metotlarının bellek içi karşılığı."""
+
+    def __init__(self, question_count):
+        self.questions = [
+            {'id': question_id, 'question_text': f'Soru {question_id}', 'topic_name': 'Konu'}
+            for question_id in range(1, question_count + 1)
+        ]
+        self.saved = {}
+
+    def __call__(self, *args, **kwargs):
+        # CLI depoyu ChatRepository() ile oluşturur; aynı örnek döndürülür
+        return self
+
+    def get_questions_for_ai_texts(self, after_id, limit):
+        return [question for question in self.questions if question['id'] > after_id][:limit]
+
+    def get_fresh_question_ai_texts(self, question_ids, prompt_versions):
+        return {
+            (question_id, action) for (question_id, action), (version, _) in self.saved.items()
+            if question_id in question_ids and prompt_versions.get(action) == version
+        }
+
+    def save_question_ai_text(self, question_id, action_type, prompt_version, content, ai_model, response_time_ms):
+        self.saved[(question_id, action_type)] = (prompt_version, ai_model)
+        return True
+
+
+def _run_pregen(stub, repo, checkpoint, *extra_args):
+    """Ön üretim CLI'ını stub sunucu ve bellek içi depo ile çalıştırır; çıkış kodunu döndürür."""
+    os.environ.setdefault('GEMINI_API_KEY', 'stub-key')
+    from app.database import quick_action_pregen_cli
+    original_repo, original_argv = quick_action_pregen_cli.ChatRepository, sys.argv
+    quick_action_pregen_cli.ChatRepository = repo
+    sys.argv = ['quick_action_pregen_cli.py', '--api-url', stub.url, '--checkpoint', checkpoint,
+                '--actions', 'explain', '--concurrency', '1', *extra_args]
+    try:
+        return quick_action_pregen_cli.main()
+    finally:
+        quick_action_pregen_cli.ChatRepository, sys.argv = original_repo, original_argv
+
+
+def check_pregen_rate_limit(stub):
+    """Ön üretim saniyede en fazla --rate istek gönderir."""
+    stub.reset()
+    with tempfile.TemporaryDirectory() as directory:
+        exit_code = _run_pregen(stub, InMemoryQuestionRepository(6), os.path.join(directory, 'cp.json'),
+                                '--rate', '5', '--batch-size', '10')
+    times = [timestamp for timestamp, _ in stub.requests]
+    span = times[-1] - times[0] if len(times) > 1 else 0
+    # 6 istek, 5/sn: ilk ile son arasında en az 5 aralık (1 sn)
+    return (exit_code == 0 and len(times) == 6 and span >= 0.95,
+            f"istek={len(times)}, süre={span:.2f}s")
+
+
+def check_pregen_checkpoint_resume(stub):
+    """Ölümcül hatada durur; yeniden çalıştırınca kontrol noktasından devam eder."""
+    from app.services.gemini_api_service import GeminiAPIService
+    repo = InMemoryQuestionRepository(5)
+    with tempfile.TemporaryDirectory() as directory:
+        checkpoint = os.path.join(directory, 'cp.json')
+        # 1. grup (1-2) tamamlanır, 2. grupta 4. soru 401 alır ve iş durur
+        stub.reset(plan=[{'status': 200}] * 3, default={'status': 401})
+        first_exit = _run_pregen(stub, repo, checkpoint, '--rate', '0', '--batch-size', '2')
+        with open(checkpoint, 'r', encoding='utf-8') as f:
+            cursor = json.load(f)['last_question_id']
+
+        # Devam: 3. soru güncel olduğu için atlanır, yalnızca 4 ve 5 üretilir
+        stub.reset()
+        second_exit = _run_pregen(stub, repo, checkpoint, '--rate', '0', '--batch-size', '2')
+        resumed = sorted(
+            question['id'] for question in repo.questions
+            for _, request in stub.requests
+            if f"Soru {question['id']}" in request['contents'][0]['parts'][0]['text']
+        )
+
+    models = {model for _, model in repo.saved.values()}
+    passed = (first_exit == 1 and cursor == 2 and second_exit == 0 and resumed == [4, 5]
+              and sorted(question_id for question_id, _ in repo.saved) == [1, 2, 3, 4, 5]
+              and models == {GeminiAPIService().model_name})
+    return passed, f"checkpoint={cursor}, devam edilen={resumed}, model={models}"
+
+
+CHECKS = [
+    check_retry_after,
+    check_server_error_retries,
+    check_auth_not_retried,
+    check_read_timeout,
+    check_connection_error,
+    check_pregen_rate_limit,
+    check_pregen_checkpoint_resume,
+]
+
+
+def main():
+    """
+    Ana fonksiyon - stub sunucuyu başlatır ve kontrolleri sırayla çalıştırır.
+    """
+    parser = argparse.ArgumentParser(
+        description="Gemini istemcisinin tekrar deneme ve hata sınıflamasını stub sunucuyla doğrular"
+    )
+    parser.add_argument('--verbose', '-v', action='store_true', help='Detaylı çıktı göster')
+    args = parser.parse_args()
+
+    stub = StubModelServer().start()
+    failed = 0
+    try:
+        for check in CHECKS:
+            try:
+                passed, detail = check(stub)
+            except Exception as e:
+                passed, detail = False, f"hata: {e}"
+            failed += 0 if passed else 1
+            line = f"{'✅' if passed else '❌'} {check.__doc__}"
+            print(f"{line} ({detail})" if args.verbose or not passed else line)
+    finally:
+        stub.stop()
+
+    print(f"📊 {len(CHECKS) - failed}/{len(CHECKS)} kontrol geçti")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,265 @@
+# =============================================================================
+# 1.0. MODÜL BAŞLIĞI VE AÇIKLAMASI
+# =============================================================================
+# Bu modül, sık kullanılan quiz yapılandırmaları için önceden hazırlanmış
+# soru setlerini tutan `QuestionSetPool` sınıfını içerir.
+# Bir soru seti; seçilmiş sorular ve her sorunun karıştırılmış şıklarından
+# oluşur. Quiz başlatılırken havuzda set varsa örnekleme ve soru/şık yükleme
+# atlanır; geriye yalnızca session kayıtlarının eklenmesi kalır.
+# Havuz arka planda doldurulur. Yapılandırmalar config'den verilebilir veya
+# belirli sayıda başlatma isteği alan yapılandırmalar otomatik eklenir.
+# Soru bankası değiştiğinde (soru indeksi yenilendiğinde) eski setler atılır.
+# =============================================================================
+
+# =============================================================================
+# 2.0. İÇİNDEKİLER
+# =============================================================================
+# 3.0. GEREKLİ KÜTÜPHANELER VE MODÜLLER
+# 4.0. MODÜL SEVİYESİ YAPILANDIRMA
+# 5.0. QUESTIONSETPOOL SINIFI
+#   5.1. __init__(self, default_size, auto_threshold, max_configs, refill_interval)
+#   5.2. make_key(topic_id, subject_id, difficulty, count)
+#   5.3. configure(self, key, size)
+#   5.4. start(self)
+#   5.5. stop(self)
+#   5.6. take(self, key)
+#   5.7. refill(self)
+#   5.8. get_stats(self)
+# 6.0. MODÜL SEVİYESİ FONKSİYONLAR
+#   6.1. init_app(app)
+# =============================================================================
+
+# =============================================================================
+# 3.0. GEREKLİ KÜTÜPHANELER VE MODÜLLER
+# =============================================================================
+import os
+import atexit
+import threading
+from collections import deque
+from typing import Dict, List, Optional, Tuple, Any
+
+from app.database.question_sampler import question_sampler
+
+# =============================================================================
+# 4.0. MODÜL SEVİYESİ YAPILANDIRMA
+# =============================================================================
+# Her yapılandırma için hazır tutulacak varsayılan set sayısı
+QUESTION_SET_POOL_SIZE = int(os.getenv('QUESTION_SET_POOL_SIZE', '10'))
+
+# Bir yapılandırmanın otomatik olarak havuza alınması için gereken başlatma sayısı
+QUESTION_SET_POOL_AUTO_THRESHOLD = int(os.getenv('QUESTION_SET_POOL_AUTO_THRESHOLD', '3'))
+
+# Havuzda tutulacak en fazla yapılandırma sayısı
+QUESTION_SET_POOL_MAX_CONFIGS = int(os.getenv('QUESTION_SET_POOL_MAX_CONFIGS', '20'))
+
+# Doldurma thread'inin kontrol aralığı (saniye)
+QUESTION_SET_POOL_REFILL_INTERVAL = float(os.getenv('QUESTION_SET_POOL_REFILL_INTERVAL', '5'))
+
+# Bir doldurma turunda bir yapılandırma için hazırlanacak en fazla set sayısı
+REFILL_BATCH_PER_CONFIG = 5
+
+# (kapsam, kapsam_id, zorluk, soru_sayısı) — kapsam 'topic' veya 'subject'
+PoolKey = Tuple[str, int, str, int]
+
+# =============================================================================
+# 5.0. QUESTIONSETPOOL SINIFI
+# =============================================================================
+class QuestionSetPool:
+    """
+    Yapılandırma anahtarı başına hazır soru setlerini kuyrukta tutar.
+    Her set yalnızca bir kez verilir; alınan setlerin yerine arka planda
+    yenileri hazırlanır.
+    """
+
+    def __init__(self, default_size: int = QUESTION_SET_POOL_SIZE,
+                 auto_threshold: int = QUESTION_SET_POOL_AUTO_THRESHOLD,
+                 max_configs: int = QUESTION_SET_POOL_MAX_CONFIGS,
+                 refill_interval: float = QUESTION_SET_POOL_REFILL_INTERVAL):
+        """5.1. Havuzu başlatır. start() çağrılana kadar devre dışıdır."""
+        self.default_size = default_size
+        self.auto_threshold = auto_threshold
+        self.max_configs = max_configs
+        self.refill_interval = refill_interval
+        self.enabled = False
+        self._repo = None
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._sizes: Dict[PoolKey, int] = {}
+        self._sets: Dict[PoolKey, deque] = {}
+        self._exhausted: Dict[PoolKey, int] = {}
+        self._misses: Dict[PoolKey, int] = {}
+        self._generation: Optional[int] = None
+        self._hits = 0
+        self._miss_count = 0
+        self._built = 0
+
+    @staticmethod
+    def make_key(topic_id: Optional[int], subject_id: int, difficulty: str, count: int) -> PoolKey:
+        """5.2. Quiz yapılandırmasından havuz anahtarı üretir.
+
+        Formdan gelen boş topic_id ('') seçilmemiş sayılır ve ders kapsamına düşer.
+        """
+        if topic_id not in (None, ''):
+            return ('topic', int(topic_id), difficulty or 'random', int(count))
+        return ('subject', int(subject_id), difficulty or 'random', int(count))
+
+    def configure(self, key: PoolKey, size: Optional[int] = None) -> None:
+        """5.3. Yapılandırmayı havuza ekler veya hedef set sayısını değiştirir."""
+        with self._lock:
+            self._sizes[key] = self.default_size if size is None else max(0, int(size))
+            self._sets.setdefault(key, deque())
+        self._wakeup.set()
+
+    def start(self) -> None:
+        """5.4. Arka plan doldurma thread'ini başlatır ve havuzu etkinleştirir."""
+        if self._thread is not None:
+            return
+        self.enabled = True
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name='question-set-pool', daemon=True)
+        self._thread.start()
+        atexit.register(self.stop)
+
+    def stop(self) -> None:
+        """5.5. Doldurma thread'ini durdurur."""
+        self.enabled = False
+        self._stopped.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _run(self) -> None:
+        """Bir set alındığında veya aralık dolduğunda havuzu doldurur."""
+        while not self._stopped.is_set():
+            self._wakeup.wait(self.refill_interval)
+            self._wakeup.clear()
+            if not self._stopped.is_set():
+                self.refill()
+
+    def _current_generation(self) -> int:
+        """Soru indeksinin yenilenme sayısı; değişmişse eldeki setler eskimiştir."""
+        return question_sampler.get_stats()['refresh_count']
+
+    def _discard_if_stale(self) -> None:
+        """Soru bankası değiştiyse tüm hazır setleri atar (kilit altında çağrılır)."""
+        generation = self._current_generation()
+        if generation != self._generation:
+            for sets in self._sets.values():
+                sets.clear()
+            self._exhausted.clear()
+            self._generation = generation
+
+    def take(self, key: PoolKey) -> Optional[List[Dict[str, Any]]]:
+        """5.6. Anahtar için hazır bir soru seti döndürür; yoksa None."""
+        if not self.enabled:
+            return None
+
+        with self._lock:
+            self._discard_if_stale()
+            sets = self._sets.get(key)
+            if sets:
+                self._hits += 1
+                question_set = sets.popleft()
+                self._wakeup.set()
+                return question_set
+
+            # Sık istenen yapılandırmalar otomatik olarak havuza alınır
+            self._miss_count += 1
+            if len(self._misses) >= self.max_configs * 50:
+                self._misses.clear()
+            misses = self._misses.get(key, 0) + 1
+            self._misses[key] = misses
+            if (key not in self._sizes and misses >= self.auto_threshold
+                    and len(self._sizes) < self.max_configs):
+                self._sizes[key] = self.default_size
+                self._sets[key] = deque()
+                self._wakeup.set()
+            return None
+
+    def _get_repo(self):
+        """QuizSessionRepository'yi ilk kullanımda oluşturur."""
+        if self._repo is None:
+            from app.database.quiz_session_repository import QuizSessionRepository
+            self._repo = QuizSessionRepository()
+        return self._repo
+
+    def _build_set(self, key: PoolKey) -> List[Dict[str, Any]]:
+        """Anahtar için yeni bir soru seti (sorular + karıştırılmış şıklar) hazırlar."""
+        scope, scope_id, difficulty, count = key
+        repo = self._get_repo()
+        if scope == 'topic':
+            return repo.get_random_questions(topic_id=scope_id, difficulty=difficulty, count=count)
+        return repo.get_random_questions_by_subject(subject_id=scope_id, difficulty=difficulty, count=count)
+
+    def refill(self) -> int:
+        """5.7. Hedef sayının altındaki yapılandırmalar için set hazırlar."""
+        built = 0
+        try:
+            with self._lock:
+                self._discard_if_stale()
+                generation = self._generation
+                targets = [
+                    (key, min(size - len(self._sets[key]), REFILL_BATCH_PER_CONFIG))
+                    for key, size in self._sizes.items()
+                    if key not in self._exhausted and len(self._sets[key]) < size
+                ]
+
+            # Setler kilit dışında hazırlanır; take() beklemez
+            for key, deficit in targets:
+                for _ in range(deficit):
+                    question_set = self._build_set(key)
+                    with self._lock:
+                        if not question_set:
+                            # Uygun soru yok; soru bankası değişene kadar tekrar denenmez
+                            self._exhausted[key] = generation
+                            break
+                        if self._generation != generation:
+                            return built
+                        self._sets[key].append(question_set)
+                    built += 1
+
+            self._built += built
+            return built
+
+        except Exception as e:
+            print(f"❌ Soru seti havuzu doldurma hatası: {e}")
+            return built
+
+    def get_stats(self) -> Dict[str, Any]:
+        """5.8. Havuz istatistiklerini döndürür."""
+        with self._lock:
+            return {
+                'enabled': self.enabled,
+                'configs': len(self._sizes),
+                'ready_sets': sum(len(sets) for sets in self._sets.values()),
+                'hits': self._hits,
+                'misses': self._miss_count,
+                'built': self._built
+            }
+
+# =============================================================================
+# 6.0. MODÜL SEVİYESİ FONKSİYONLAR
+# =============================================================================
+# Süreç (process) içinde tüm servisler aynı havuzu paylaşır.
+question_set_pool = QuestionSetPool()
+
+def init_app(app) -> bool:
+    """6.1. Flask config'i QUESTION_SET_POOL_ENABLED ise havuzu başlatır.
+
+    QUESTION_SET_POOL_CONFIGS örneği:
+        [{'topic_id': 12, 'subject_id': 3, 'difficulty': 'random', 'question_count': 5, 'size': 20}]
+    """
+    if not app.config.get('QUESTION_SET_POOL_ENABLED', True):
+        return False
+    question_set_pool.default_size = app.config.get('QUESTION_SET_POOL_SIZE', QUESTION_SET_POOL_SIZE)
+    for config in app.config.get('QUESTION_SET_POOL_CONFIGS', []):
+        key = QuestionSetPool.make_key(
+            config.get('topic_id'), config['subject_id'],
+            config.get('difficulty', 'random'), config.get('question_count', 10)
+        )
+        question_set_pool.configure(key, config.get('size'))
+    question_set_pool.start()
+    return True
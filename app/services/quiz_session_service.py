@@ -17,8 +17,15 @@
 #     4.2.2. get_session_info(self, session_id)
 #     4.2.3. submit_answer(self, session_id, question_id, answer_data)
 #     4.2.4. complete_session(self, session_id)
+#     4.2.4b. complete_expired_session(self, session_id)
+#     4.2.5. get_session_results(self, session_id)
+#     4.2.6. _get_answer_key(self, session_id)
+#     4.2.7. _flush_pending_writes(session_id)
+#     4.2.8. get_remaining_time(self, session_id)
+#     4.2.9. get_session_status(self, session_id)
 #   4.3. Soru ve Cevap İşlemleri
 #     4.3.1. get_session_questions(self, session_id)
+#     4.3.1a. get_session_questions_with_details(self, session_id)
 #     4.3.2. calculate_answer_result(self, question_id, user_answer_id)
 #     4.3.3. calculate_session_results(self, session_id)
 # =============================================================================
@@ -31,6 +38,10 @@ from datetime import datetime
 import time
 
 from app.database.quiz_session_repository import QuizSessionRepository
+from app.database.answer_key_cache import answer_key_cache
+from app.database.write_behind_buffer import write_behind_buffer
+from app.database.curriculum_cache import curriculum_cache
+from app.services.question_set_pool import question_set_pool
 
 # =============================================================================
 # 4.0. QUIZSESSIONSERVICE SINIFI
@@ -59,6 +70,13 @@ class QuizSessionService:
                 if field not in quiz_config:
                     return False, {'error': f'Missing required field: {field}'}
 
+            # Form ID'leri metin olarak gelir ('' = seçilmedi); örnekleyici int anahtar kullanır
+            grade_id = self._to_int(quiz_config['grade_id'])
+            subject_id = self._to_int(quiz_config['subject_id'])
+            topic_id = self._to_int(quiz_config.get('topic_id'))
+            if subject_id is None:
+                return False, {'error': 'Invalid subject_id'}
+
             # Session ID oluştur
             import uuid
             session_id = str(uuid.uuid4())
@@ -67,10 +85,10 @@ class QuizSessionService:
             session_data = {
                 'session_id': session_id,
                 'user_id': user_id,
-                'grade_id': quiz_config['grade_id'],
-                'subject_id': quiz_config['subject_id'],
-                'unit_id': quiz_config.get('unit_id'),
-                'topic_id': quiz_config.get('topic_id'),  # Artık opsiyonel
+                'grade_id': grade_id,
+                'subject_id': subject_id,
+                'unit_id': self._to_int(quiz_config.get('unit_id')),
+                'topic_id': topic_id,  # Artık opsiyonel
                 'difficulty_level': quiz_config.get('difficulty_level', 'random'),
                 'timer_enabled': quiz_config.get('timer_enabled', True),
                 'timer_duration': quiz_config.get('timer_duration', 30),
@@ -78,22 +96,22 @@ class QuizSessionService:
                 'question_count': quiz_config.get('question_count', 10)
             }
 
-            # Session'ı veritabanında oluştur
-            success, session_db_id = self.session_repo.create_session(session_data)
-            if not success:
-                return False, {'error': 'Failed to create session'}
-
             # Rasgele soruları seç - topic_id None ise subject_id kullan
-            topic_id = quiz_config.get('topic_id')
+            # Sık kullanılan yapılandırmalar için önceden hazırlanmış set varsa onu kullan
+            questions = question_set_pool.take(question_set_pool.make_key(
+                topic_id, subject_id,
+                quiz_config.get('difficulty_level', 'random'),
+                quiz_config.get('question_count', 10)
+            ))
             
-            if topic_id is None:
+            if not questions and topic_id is None:
                 # Topic seçilmemişse, subject'e göre soru seç
                 questions = self.session_repo.get_random_questions_by_subject(
-                    subject_id=quiz_config['subject_id'],
+                    subject_id=subject_id,
                     difficulty=quiz_config.get('difficulty_level', 'random'),
                     count=quiz_config.get('question_count', 10)
                 )
-            else:
+            elif not questions:
                 # Topic seçilmişse, topic'e göre soru seç
                 questions = self.session_repo.get_random_questions(
                     topic_id=topic_id,
@@ -104,17 +122,21 @@ class QuizSessionService:
             if not questions:
                 return False, {'error': 'No questions available for the selected criteria'}
 
-            # Session'a soruları ekle
-            if not self.session_repo.add_session_questions(session_db_id, questions):
-                return False, {'error': 'Failed to add questions to session'}
+            # Session'ı ve sorularını tek transaction içinde oluştur
+            success, session_db_id = self.session_repo.create_session_with_questions(session_data, questions)
+            if not success:
+                return False, {'error': 'Failed to create session'}
 
-            # Session bilgilerini getir
-            session_info = self.session_repo.get_session_by_id(session_db_id)
-            if not session_info:
-                return False, {'error': 'Failed to retrieve session info'}
+            # Cevap anahtarını seçilen sorulardan oluştur (ek sorgu yok);
+            # bitiş zamanı veritabanında başlangıç + süre olarak belirlendi
+            timer_minutes = self._to_int(session_data['timer_duration'])
+            seconds_remaining = timer_minutes * 60 if session_data['timer_enabled'] and timer_minutes else None
+            answer_key_cache.put(session_id, answer_key_cache.build_entry(
+                session_db_id, 'active', questions, seconds_remaining
+            ))
 
             result_data = {
-                'session_id': session_info['session_id'],
+                'session_id': session_id,
                 'session_db_id': session_db_id,
                 'questions_count': len(questions),
                 'timer_duration': session_data['timer_duration'],
@@ -128,6 +150,7 @@ class QuizSessionService:
     def get_session_info(self, session_id: str) -> Optional[Dict[str, Any]]:
         """4.2.2. Session bilgilerini getirir."""
         try:
+            self._flush_pending_writes(session_id)
             session = self.session_repo.get_session(session_id)
             if not session:
                 return None
@@ -148,16 +171,30 @@ class QuizSessionService:
     def submit_answer(self, session_id: str, question_id: int, answer_data: Dict[str, Any]) -> Tuple[bool, Dict[str, Any]]:
         """4.2.3. Soru cevabını gönderir ve sonucu hesaplar."""
         try:
-            # Session'ı getir
-            session = self.session_repo.get_session(session_id)
-            if not session:
+            # Session durumu ve cevap anahtarı önbellekten (yoksa tek sorguyla) alınır
+            answer_key = self._get_answer_key(session_id)
+            if not answer_key:
                 return False, {'error': 'Session not found'}
 
-            if session['status'] != 'active':
+            if answer_key['status'] != 'active':
                 return False, {'error': 'Session is not active'}
 
+            if answer_key_cache.is_past_deadline(answer_key):
+                return False, {'error': 'Session time is over'}
+
+            # Yalnızca bu session'a ait sorular cevaplanabilir
+            question_id = self._to_int(question_id)
+            if question_id not in answer_key['answers']:
+                return False, {'error': 'Question is not part of this session'}
+
             # Cevap sonucunu hesapla
-            answer_result = self.calculate_answer_result(question_id, answer_data.get('user_answer_option_id'))
+            user_answer_id = answer_data.get('user_answer_option_id')
+            correct_answer = answer_key['answers'][question_id]
+            answer_result = {
+                'is_correct': bool(user_answer_id) and correct_answer is not None
+                              and self._to_int(user_answer_id) == correct_answer['id'],
+                'correct_answer': correct_answer['name'] if correct_answer else None
+            }
             
             # Cevap verilerini hazırla
             # Puan hesaplama session_results'da yapılacak, burada sadece doğru/yanlış kaydediyoruz
@@ -168,8 +205,10 @@ class QuizSessionService:
                 'time_spent_seconds': answer_data.get('time_spent_seconds', 0)
             }
 
-            # Cevabı güncelle
-            if not self.session_repo.update_answer(session['id'], question_id, answer_update_data):
+            # Cevabı güncelle (write-behind modunda toplu yazılmak üzere kuyruğa alınır)
+            if write_behind_buffer.enabled:
+                write_behind_buffer.add_answer(session_id, answer_key['id'], question_id, answer_update_data)
+            elif not self.session_repo.update_answer(answer_key['id'], question_id, answer_update_data):
                 return False, {'error': 'Failed to update answer'}
 
             return True, {
@@ -184,6 +223,10 @@ class QuizSessionService:
     def complete_session(self, session_id: str) -> Tuple[bool, Dict[str, Any]]:
         """4.2.4. Session'ı tamamlar ve sonuçları hesaplar."""
         try:
+            # Bekleyen cevap/timer güncellemeleri sonuçlardan önce yazılmalı
+            if not self._flush_pending_writes(session_id):
+                return False, {'error': 'Failed to save pending answers'}
+
             # Session sonuçlarını hesapla
             results = self.calculate_session_results(session_id)
             if not results:
@@ -196,20 +239,105 @@ class QuizSessionService:
                 'completion_time_seconds': results.get('completionTime', 0)
             }
             
-            if not self.session_repo.complete_session(session_id, session_completion_data):
+            # Tamamlanan session değişmez; sonuç belgesi bir kez saklanır
+            if not self.session_repo.complete_session(session_id, session_completion_data, results):
+                # Tekrarlanan veya yarışan tamamlama: kayıtlı belge döndürülür
+                snapshot = self.session_repo.get_results_snapshot(session_id)
+                if snapshot:
+                    answer_key_cache.set_status(session_id, 'completed')
+                    return True, snapshot
+                session = self.session_repo.get_session(session_id)
+                if session and session.get('status') == 'completed':
+                    # Zamanlayıcı tamamladı, belgesi henüz yazılmadı
+                    answer_key_cache.set_status(session_id, 'completed')
+                    return True, self.calculate_session_results(session_id) or results
                 return False, {'error': 'Failed to complete session'}
 
+            answer_key_cache.set_status(session_id, 'completed')
+
             return True, results
 
         except Exception as e:
             return False, {'error': 'Internal server error'}
 
+    def complete_expired_session(self, session_id: str) -> bool:
+        """4.2.4b. Zamanlayıcının 'completed' yaptığı session'ın sonuçlarını hesaplayıp saklar."""
+        try:
+            answer_key_cache.set_status(session_id, 'completed')
+            if not self._flush_pending_writes(session_id):
+                return False
+
+            results = self.calculate_session_results(session_id)
+            if not results:
+                return False
+
+            session_completion_data = {
+                'total_score': int(results.get('totalScore', 0)),
+                'correct_answers': results.get('correctAnswers', 0),
+                'completion_time_seconds': results.get('completionTime', 0)
+            }
+            return self.session_repo.save_completion_results(session_id, session_completion_data, results)
+
+        except Exception as e:
+            return False
+
+    def get_session_results(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """4.2.5. Session sonuçlarını kayıtlı belgeden, yoksa hesaplayarak getirir."""
+        try:
+            snapshot = self.session_repo.get_results_snapshot(session_id)
+            if snapshot:
+                return snapshot
+            
+            # Henüz tamamlanmamış veya snapshot öncesi tamamlanmış session'lar
+            return self.calculate_session_results(session_id)
+
+        except Exception as e:
+            return None
+
+    def _get_answer_key(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """4.2.6. Session'ın cevap anahtarını önbellekten, yoksa veritabanından getirir."""
+        answer_key = answer_key_cache.get(session_id)
+        if answer_key:
+            # Session başka bir worker'da veya zamanlayıcıda tamamlanmış olabilir
+            if answer_key_cache.needs_status_check(answer_key):
+                state = self.session_repo.get_session_state(session_id)
+                if not state:
+                    return None
+                answer_key_cache.set_status(session_id, state['status'], state['seconds_remaining'])
+            return answer_key
+
+        answer_key = self.session_repo.get_session_answer_key(session_id)
+        if answer_key:
+            answer_key_cache.put(session_id, answer_key)
+        return answer_key
+
+    @staticmethod
+    def _flush_pending_writes(session_id: str) -> bool:
+        """4.2.7. Session için bekleyen write-behind güncellemeleri varsa yazar."""
+        if write_behind_buffer.has_pending(session_id):
+            return write_behind_buffer.flush()
+        return True
+
+    @staticmethod
+    def _to_isoformat(value: Any) -> Any:
+        """Veritabanından gelen zaman değerini ISO 8601 metnine çevirir."""
+        return value.isoformat() if hasattr(value, 'isoformat') else value
+
+    @staticmethod
+    def _to_int(value: Any) -> Optional[int]:
+        """İstekten gelen ID değerini tam sayıya çevirir."""
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            return None
+
     # -------------------------------------------------------------------------
     # 4.3. Soru ve Cevap İşlemleri
     # -------------------------------------------------------------------------
     def get_session_questions(self, session_id: str) -> List[Dict[str, Any]]:
         """4.3.1. Session'daki soruları getirir."""
         try:
+            self._flush_pending_writes(session_id)
             session = self.session_repo.get_session(session_id)
             if not session:
                 return []
@@ -220,10 +348,18 @@ class QuizSessionService:
         except Exception as e:
             return []
 
-    def get_question_options(self, question_id: int) -> List[Dict[str, Any]]:
-        """4.3.1b. Soru seçeneklerini getirir."""
+    def get_session_questions_with_details(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """4.3.1a. Session'daki tüm soruları detay ve şıklarıyla birlikte getirir."""
+        try:
+            self._flush_pending_writes(session_id)
+            return self.session_repo.get_session_questions_with_details(session_id)
+        except Exception as e:
+            return None
+
+    def get_question_options(self, question_id: int, option_permutation: Optional[str] = None) -> List[Dict[str, Any]]:
+        """4.3.1b. Soru seçeneklerini getirir (session'ın şık sırası verilirse ona göre)."""
         try:
-            options = self.session_repo.get_question_options(question_id)
+            options = self.session_repo.get_question_options(question_id, option_permutation)
             return options
         except Exception as e:
             return []
@@ -271,6 +407,7 @@ class QuizSessionService:
     def calculate_session_results(self, session_id: str) -> Optional[Dict[str, Any]]:
         """4.3.3. Session sonuçlarını hesaplar."""
         try:
+            self._flush_pending_writes(session_id)
             # Session sonuçlarını getir
             results = self.session_repo.get_session_results(session_id)
             if not results:
@@ -292,6 +429,9 @@ class QuizSessionService:
             # Tamamlanma süresini hesapla
             if session['start_time'] and session['end_time']:
                 completion_time = (session['end_time'] - session['start_time']).total_seconds()
+            elif session.get('elapsed_seconds') is not None:
+                # Tamamlanma anında end_time henüz yazılmamıştır
+                completion_time = session['elapsed_seconds']
             else:
                 completion_time = 0
 
@@ -314,15 +454,12 @@ class QuizSessionService:
                 else:
                     status = 'incorrect'
                 
-                # Soru detaylarını al
-                question_details = self.get_question_details(question['question_id'])
+                # Soru detayları sonuç sorgusundan gelir (soru başına ek sorgu yok)
+                subject_name = question.get('subject_name') or 'Bilinmeyen'
+                topic_name = question.get('topic_name') or 'Bilinmeyen'
+                difficulty = question.get('difficulty_level') or 'medium'
                 
-                # Ders analizi için
-                subject_name = question_details.get('subject_name') if question_details else question.get('subject_name', 'Bilinmeyen')
-                topic_name = question_details.get('topic_name') if question_details else question.get('topic_name', 'Bilinmeyen')
-                difficulty = question_details.get('difficulty_level') if question_details else question.get('difficulty_level', 'medium')
-                
-                if subject_name and subject_name != 'Bilinmeyen':
+                if subject_name != 'Bilinmeyen':
                     if subject_name not in subjects_analysis:
                         subjects_analysis[subject_name] = {'total': 0, 'correct': 0}
                     subjects_analysis[subject_name]['total'] += 1
@@ -333,20 +470,10 @@ class QuizSessionService:
                 if difficulty in difficulty_analysis:
                     difficulty_analysis[difficulty] += 1
                 
-                # Cevap bilgilerini al
-                user_answer_text = question.get('user_answer_text', 'Cevaplanmadı')
-                correct_answer_text = question.get('correct_answer_text', 'Bilinmiyor')
-                explanation = question_details.get('description', 'Açıklama bulunamadı') if question_details else 'Açıklama bulunamadı'
-                
-                # Eğer session_results'dan gelen veriler yoksa, ayrı ayrı al
-                if user_answer_text == 'Cevaplanmadı' and question['user_answer_option_id'] is not None:
-                    user_answer = self.session_repo.get_answer_option_text(question['user_answer_option_id'])
-                    user_answer_text = user_answer if user_answer else 'Bilinmiyor'
-                
-                if correct_answer_text == 'Bilinmiyor':
-                    correct_answer = self.session_repo.get_correct_answer(question['question_id'])
-                    if correct_answer:
-                        correct_answer_text = correct_answer.get('name', 'Bilinmiyor')
+                # Cevap bilgileri
+                user_answer_text = question.get('user_answer_text') or 'Cevaplanmadı'
+                correct_answer_text = question.get('correct_answer_text') or 'Bilinmiyor'
+                explanation = question.get('description') or 'Açıklama bulunamadı'
                 
                 # Soru detayları
                 question_detail = {
@@ -355,7 +482,7 @@ class QuizSessionService:
                     'topic': topic_name or 'Bilinmeyen',
                     'difficulty': difficulty or 'medium',
                     'status': status,
-                    'timeSpent': question.get('time_spent', 0),
+                    'timeSpent': question.get('time_spent_seconds', 0),
                     'userAnswer': user_answer_text,
                     'correctAnswer': correct_answer_text,
                     'explanation': explanation
@@ -402,10 +529,11 @@ class QuizSessionService:
                 'recommendations': recommendations,
                 
                 # Ek bilgiler
+                # Zamanlar hem anlık yanıtta hem kayıtlı belgede ISO 8601 biçimindedir
                 'sessionInfo': {
                     'sessionId': session_id,
-                    'startTime': session.get('start_time'),
-                    'endTime': session.get('end_time'),
+                    'startTime': self._to_isoformat(session.get('start_time')),
+                    'endTime': self._to_isoformat(session.get('end_time')),
                     'quizMode': session.get('quiz_mode', 'educational')
                 }
             }
@@ -470,17 +598,56 @@ class QuizSessionService:
         
         return recommendations[:3]  # En fazla 3 öneri döndür
     
-    def update_session_timer(self, session_id: str, remaining_time_seconds: int) -> bool:
-        """4.2.4. Session timer'ını günceller."""
+    def get_remaining_time(self, session_id: str) -> Optional[int]:
+        """4.2.8. Session'ın sunucudaki bitiş zamanına göre kalan süresini (saniye) döndürür."""
         try:
-            # Session'ın var olup olmadığını kontrol et
-            session_info = self.get_session_info(session_id)
-            if not session_info:
-                return False
+            session = self.session_repo.get_session(session_id)
+            if not session:
+                return None
             
-            # Timer'ı güncelle
-            success = self.session_repo.update_session_timer(session_id, remaining_time_seconds)
-            return success
+            if not session['timer_enabled'] or not session['timer_duration']:
+                return 0
+            return int(session.get('seconds_remaining') or 0)
             
         except Exception as e:
-            return False 
\ No newline at end of file
+            return None
+
+    def get_session_status(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """4.2.9. Polling için hafif session durumu: tek indeksli sorgu, etiketler müfredat önbelleğinden."""
+        try:
+            self._flush_pending_writes(session_id)
+            progress = self.session_repo.get_session_progress(session_id)
+            if not progress:
+                return None
+            
+            total_questions = int(progress['total_questions'] or 0)
+            answered_questions = int(progress['answered_questions'] or 0)
+            
+            remaining_time_seconds = 0
+            if progress['timer_enabled'] and progress['timer_duration']:
+                remaining_time_seconds = int(progress.get('seconds_remaining') or 0)
+            
+            # Aktif soru varsa onun, yoksa session'ın ders/konu bilgisi kullanılır
+            has_current = progress['current_question_id'] is not None
+            subject_id = progress['current_subject_id'] if has_current else progress['subject_id']
+            topic_id = progress['current_topic_id'] if has_current else progress['topic_id']
+            snapshot = curriculum_cache.get() or {}
+            
+            return {
+                'session_id': session_id,
+                'is_completed': progress['status'] == 'completed',
+                'timer_enabled': progress['timer_enabled'],
+                'timer_duration': progress['timer_duration'],
+                'total_questions': total_questions,
+                'answered_questions': answered_questions,
+                'progress_percentage': round((answered_questions / total_questions * 100) if total_questions > 0 else 0, 2),
+                'current_question': answered_questions + 1 if answered_questions < total_questions else total_questions,
+                'subject': snapshot.get('subject_names', {}).get(subject_id),
+                'topic': snapshot.get('topic_names', {}).get(topic_id),
+                'difficulty': progress['current_difficulty_level'] if has_current else progress['difficulty_level'],
+                'quiz_mode': progress['quiz_mode'],
+                'remaining_time_seconds': remaining_time_seconds
+            }
+            
+        except Exception as e:
+            return None
@@ -0,0 +1,171 @@
+# =============================================================================
+# 1.0. MODÜL BAŞLIĞI VE AÇIKLAMASI
+# =============================================================================
+# Bu modül, süresi dolmuş quiz oturumlarını arka planda toplu olarak kapatan
+# `SessionSweeper` sınıfını içerir.
+# - Süreli oturumlar: deadline_at (+ tolerans) geçtiyse sonuçları hesaplanıp
+#   tamamlanır (istemci süre bitiminde tamamlayamadıysa).
+# - Süresiz oturumlar: uzun süre işlem görmediyse 'abandoned' yapılır.
+# Böylece status='active' kümesi yalnızca gerçekten devam eden oturumlardan
+# oluşur.
+# Oturumlar koşullu UPDATE (status='active') ile sahiplenilir; yalnızca
+# durumu bu taramada değişen oturumlar işlenir. Sweeper varsayılan olarak
+# kapalıdır ve açıkken instance dizinindeki kilidi alan tek süreçte çalışır.
+# =============================================================================
+
+# =============================================================================
+# 2.0. İÇİNDEKİLER
+# =============================================================================
+# 3.0. GEREKLİ KÜTÜPHANELER VE MODÜLLER
+# 4.0. MODÜL SEVİYESİ YAPILANDIRMA
+# 5.0. SESSIONSWEEPER SINIFI
+#   5.1. __init__(self, interval, batch_size, grace_seconds, abandon_after_hours)
+#   5.2. start(self)
+#   5.3. stop(self)
+#   5.4. sweep(self)
+#   5.5. get_stats(self)
+# 6.0. MODÜL SEVİYESİ FONKSİYONLAR
+#   6.1. init_app(app)
+# =============================================================================
+
+# =============================================================================
+# 3.0. GEREKLİ KÜTÜPHANELER VE MODÜLLER
+# =============================================================================
+import os
+import atexit
+import threading
+from typing import Dict, Optional, Any
+
+from app.database.answer_key_cache import answer_key_cache
+from app.database.process_lock import ProcessLock
+
+# =============================================================================
+# 4.0. MODÜL SEVİYESİ YAPILANDIRMA
+# =============================================================================
+# Taramalar arası bekleme süresi (saniye)
+SESSION_SWEEPER_INTERVAL = float(os.getenv('SESSION_SWEEPER_INTERVAL', '30'))
+
+# Bir taramada işlenecek en fazla oturum sayısı
+SESSION_SWEEPER_BATCH_SIZE = int(os.getenv('SESSION_SWEEPER_BATCH_SIZE', '100'))
+
+# İstemcinin kendi tamamlama isteğine bırakılan tolerans (saniye)
+SESSION_DEADLINE_GRACE_SECONDS = int(os.getenv('SESSION_DEADLINE_GRACE_SECONDS', '30'))
+
+# Süresiz oturumların terk edilmiş sayılacağı hareketsizlik süresi (saat)
+SESSION_ABANDON_AFTER_HOURS = int(os.getenv('SESSION_ABANDON_AFTER_HOURS', '24'))
+
+# =============================================================================
+# 5.0. SESSIONSWEEPER SINIFI
+# =============================================================================
+class SessionSweeper:
+    """
+    Süresi dolmuş aktif oturumları aralıklarla ve sınırlı gruplar halinde
+    tamamlar veya terk edilmiş olarak işaretler.
+    """
+
+    def __init__(self, interval: float = SESSION_SWEEPER_INTERVAL,
+                 batch_size: int = SESSION_SWEEPER_BATCH_SIZE,
+                 grace_seconds: int = SESSION_DEADLINE_GRACE_SECONDS,
+                 abandon_after_hours: int = SESSION_ABANDON_AFTER_HOURS):
+        """5.1. Sweeper'ı başlatır. start() çağrılana kadar çalışmaz."""
+        self.interval = interval
+        self.batch_size = batch_size
+        self.grace_seconds = grace_seconds
+        self.abandon_after_hours = abandon_after_hours
+        self._service = None
+        # Kilit nesnesi süreç boyunca tutulur (kapanırsa kilit bırakılır)
+        self.process_lock: Optional[ProcessLock] = None
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._sweeps = 0
+        self._completed = 0
+        self._abandoned = 0
+        self._failed = 0
+
+    def start(self) -> None:
+        """5.2. Arka plan tarama thread'ini başlatır."""
+        if self._thread is not None:
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name='session-sweeper', daemon=True)
+        self._thread.start()
+        atexit.register(self.stop)
+
+    def stop(self) -> None:
+        """5.3. Tarama thread'ini durdurur."""
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _run(self) -> None:
+        """Aralıklarla tarama yapar; bir grup dolu geldiyse beklemeden devam eder."""
+        while not self._stopped.is_set():
+            processed = self.sweep()
+            if processed < self.batch_size:
+                self._stopped.wait(self.interval)
+
+    def _get_service(self):
+        """QuizSessionService'i ilk kullanımda oluşturur (döngüsel import'u önler)."""
+        if self._service is None:
+            from app.services.quiz_session_service import QuizSessionService
+            self._service = QuizSessionService()
+        return self._service
+
+    def sweep(self) -> int:
+        """5.4. Bir tarama yapar ve işlenen oturum sayısını döndürür."""
+        try:
+            service = self._get_service()
+            repo = service.session_repo
+            processed = 0
+
+            # Süresi dolan süreli oturumları sahiplen ve sonuçlarını sakla
+            for session_id in repo.claim_expired_sessions(self.grace_seconds, self.batch_size):
+                if service.complete_expired_session(session_id):
+                    self._completed += 1
+                else:
+                    # Oturum tamamlandı; sonuçlar istendiğinde yeniden hesaplanır
+                    self._failed += 1
+                processed += 1
+
+            # Hareketsiz süresiz oturumları terk edilmiş olarak işaretle
+            for session_id in repo.abandon_idle_sessions(self.abandon_after_hours, self.batch_size):
+                answer_key_cache.set_status(session_id, 'abandoned')
+                self._abandoned += 1
+                processed += 1
+
+            self._sweeps += 1
+            return processed
+
+        except Exception as e:
+            print(f"❌ Oturum tarama hatası: {e}")
+            return 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """5.5. Sweeper istatistiklerini döndürür."""
+        return {
+            'running': self._thread is not None,
+            'interval': self.interval,
+            'sweeps': self._sweeps,
+            'completed': self._completed,
+            'abandoned': self._abandoned,
+            'failed': self._failed
+        }
+
+# =============================================================================
+# 6.0. MODÜL SEVİYESİ FONKSİYONLAR
+# =============================================================================
+session_sweeper = SessionSweeper()
+
+def init_app(app) -> bool:
+    """6.1. Flask config'i SESSION_SWEEPER_ENABLED ise sweeper'ı (tek süreçte) başlatır."""
+    if not app.config.get('SESSION_SWEEPER_ENABLED', False):
+        return False
+    # Birden çok worker (veya debug reloader) varsa yalnızca kilidi alan süreç tarar
+    process_lock = ProcessLock(os.path.join(app.instance_path, 'session_sweeper.lock'))
+    if not process_lock.acquire():
+        return False
+    session_sweeper.process_lock = process_lock
+    session_sweeper.interval = app.config.get('SESSION_SWEEPER_INTERVAL', SESSION_SWEEPER_INTERVAL)
+    session_sweeper.start()
+    return True
@@ -0,0 +1,122 @@
+# =============================================================================
+# 1.0. MODÜL BAŞLIĞI VE AÇIKLAMASI
+# =============================================================================
+# Bu modül, aynı anahtarla eşzamanlı yapılan çağrıları tek bir çağrıda
+# birleştiren `SingleFlight` sınıfını içerir.
+# Bir anahtar için çalışan çağrı varken gelen istekler yeni çağrı başlatmaz;
+# ilk çağrının (lider) bitmesini bekler ve aynı sonucu alır. Çağrı bittiğinde
+# anahtar serbest kalır; sonuçlar saklanmaz (önbellek değildir).
+# Örnek: bir sınıftaki öğrencilerin aynı soru için aynı anda istediği ipucu
+# Gemini'ye tek istek olarak gider.
+# =============================================================================
+
+# =============================================================================
+# 2.0. İÇİNDEKİLER
+# =============================================================================
+# 3.0. GEREKLİ KÜTÜPHANELER
+# 4.0. SINGLEFLIGHT SINIFI
+#   4.1. __init__(self)
+#   4.2. make_key(*parts)
+#   4.3. do(self, key, fn)
+#   4.4. get_stats(self)
+# =============================================================================
+
+# =============================================================================
+# 3.0. GEREKLİ KÜTÜPHANELER
+# =============================================================================
+import json
+import hashlib
+import threading
+from typing import Any, Callable, Dict, Tuple
+
+# =============================================================================
+# 4.0. SINGLEFLIGHT SINIFI
+# =============================================================================
+class _Call:
+    """Devam eden tek bir çağrı; bekleyenler `done` olayını bekler."""
+    __slots__ = ('done', 'result', 'error', 'waiters')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Anahtar başına en fazla bir çağrının çalışmasını sağlar. Lider çağrı
+    hata fırlatırsa aynı hata tüm bekleyenlere de fırlatılır.
+    """
+
+    def __init__(self):
+        """4.1. Boş çağrı tablosu ve sayaçlarla başlatır."""
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call] = {}
+        self._requests = 0
+        self._executed = 0
+        self._collapsed = 0
+        self._max_waiters = 0
+
+    @staticmethod
+    def make_key(*parts: Any) -> str:
+        """4.2. Parçalardan normalize edilmiş bir anahtar üretir.
+
+        Metinlerdeki boşluklar tek boşluğa indirgenir; sözlükler anahtar
+        sırasından bağımsız olarak serileştirilir.
+        """
+        normalized = [
+            ' '.join(part.split()) if isinstance(part, str) else part
+            for part in parts
+        ]
+        raw = json.dumps(normalized, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """4.3. Anahtar için çalışan çağrı varsa sonucunu bekler, yoksa fn'i çalıştırır.
+
+        Returns:
+            (sonuç, paylaşıldı_mı) — paylaşıldı_mı, sonucun başka bir isteğin
+            çağrısından geldiğini belirtir
+        """
+        with self._lock:
+            self._requests += 1
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                self._collapsed += 1
+                self._max_waiters = max(self._max_waiters, call.waiters)
+                leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                self._executed += 1
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn()
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+        return call.result, False
+
+    def get_stats(self) -> Dict[str, Any]:
+        """4.4. Birleştirme istatistiklerini döndürür."""
+        with self._lock:
+            return {
+                'requests': self._requests,
+                'executed': self._executed,
+                'collapsed': self._collapsed,
+                'in_flight': len(self._calls),
+                'max_waiters': self._max_waiters
+            }
@@ -19,6 +19,12 @@
 #   4.3. Sistem Yönetimi
 #     4.3.1. check_database_connection(self)
 #     4.3.2. get_system_metrics(self)
+#     4.3.3. get_database_pool_stats(self)
+#     4.3.4. get_write_behind_stats(self)
+#     4.3.5. get_session_sweeper_stats(self)
+#     4.3.6. get_question_set_pool_stats(self)
+#     4.3.7. get_slow_query_log_stats(self)
+#     4.3.8. get_ai_response_cache_stats(self)
 # =============================================================================
 
 # =============================================================================
@@ -33,9 +39,35 @@ import os
 
 # Import database connection for health checks
 try:
-    from app.database.db_connection import DatabaseConnection
+    from app.database.db_connection import DatabaseConnection, get_pool_stats
 except ImportError:
     DatabaseConnection = None
+    get_pool_stats = None
+
+try:
+    from app.database.write_behind_buffer import write_behind_buffer
+except ImportError:
+    write_behind_buffer = None
+
+try:
+    from app.services.session_sweeper import session_sweeper
+except ImportError:
+    session_sweeper = None
+
+try:
+    from app.services.question_set_pool import question_set_pool
+except ImportError:
+    question_set_pool = None
+
+try:
+    from app.database.slow_query_log import slow_query_log
+except ImportError:
+    slow_query_log = None
+
+try:
+    from app.services.ai_response_cache import ai_response_cache
+except ImportError:
+    ai_response_cache = None
 
 # =============================================================================
 # 4.0. SYSTEMERVICE SINIFI
@@ -101,7 +133,13 @@ class SystemService:
                     'version': self.version,
                     'environment': self.environment,
                     'system': system_info,
-                    'metrics': system_metrics
+                    'metrics': system_metrics,
+                    'database_pool': self.get_database_pool_stats(),
+                    'write_behind': self.get_write_behind_stats(),
+                    'session_sweeper': self.get_session_sweeper_stats(),
+                    'question_set_pool': self.get_question_set_pool_stats(),
+                    'slow_query_log': self.get_slow_query_log_stats(),
+                    'ai_response_cache': self.get_ai_response_cache_stats()
                 }
             }
             return status
@@ -203,4 +241,40 @@ class SystemService:
                 'error': 'Failed to retrieve system metrics',
                 'message': str(e),
                 'timestamp': datetime.now().isoformat()
-            } 
\ No newline at end of file
+            }
+
+    def get_database_pool_stats(self) -> Dict[str, Any]:
+        """4.3.3. Veritabanı bağlantı havuzu istatistiklerini döndürür."""
+        if not get_pool_stats:
+            return {'enabled': False}
+        return get_pool_stats()
+
+    def get_write_behind_stats(self) -> Dict[str, Any]:
+        """4.3.4. Write-behind buffer istatistiklerini (kuyruk derinliği dahil) döndürür."""
+        if not write_behind_buffer:
+            return {'enabled': False}
+        return write_behind_buffer.get_stats()
+
+    def get_session_sweeper_stats(self) -> Dict[str, Any]:
+        """4.3.5. Süresi dolan oturumları kapatan sweeper'ın istatistiklerini döndürür."""
+        if not session_sweeper:
+            return {'running': False}
+        return session_sweeper.get_stats()
+
+    def get_question_set_pool_stats(self) -> Dict[str, Any]:
+        """4.3.6. Hazır soru seti havuzunun istatistiklerini döndürür."""
+        if not question_set_pool:
+            return {'enabled': False}
+        return question_set_pool.get_stats()
+
+    def get_slow_query_log_stats(self) -> Dict[str, Any]:
+        """4.3.7. Yavaş sorgu kaydının istatistiklerini döndürür."""
+        if not slow_query_log:
+            return {'enabled': False}
+        return slow_query_log.get_stats()
+
+    def get_ai_response_cache_stats(self) -> Dict[str, Any]:
+        """4.3.8. Paylaşılan hızlı eylem AI yanıt önbelleğinin istatistiklerini döndürür."""
+        if not ai_response_cache:
+            return {'enabled': False}
+        return ai_response_cache.get_stats()
@@ -39,8 +39,7 @@ export class QuizEngine {
    * Timer'ı otomatik olarak günceller.
    */
   startTimerUpdate() {
-    let saveCounter = 0; // 10 saniyede bir kaydetmek için sayaç
-    
+    // Süre sunucuda (deadline_at) tutulur; burada yalnızca ekrandaki geri sayım ilerletilir
     setInterval(() => {
       const timer = stateManager.getState('timer');
       
@@ -54,13 +53,6 @@ export class QuizEngine {
           }
         }, 'TIMER_TICK');
         
-        // 10 saniyede bir veritabanına kaydet
-        saveCounter++;
-        if (saveCounter >= 10) {
-          this.saveTimerToDatabase(newRemainingTime);
-          saveCounter = 0;
-        }
-        
         // Süre bittiğinde quiz'i otomatik tamamla
         if (newRemainingTime <= 0) {
           eventBus.publish('quiz:complete');
@@ -69,24 +61,6 @@ export class QuizEngine {
     }, 1000);
   }
   
-  /**
-   * Timer'ı veritabanına kaydeder.
-   */
-  async saveTimerToDatabase(remainingTimeSeconds) {
-    try {
-      const sessionId = stateManager.getState('sessionId');
-      if (!sessionId) {
-        return;
-      }
-      
-      // Timer'ı veritabanına kaydetmek için API çağrısı
-      await this.apiService.updateTimer({ sessionId, remainingTimeSeconds });
-      
-    } catch (error) {
-      // Timer kaydedilirken hata oluştu
-    }
-  }
-
   /**
    * Quiz için soruları yükler.
    */
@@ -135,26 +135,7 @@ class AIChatService {
         }
 
         try {
-            const requestBody = {
-                message: message.trim(),
-                chat_session_id: this.chatSessionId
-            };
-
-            if (currentQuestionId) {
-                requestBody.question_id = currentQuestionId;
-            }
-
-            // İlk mesaj ise soru ve şıkların içeriğini ekle
-            if (isFirstMessage && currentQuestionId) {
-                const questionData = this.getCurrentQuestionData();
-                if (questionData) {
-                    requestBody.question_context = {
-                        question_text: questionData.question_text,
-                        options: questionData.options
-                    };
-                    console.log('[AIChatService] Added question context for first message:', requestBody.question_context);
-                }
-            }
+            const requestBody = this.buildChatRequestBody(message, currentQuestionId, isFirstMessage);
 
             console.log('[AIChatService] Sending chat message:', requestBody);
 
@@ -183,6 +164,113 @@ class AIChatService {
         }
     }
 
+    /**
+     * Chat mesajını gönderir ve AI yanıtını Server-Sent Events olarak parça parça alır
+     * @param {string} message - Kullanıcı mesajı
+     * @param {number} currentQuestionId - Mevcut soru ID'si
+     * @param {boolean} isFirstMessage - İlk mesaj mı?
+     * @param {Function} onChunk - Her formatlanmış HTML parçası için çağrılır
+     * @returns {Promise<Object>} Stream sonucu ({ success, message } veya { success: false, error })
+     */
+    async streamChatMessage(message, currentQuestionId = null, isFirstMessage = false, onChunk = () => {}) {
+        console.log('[AIChatService] streamChatMessage called with:', { message, currentQuestionId, isFirstMessage });
+        
+        if (!this.isEnabled) {
+            throw new Error('AI Chat servisi kullanılamıyor');
+        }
+
+        if (!this.chatSessionId) {
+            throw new Error('Chat session başlatılmamış');
+        }
+
+        if (!message || !message.trim()) {
+            throw new Error('Mesaj boş olamaz');
+        }
+
+        const requestBody = this.buildChatRequestBody(message, currentQuestionId, isFirstMessage);
+        const response = await fetch(`${this.baseUrl}/chat/message/stream`, {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+                'Accept': 'text/event-stream'
+            },
+            body: JSON.stringify(requestBody)
+        });
+
+        // Doğrulama hataları stream başlamadan JSON olarak döner
+        if (!response.ok || !response.body) {
+            const data = await response.json().catch(() => ({}));
+            return { success: false, error: data.message || 'AI yanıtı alınamadı' };
+        }
+
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+
+        while (true) {
+            const { value, done } = await reader.read();
+            if (done) break;
+            buffer += decoder.decode(value, { stream: true });
+
+            // Olaylar boş satırla ayrılır
+            let boundary;
+            while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+                const rawEvent = buffer.slice(0, boundary);
+                buffer = buffer.slice(boundary + 2);
+
+                let event = 'message';
+                let data = '';
+                for (const line of rawEvent.split('\n')) {
+                    if (line.startsWith('event:')) event = line.slice(6).trim();
+                    else if (line.startsWith('data:')) data += line.slice(5).trim();
+                }
+                const payload = data ? JSON.parse(data) : {};
+
+                if (event === 'chunk') {
+                    onChunk(payload.html);
+                } else if (event === 'done') {
+                    return { success: true, message: payload.ai_response };
+                } else if (event === 'error') {
+                    return { success: false, error: payload.message };
+                }
+            }
+        }
+
+        return { success: false, error: 'Yanıt akışı beklenmedik şekilde kesildi' };
+    }
+
+    /**
+     * Chat mesajı istek gövdesini oluşturur
+     * @param {string} message - Kullanıcı mesajı
+     * @param {number} currentQuestionId - Mevcut soru ID'si
+     * @param {boolean} isFirstMessage - İlk mesaj mı?
+     * @returns {Object} İstek gövdesi
+     */
+    buildChatRequestBody(message, currentQuestionId = null, isFirstMessage = false) {
+        const requestBody = {
+            message: message.trim(),
+            chat_session_id: this.chatSessionId
+        };
+
+        if (currentQuestionId) {
+            requestBody.question_id = currentQuestionId;
+        }
+
+        // İlk mesaj ise soru ve şıkların içeriğini ekle
+        if (isFirstMessage && currentQuestionId) {
+            const questionData = this.getCurrentQuestionData();
+            if (questionData) {
+                requestBody.question_context = {
+                    question_text: questionData.question_text,
+                    options: questionData.options
+                };
+                console.log('[AIChatService] Added question context for first message:', requestBody.question_context);
+            }
+        }
+
+        return requestBody;
+    }
+
     /**
      * Mevcut sorunun verilerini alır
      * @returns {Object|null} Soru ve şıkların içeriği
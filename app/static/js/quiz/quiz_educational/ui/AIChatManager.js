@@ -532,12 +532,31 @@ class AIChatManager {
         console.log('[AIChatManager] Is first message for this question:', isFirstMessage);
         
         try {
-            // AI'dan yanıt al
-            const response = await this.aiChatService.sendChatMessage(
-                message, 
-                this.currentQuestionId,
-                isFirstMessage
-            );
+            // AI'dan yanıt al - destekleniyorsa parça parça (SSE) göster
+            let streamElement = null;
+            const canStream = typeof TextDecoder !== 'undefined' && typeof ReadableStream !== 'undefined';
+            const response = canStream
+                ? await this.aiChatService.streamChatMessage(
+                    message,
+                    this.currentQuestionId,
+                    isFirstMessage,
+                    (html) => {
+                        // Soru değiştiyse gelen parçaları gösterme
+                        if (this.pendingRequests.get(this.currentQuestionId) !== requestId) return;
+                        if (!streamElement) {
+                            this.hideTyping();
+                            streamElement = this.addStreamingMessage();
+                        }
+                        if (!streamElement) return;
+                        streamElement.innerHTML += html;
+                        this.scrollToBottom();
+                    }
+                )
+                : await this.aiChatService.sendChatMessage(
+                    message, 
+                    this.currentQuestionId,
+                    isFirstMessage
+                );
             
             this.hideTyping();
             
@@ -561,7 +580,11 @@ class AIChatManager {
             
             // AI cevabını göster
             if (response.success && response.message) {
-                this.addMessage('ai', response.message);
+                if (streamElement) {
+                    streamElement.innerHTML = this.formatMessage(response.message);
+                } else {
+                    this.addMessage('ai', response.message);
+                }
             } else {
                 this.addMessage('system', `Üzgünüm, bir hata oluştu: ${response.error || 'Bilinmeyen hata'}`);
             }
@@ -698,6 +721,34 @@ class AIChatManager {
         }
     }
 
+    /**
+     * Stream edilen AI yanıtı için boş bir mesaj ekler
+     * @returns {HTMLElement|null} Parçaların ekleneceği metin elementi
+     */
+    addStreamingMessage() {
+        if (!this.messagesContainer) return null;
+        
+        const messageDiv = document.createElement('div');
+        messageDiv.className = 'ai-message ai-message';
+        
+        const time = new Date().toLocaleTimeString('tr-TR', { 
+            hour: '2-digit', 
+            minute: '2-digit' 
+        });
+        
+        messageDiv.innerHTML = `
+            <div class="ai-message-content">
+                <div class="ai-message-text"></div>
+                <div class="ai-message-time">${time}</div>
+            </div>
+        `;
+        
+        this.messagesContainer.appendChild(messageDiv);
+        this.scrollToBottom();
+        
+        return messageDiv.querySelector('.ai-message-text');
+    }
+
     /**
      * Typewriter efekti ile metni yazar
      */
@@ -36,8 +36,7 @@ export class QuizEngine {
    * Timer'ı otomatik olarak günceller.
    */
   startTimerUpdate() {
-    let saveCounter = 0; // 10 saniyede bir kaydetmek için sayaç
-    
+    // Süre sunucuda (deadline_at) tutulur; burada yalnızca ekrandaki geri sayım ilerletilir
     setInterval(() => {
       const timer = stateManager.getState('timer');
       
@@ -51,13 +50,6 @@ export class QuizEngine {
           }
         }, 'TIMER_TICK');
         
-        // 10 saniyede bir veritabanına kaydet
-        saveCounter++;
-        if (saveCounter >= 10) {
-          this.saveTimerToDatabase(newRemainingTime);
-          saveCounter = 0;
-        }
-        
         // Süre bittiğinde quiz'i otomatik tamamla
         if (newRemainingTime <= 0) {
           eventBus.publish('quiz:complete');
@@ -66,25 +58,6 @@ export class QuizEngine {
     }, 1000);
   }
   
-  /**
-   * Timer'ı veritabanına kaydeder.
-   */
-  async saveTimerToDatabase(remainingTimeSeconds) {
-    try {
-      const sessionId = stateManager.getState('sessionId');
-      if (!sessionId) {
-        console.warn('Timer kaydedilemedi: sessionId bulunamadı');
-        return;
-      }
-      
-      // Timer'ı veritabanına kaydetmek için API çağrısı
-      await this.apiService.updateTimer({ sessionId, remainingTimeSeconds });
-      
-    } catch (error) {
-      console.warn('Timer kaydedilirken hata:', error);
-    }
-  }
-
   /**
    * Quiz için soruları yükler.
    */
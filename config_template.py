@@ -21,6 +21,49 @@ class Config:
     MYSQL_DB = os.environ.get('MYSQL_DB') or 'btk_app'
     MYSQL_PORT = int(os.environ.get('MYSQL_PORT') or 3306)
     
+    # Database Connection Pool
+    DB_POOL_ENABLED = (os.environ.get('DB_POOL_ENABLED') or 'True').lower() in ('true', '1', 't')
+    DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE') or 10)
+    DB_POOL_TIMEOUT = float(os.environ.get('DB_POOL_TIMEOUT') or 5)
+    
+    # Okuma replikası (boşsa tüm sorgular birincile gider; @read_only metotlar replikaya yönlenir)
+    DB_REPLICA_HOST = os.environ.get('DB_REPLICA_HOST') or ''
+    DB_REPLICA_PORT = int(os.environ.get('DB_REPLICA_PORT') or 3306)
+    DB_REPLICA_USER = os.environ.get('DB_REPLICA_USER') or ''
+    DB_REPLICA_PASSWORD = os.environ.get('DB_REPLICA_PASSWORD') or ''
+    DB_REPLICA_POOL_SIZE = int(os.environ.get('DB_REPLICA_POOL_SIZE') or 10)
+    
+    # İstek başına SQL ölçümü (sorgu sayısı, DB süresi, N+1 uyarısı)
+    QUERY_STATS_ENABLED = (os.environ.get('QUERY_STATS_ENABLED') or 'True').lower() in ('true', '1', 't')
+    QUERY_REPEAT_WARN_THRESHOLD = int(os.environ.get('QUERY_REPEAT_WARN_THRESHOLD') or 10)
+    
+    # Yavaş sorgu kaydı (EXPLAIN FORMAT=JSON ile, dönen log dosyasına)
+    SLOW_QUERY_LOG_ENABLED = (os.environ.get('SLOW_QUERY_LOG_ENABLED') or 'False').lower() in ('true', '1', 't')
+    SLOW_QUERY_THRESHOLD_MS = float(os.environ.get('SLOW_QUERY_THRESHOLD_MS') or 200)
+    SLOW_QUERY_LOG_FILE = os.environ.get('SLOW_QUERY_LOG_FILE')  # Varsayılan: instance/slow_queries.log
+    
+    # Write-behind (cevap güncellemelerini toplu yazma; tek worker)
+    WRITE_BEHIND_ENABLED = (os.environ.get('WRITE_BEHIND_ENABLED') or 'False').lower() in ('true', '1', 't')
+    WRITE_BEHIND_FLUSH_INTERVAL = float(os.environ.get('WRITE_BEHIND_FLUSH_INTERVAL') or 0.5)
+    WRITE_BEHIND_MAX_PENDING = int(os.environ.get('WRITE_BEHIND_MAX_PENDING') or 500)
+    
+    # Süresi dolan quiz oturumlarını arka planda kapatma (varsayılan kapalı; tek süreçte çalışır)
+    SESSION_SWEEPER_ENABLED = (os.environ.get('SESSION_SWEEPER_ENABLED') or 'False').lower() in ('true', '1', 't')
+    SESSION_SWEEPER_INTERVAL = float(os.environ.get('SESSION_SWEEPER_INTERVAL') or 30)
+    
+    # Sık kullanılan quiz yapılandırmaları için hazır soru seti havuzu
+    QUESTION_SET_POOL_ENABLED = (os.environ.get('QUESTION_SET_POOL_ENABLED') or 'True').lower() in ('true', '1', 't')
+    QUESTION_SET_POOL_SIZE = int(os.environ.get('QUESTION_SET_POOL_SIZE') or 10)
+    # Örn: [{'topic_id': 12, 'subject_id': 3, 'difficulty': 'random', 'question_count': 5, 'size': 20}]
+    QUESTION_SET_POOL_CONFIGS = []
+    
+    # Hızlı eylem (açıkla, ipucu) AI yanıtlarının soru bazlı paylaşılan önbelleği
+    AI_RESPONSE_CACHE_ENABLED = (os.environ.get('AI_RESPONSE_CACHE_ENABLED') or 'True').lower() in ('true', '1', 't')
+    AI_RESPONSE_CACHE_TTL_SECONDS = float(os.environ.get('AI_RESPONSE_CACHE_TTL_SECONDS') or 86400)
+    AI_RESPONSE_CACHE_MAX_ENTRIES = int(os.environ.get('AI_RESPONSE_CACHE_MAX_ENTRIES') or 2000)
+    # Worker'lar arası paylaşım için ai_response_cache tablosu
+    AI_RESPONSE_CACHE_DB_ENABLED = (os.environ.get('AI_RESPONSE_CACHE_DB_ENABLED') or 'False').lower() in ('true', '1', 't')
+    
     # Session Configuration
     PERMANENT_SESSION_LIFETIME = timedelta(hours=24)
     SESSION_COOKIE_SECURE = False  # True for HTTPS
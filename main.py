@@ -1,7 +1,13 @@
 from flask import Flask, render_template, session
 from config import Config
-from app.database.db_connection import DatabaseConnection
+from app.database.db_connection import DatabaseConnection, init_app as init_db_pool
 from app.database.db_migrations import DatabaseMigrations
+from app.database.write_behind_buffer import init_app as init_write_behind
+from app.database.query_stats import init_app as init_query_stats
+from app.database.slow_query_log import init_app as init_slow_query_log
+from app.services.session_sweeper import init_app as init_session_sweeper
+from app.services.question_set_pool import init_app as init_question_set_pool
+from app.services.ai_response_cache import init_app as init_ai_response_cache
 from app.database.quiz_data_loader import QuestionLoader
 import os
 import secrets
@@ -29,6 +35,24 @@ def create_app(config_class=Config):
     # Initialize database
     db_connection = None
     try:
+        # Set up the connection pool (one pooled connection per request)
+        if init_db_pool(app):
+            app.logger.info(f"Database connection pool enabled (size={app.config.get('DB_POOL_SIZE')})")
+            if app.config.get('DB_REPLICA_HOST'):
+                app.logger.info(f"Read replica routing enabled (host={app.config.get('DB_REPLICA_HOST')})")
+        
+        # Per-request SQL count/time (Server-Timing header in debug, N+1 warnings)
+        if init_query_stats(app):
+            app.logger.info(f"Query instrumentation enabled (repeat warning > {app.config.get('QUERY_REPEAT_WARN_THRESHOLD')})")
+        
+        # Log statements slower than the threshold together with their EXPLAIN plan
+        if init_slow_query_log(app):
+            app.logger.info(f"Slow query log enabled (threshold={app.config.get('SLOW_QUERY_THRESHOLD_MS')}ms)")
+        
+        # Batch answer writes if write-behind mode is enabled (single worker)
+        if init_write_behind(app):
+            app.logger.info(f"Write-behind buffer enabled (interval={app.config.get('WRITE_BEHIND_FLUSH_INTERVAL')}s)")
+        
         # Create database connection
         db_connection = DatabaseConnection()
         
@@ -65,9 +89,22 @@ def create_app(config_class=Config):
             # Don't raise here, as the main app should still work without questions
         
         # Store the database connection in the app context
+        # (safe to share across worker threads: connection state is per thread/request)
         app.config['DB_CONNECTION'] = db_connection
         
         app.logger.info("Database initialized successfully")
+        
+        # Close expired quiz sessions in the background (server-owned timer)
+        if init_session_sweeper(app):
+            app.logger.info(f"Session sweeper started (interval={app.config.get('SESSION_SWEEPER_INTERVAL')}s)")
+        
+        # Pre-sample question sets for popular quiz configurations
+        if init_question_set_pool(app):
+            app.logger.info("Question set pool started")
+        
+        # Share quick-action AI responses across students
+        if init_ai_response_cache(app):
+            app.logger.info(f"AI response cache enabled (db tier={app.config.get('AI_RESPONSE_CACHE_DB_ENABLED')})")
     except Exception as e:
         app.logger.error(f"Failed to initialize database: {e}")
         if db_connection: